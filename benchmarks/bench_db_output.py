@@ -0,0 +1,90 @@
+"""
+Compares DatabaseOutputHandler's per-row INSERTs with batched writes.
+
+    python -m benchmarks.bench_db_output                   # fake connection, 0.5 ms per round-trip
+    python -m benchmarks.bench_db_output --postgres        # local Postgres from .env
+"""
+import argparse
+import time
+
+from src.db import ConnectionPool
+from src.output_handler import DatabaseOutputHandler
+
+
+class FakeCursor:
+    """Sleeps once per statement sent to the server to simulate a network round-trip"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def execute(self, query, params=None):
+        time.sleep(self.latency)
+
+    def executemany(self, query, rows):
+        time.sleep(self.latency)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    closed = False
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self.latency)
+
+    def commit(self):
+        time.sleep(self.latency)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def sequences(n):
+    return [
+        {"script_seq": i, "script_for_manim": f"Draw scene {i}", "script_voice_over": f"Narration {i}"}
+        for i in range(1, n + 1)
+    ]
+
+
+def run(pool, methods, rows, batch_size, table):
+    data = sequences(rows)
+    results = {}
+    for method in methods:
+        handler = DatabaseOutputHandler(pool)
+        start = time.perf_counter()
+        handler.save(data, {"table": f"{table}_{method}", "method": method, "batch_size": batch_size})
+        results[method] = time.perf_counter() - start
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=0.5)
+    parser.add_argument("--postgres", action="store_true", help="use the Postgres server configured in .env")
+    parser.add_argument("--table", default="bench_scripts")
+    args = parser.parse_args()
+
+    if args.postgres:
+        pool, methods = ConnectionPool(), ["row", "values", "copy"]
+    else:
+        pool = ConnectionPool(connect=lambda: FakeConnection(args.latency_ms / 1000))
+        methods = ["row", "values"]
+
+    results = run(pool, methods, args.rows, args.batch_size, args.table)
+    baseline = results["row"]
+    print(f"{'method':<8} {'seconds':>10} {'rows/s':>12} {'speedup':>8}")
+    for method, seconds in results.items():
+        print(f"{method:<8} {seconds:>10.3f} {args.rows / seconds:>12.0f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Compares sequential and concurrent emission of generated Manim sources.
+
+    python -m benchmarks.bench_file_writer                           # 10k sequences in a temp folder
+    python -m benchmarks.bench_file_writer --target /mnt/nfs/bench   # on a network filesystem
+"""
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from src.output_handler import ManimOutputHandler
+
+
+def sequences(n):
+    return [
+        {
+            "script_seq": i,
+            "script_for_manim": f"Draw scene {i}\nfrom manim import *\n",
+            "script_voice_over": f"Narration for scene {i}.",
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def tree(path: Path) -> dict:
+    return {str(p.relative_to(path)): p.read_bytes() for p in path.rglob("*") if p.is_file()}
+
+
+def run(target: Path, writer: str, data: list[dict], workers: int | None) -> float:
+    out = target / writer
+    shutil.rmtree(out, ignore_errors=True)
+    config = {"base_name": "bench", "base_output_path": str(out), "writer": writer, "writer_workers": workers}
+    start = time.perf_counter()
+    ManimOutputHandler().save({"sequences": data}, config)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sequences", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--target", type=Path, default=None, help="folder to write into (default: a temp folder)")
+    args = parser.parse_args()
+
+    target = args.target or Path(tempfile.mkdtemp(prefix="bench_file_writer_"))
+    data = sequences(args.sequences)
+    try:
+        results = {writer: run(target, writer, data, args.workers) for writer in ("sequential", "concurrent")}
+        identical = tree(target / "sequential") == tree(target / "concurrent")
+    finally:
+        for writer in ("sequential", "concurrent"):
+            shutil.rmtree(target / writer, ignore_errors=True)
+        if args.target is None:
+            shutil.rmtree(target, ignore_errors=True)
+
+    files = args.sequences * 2
+    print(f"{'writer':<11} {'seconds':>9} {'files/s':>10}")
+    for writer, seconds in results.items():
+        print(f"{writer:<11} {seconds:>9.3f} {files / seconds:>10.0f}")
+    print(f"speedup: {results['sequential'] / results['concurrent']:.2f}x, byte-identical: {identical}")
+
+
+if __name__ == "__main__":
+    main()
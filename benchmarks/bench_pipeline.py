@@ -0,0 +1,246 @@
+"""
+Times every pipeline stage on synthetic inputs and compares the run with the previous one.
+
+    python -m benchmarks.bench_pipeline                           # json/csv/txt/db at 1k and 100k
+    python -m benchmarks.bench_pipeline --sizes 1m --formats json
+    python -m benchmarks.bench_pipeline --baseline bench.json --check   # exit 1 on a regression
+
+Stages: input_load (LocalFileInputHandler.load, or DatabaseInputHandler.load on SQLite for
+"db"), parse (Parser.parse), parsed_copy_save (LocalOutputHandler.save), manim_save
+(ManimOutputHandler.save into an empty folder) and render (VideoOutputHandler.render_all
+on the first --render-limit scenes with a stub `manim` that only writes the MP4).
+
+Each stage reports the best time of --repeat runs, sequences per second and the peak of
+memory allocated while it ran (tracemalloc, measured in a separate run). Results are
+written to --results; the file already there is the previous run they are compared with.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import subprocess
+import sys
+import textwrap
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.synthetic import FORMATS, parse_size, size_label, write_input
+from src.db import ConnectionPool
+from src.factories.parser_factory import ParserFactory
+from src.input_handler import DatabaseInputHandler, LocalFileInputHandler
+from src.output_handler import LocalOutputHandler, ManimOutputHandler, VideoOutputHandler
+
+ROOT = Path(__file__).resolve().parent.parent
+STAGES = ("input_load", "parse", "parsed_copy_save", "manim_save", "render")
+# stages faster than this are timer noise and never count as a time regression
+MIN_SECONDS = 0.005
+
+STUB_MANIM = textwrap.dedent('''\
+    import sys
+    from pathlib import Path
+
+    args = sys.argv[1:]
+    resolutions = {"l": "480p15", "m": "720p30", "h": "1080p60", "p": "1440p60", "k": "2160p60"}
+    quality = next(a[2:] for a in args if a.startswith("-q"))
+    media_dir = Path(args[args.index("--media_dir") + 1])
+    video = media_dir / "videos" / Path(args[-2]).stem / resolutions[quality] / f"{args[-1]}.mp4"
+    video.parent.mkdir(parents=True, exist_ok=True)
+    video.write_bytes(b"stub")
+''')
+
+
+def install_stub_manim(bin_dir: Path) -> Path:
+    """Writes a `manim` executable into bin_dir; put bin_dir first on PATH to use it"""
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    script = bin_dir / "stub_manim.py"
+    script.write_text(STUB_MANIM, encoding="utf-8")
+    launcher = bin_dir / "manim"
+    launcher.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n', encoding="utf-8")
+    launcher.chmod(0o755)
+    return bin_dir
+
+
+def measure(fn, items: int, repeat: int = 1, reset=None, memory: bool = True):
+    """Returns (metrics, result of the last run)"""
+    best = None
+    result = None
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for _ in range(max(1, repeat)):
+            if reset is not None:
+                reset()
+            result = None
+            gc.collect()
+            start = time.perf_counter()
+            result = fn()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        peak = None
+        if memory:
+            if reset is not None:
+                reset()
+            result = None
+            gc.collect()
+            tracemalloc.start()
+            try:
+                result = fn()
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+    metrics = {"items": items, "seconds": round(best, 6),
+               "items_per_s": round(items / best, 1) if best else None, "peak_bytes": peak}
+    return metrics, result
+
+
+def run_case(fmt: str, n: int, workdir: Path, render_limit: int = 50, workers: int | None = None,
+             repeat: int = 1, memory: bool = True) -> dict:
+    """Runs every stage on n synthetic sequences of format fmt; returns {stage: metrics}"""
+    workdir = Path(workdir)
+    source = write_input(fmt, n, workdir / "inputs")
+    case_dir = workdir / "run" / f"{fmt}_{n}"
+    shutil.rmtree(case_dir, ignore_errors=True)
+    results = {}
+
+    if fmt == "db":
+        pool = ConnectionPool(connect=lambda: sqlite3.connect(source), placeholder="?")
+        input_handler, input_config = DatabaseInputHandler(pool), {"table": "scripts", "order_by": "script_seq"}
+    else:
+        input_handler, input_config = LocalFileInputHandler(), {"path": str(source.parent), "file": source.name}
+    results["input_load"], raw = measure(lambda: input_handler.load(input_config), n, repeat, memory=memory)
+
+    parser = ParserFactory.get_parser(fmt)
+    results["parse"], parsed = measure(lambda: parser.parse(raw), n, repeat, memory=memory)
+    del raw
+
+    parsed_config = {"type": "local", "path": str(case_dir / "parsed"), "file": "parsed.json"}
+    results["parsed_copy_save"], _ = measure(
+        lambda: LocalOutputHandler().save(parsed, parsed_config), n, repeat, memory=memory
+    )
+
+    manim_config = {"type": "manim", "base_output_path": str(case_dir), "base_name": "bench"}
+    base_path = ManimOutputHandler.base_path(manim_config)
+    results["manim_save"], _ = measure(
+        lambda: ManimOutputHandler().save(parsed, manim_config), n, repeat,
+        reset=lambda: shutil.rmtree(base_path, ignore_errors=True), memory=memory,
+    )
+    del parsed
+
+    py_files = VideoOutputHandler.scene_files(base_path)[:render_limit]
+    media_dir = case_dir / "media"
+    video_handler = VideoOutputHandler(quality="low", max_workers=workers, media_dir=media_dir)
+    # subprocesses dominate the render stage, so tracemalloc would only measure the orchestration
+    results["render"], rendered = measure(
+        lambda: video_handler.render_all(py_files), len(py_files), repeat,
+        reset=lambda: shutil.rmtree(media_dir, ignore_errors=True), memory=False,
+    )
+    failed = [r for r in rendered if not r.ok]
+    if failed:
+        raise RuntimeError(f"stub render failed for {failed[0].py_file}: {failed[0].error}")
+    return results
+
+
+def compare(current: dict, previous: dict, threshold: float = 0.10) -> list[dict]:
+    """
+    Changes between two results files, per case/stage and metric (seconds, peak_bytes).
+    A change is a regression when the value grew by more than threshold
+    (times only when the stage takes at least MIN_SECONDS).
+    """
+    changes = []
+    for key, metrics in current["results"].items():
+        old = previous.get("results", {}).get(key)
+        if old is None:
+            continue
+        for metric in ("seconds", "peak_bytes"):
+            if not old.get(metric) or metrics.get(metric) is None:
+                continue
+            change = metrics[metric] / old[metric] - 1
+            changes.append({"key": key, "metric": metric, "previous": old[metric], "current": metrics[metric],
+                            "change": round(change, 4),
+                            "regression": change > threshold and (metric != "seconds" or metrics[metric] >= MIN_SECONDS)})
+    return changes
+
+
+def _meta(args) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "repeat": args.repeat,
+        "render_limit": args.render_limit,
+    }
+
+
+def _mib(value) -> str:
+    return "-" if value is None else f"{value / 2**20:.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1k,100k", help="comma-separated: 1k, 100k, 1m or a number")
+    parser.add_argument("--formats", default=",".join(FORMATS))
+    parser.add_argument("--render-limit", type=int, default=50, help="scenes rendered with the stub manim")
+    parser.add_argument("--workers", type=int, default=None, help="render workers (default: CPU count)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage; the best time is kept")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc runs")
+    parser.add_argument("--workdir", type=Path, default=ROOT / ".benchmarks")
+    parser.add_argument("--results", type=Path, default=None, help="default: <workdir>/pipeline.json")
+    parser.add_argument("--baseline", type=Path, default=None, help="compare with this file instead of the previous run")
+    parser.add_argument("--no-save", action="store_true", help="do not overwrite --results")
+    parser.add_argument("--threshold", type=float, default=0.10, help="relative growth reported as a regression")
+    parser.add_argument("--check", action="store_true", help="exit with status 1 on a regression")
+    args = parser.parse_args()
+
+    results_path = args.results or args.workdir / "pipeline.json"
+    baseline_path = args.baseline or results_path
+    previous = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else None
+
+    bin_dir = install_stub_manim(args.workdir / "bin")
+    os.environ["PATH"] = f"{bin_dir}{os.pathsep}{os.environ['PATH']}"
+
+    current = {"meta": _meta(args), "results": {}}
+    print(f"{'case':<12} {'stage':<17} {'items':>9} {'seconds':>9} {'items/s':>11} {'peak MiB':>9}")
+    for size in args.sizes.split(","):
+        n = parse_size(size)
+        for fmt in args.formats.split(","):
+            case = run_case(fmt, n, args.workdir, args.render_limit, args.workers, args.repeat, not args.no_memory)
+            for stage, metrics in case.items():
+                current["results"][f"{fmt}/{size_label(n)}/{stage}"] = metrics
+                print(f"{fmt + '/' + size_label(n):<12} {stage:<17} {metrics['items']:>9} {metrics['seconds']:>9.3f} "
+                      f"{metrics['items_per_s'] or 0:>11.0f} {_mib(metrics['peak_bytes']):>9}")
+
+    regressions = []
+    if previous is not None:
+        changes = compare(current, previous, args.threshold)
+        regressions = [c for c in changes if c["regression"]]
+        print(f"\nCompared with {baseline_path} ({previous['meta'].get('commit')}, {previous['meta'].get('created_at')}):")
+        for c in changes:
+            flag = "  ⚠️ regression" if c["regression"] else ""
+            print(f"{c['key']:<30} {c['metric']:<11} {c['change']:>+8.1%}{flag}")
+        if not regressions:
+            print(f"✅ No stage grew by more than {args.threshold:.0%}")
+
+    if not args.no_save:
+        results_path.parent.mkdir(parents=True, exist_ok=True)
+        results_path.write_text(json.dumps(current, indent=2), encoding="utf-8")
+        print(f"💾 Results saved to {results_path}")
+
+    if args.check and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compares the old per-row dicts with Sequence records and the columnar SequenceBatch.
+
+    python -m benchmarks.bench_sequence_model                   # 200k CSV rows
+    python -m benchmarks.bench_sequence_model --rows 1000000 --source json
+
+For each representation: peak memory while holding every parsed row, and throughput of
+parsing the rows and reading the three fields of each (what ManimOutputHandler does).
+"""
+import argparse
+import csv
+import gc
+import json
+import time
+import tracemalloc
+
+from src.parser import CSVParser, JSONParser
+from src.sequence import SequenceBatch, normalize
+
+
+def source_text(source: str, rows: int) -> str:
+    if source == "json":
+        return json.dumps([
+            {"script_seq": i, "script_for_manim": f"Draw scene {i}", "script_voice_over": f"Narration {i}"}
+            for i in range(1, rows + 1)
+        ])
+    lines = ["script_seq,script_for_manim,script_voice_over"]
+    lines += [f"{i},Draw scene {i},Narration {i}" for i in range(1, rows + 1)]
+    return "\n".join(lines)
+
+
+def parse_dicts(source: str, text: str) -> list[dict]:
+    """The dict-based path the parsers used before"""
+    if source == "json":
+        return json.loads(text)
+    return list(csv.DictReader(text.splitlines()))
+
+
+def parse_sequences(source: str, text: str) -> list:
+    if source == "json":
+        # json.loads rather than the chunked stream reader, so only the row model differs
+        return list(normalize(json.loads(text)))
+    return list(CSVParser().iter_parse([text]))
+
+
+def parse_batch(source: str, text: str) -> SequenceBatch:
+    parser = JSONParser() if source == "json" else CSVParser()
+    return parser.parse(text)["sequences"]
+
+
+def consume_dicts(rows) -> int:
+    total = 0
+    for row in rows:
+        total += len(str(row.get("script_seq"))) + len(row.get("script_for_manim")) + len(row.get("script_voice_over", ""))
+    return total
+
+
+def consume_sequences(rows) -> int:
+    total = 0
+    for seq in rows:
+        total += len(str(seq.script_seq)) + len(seq.script_for_manim) + len(seq.script_voice_over)
+    return total
+
+
+PATHS = {
+    "dict": (parse_dicts, consume_dicts),
+    "Sequence": (parse_sequences, consume_sequences),
+    "SequenceBatch": (parse_batch, consume_sequences),
+}
+
+
+def measure(source: str, text: str, name: str) -> tuple[float, float]:
+    parse, consume = PATHS[name]
+    gc.collect()
+    tracemalloc.start()
+    rows = parse(source, text)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del rows
+
+    gc.collect()
+    start = time.perf_counter()
+    consume(parse(source, text))
+    return held, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--source", choices=["csv", "json"], default="csv")
+    args = parser.parse_args()
+
+    text = source_text(args.source, args.rows)
+    results = {name: measure(args.source, text, name) for name in PATHS}
+    base_memory, base_seconds = results["dict"]
+    print(f"{'rows':<14} {'MiB held':>9} {'B/row':>7} {'seconds':>9} {'rows/s':>11} {'memory':>7} {'speed':>6}")
+    for name, (memory, seconds) in results.items():
+        print(
+            f"{name:<14} {memory / 2**20:>9.1f} {memory / args.rows:>7.0f} {seconds:>9.3f} "
+            f"{args.rows / seconds:>11.0f} {memory / base_memory:>6.2f}x {base_seconds / seconds:>5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Measures cold-start import cost of a local JSON → manim run with `python -X importtime`.
+
+    python -m benchmarks.bench_startup [--runs 5]
+
+"lazy" builds the handlers the way main.py does for a local run. "eager" additionally
+imports what every run used to pay for at import time (psycopg2, python-dotenv and
+load_dotenv(), importlib.metadata) to show the gain of the lazy registry.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+LAZY = """
+from src.factories.input_handler_factory import InputHandlerFactory
+from src.factories.output_handler_factory import OutputHandlerFactory
+from src.factories.parser_factory import ParserFactory
+InputHandlerFactory.get_handler("local")
+ParserFactory.get_parser("json")
+OutputHandlerFactory.get_handler({"type": "local"})
+OutputHandlerFactory.get_handler({"type": "manim"})
+"""
+
+EAGER = """
+import psycopg2, psycopg2.extras, importlib.metadata
+from dotenv import load_dotenv
+load_dotenv()
+""" + LAZY
+
+
+def import_time_us(code: str) -> int:
+    """Sum of the cumulative import times of top-level imports, in microseconds"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name[1:].startswith(" "):  # nested imports are indented
+            total += int(cumulative)
+    return total
+
+
+def wall_time_ms(code: str) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=ROOT, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'mode':<6} {'imports ms':>11} {'process ms':>11}")
+    results = {}
+    for mode, code in (("eager", EAGER), ("lazy", LAZY)):
+        imports = statistics.median(import_time_us(code) for _ in range(args.runs)) / 1000
+        wall = statistics.median(wall_time_ms(code) for _ in range(args.runs))
+        results[mode] = wall
+        print(f"{mode:<6} {imports:>11.1f} {wall:>11.1f}")
+    print(f"cold-start gain: {results['eager'] - results['lazy']:.1f} ms per process")
+
+
+if __name__ == "__main__":
+    main()
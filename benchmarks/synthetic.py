@@ -0,0 +1,78 @@
+"""
+Deterministic synthetic inputs for the benchmarks: the same size always produces the same bytes.
+
+    write_input("json", 100_000, Path(".benchmarks/inputs"))  # -> .benchmarks/inputs/json_100000.json
+
+Formats are "json", "csv", "txt" and "db" (an SQLite file holding a `scripts` table that
+DatabaseInputHandler reads through the DB-API fallback).
+"""
+import csv
+import json
+import sqlite3
+from pathlib import Path
+
+SIZES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+FORMATS = ("json", "csv", "txt", "db")
+SUFFIXES = {"json": ".json", "csv": ".csv", "txt": ".txt", "db": ".sqlite"}
+
+_SHAPES = ("Circle", "Square", "Triangle", "Arrow", "Text", "Axes", "Graph")
+
+
+def parse_size(label: str) -> int:
+    """ "100k" -> 100000; plain integers are accepted too"""
+    label = label.lower()
+    return SIZES[label] if label in SIZES else int(label)
+
+
+def size_label(n: int) -> str:
+    return next((label for label, size in SIZES.items() if size == n), str(n))
+
+
+def rows(n: int):
+    """(script_seq, script_for_manim, script_voice_over) tuples with varying text lengths"""
+    for i in range(1, n + 1):
+        shape = _SHAPES[i % len(_SHAPES)]
+        words = " and then" * (i % 5)
+        yield i, f"Create a {shape} for scene {i}{words} fade it out", f"Scene {i} shows a {shape.lower()}{words}."
+
+
+def input_path(fmt: str, n: int, directory: Path) -> Path:
+    return Path(directory) / f"{fmt}_{n}{SUFFIXES[fmt]}"
+
+
+def write_input(fmt: str, n: int, directory: Path) -> Path:
+    """Writes the input once; later calls reuse the file"""
+    path = input_path(fmt, n, directory)
+    if path.exists():
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".partial")
+    tmp_path.unlink(missing_ok=True)
+
+    match fmt:
+        case "json":
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write("[")
+                for seq, script, voice_over in rows(n):
+                    item = {"script_seq": seq, "script_for_manim": script, "script_voice_over": voice_over}
+                    f.write(("," if seq > 1 else "") + "\n" + json.dumps(item, ensure_ascii=False))
+                f.write("\n]\n")
+        case "csv":
+            with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["script_seq", "script_for_manim", "script_voice_over"])
+                writer.writerows(rows(n))
+        case "txt":
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(f"{script}\n" for _, script, _ in rows(n))
+        case "db":
+            conn = sqlite3.connect(tmp_path)
+            conn.execute("CREATE TABLE scripts (script_seq INTEGER, script_for_manim TEXT, script_voice_over TEXT)")
+            conn.executemany("INSERT INTO scripts VALUES (?, ?, ?)", rows(n))
+            conn.commit()
+            conn.close()
+        case _:
+            raise ValueError(f"Unknown synthetic format: {fmt} (expected one of {', '.join(FORMATS)})")
+
+    tmp_path.replace(path)
+    return path
@@ -0,0 +1,136 @@
+"""
+Runs many pipeline projects in one process, sharing handlers, connections and caches.
+
+    python -m src.batch configs/a.json configs/b.json
+    python -m src.batch --input-dir data --config config.json
+
+With --input-dir every .json/.csv/.txt file becomes a project built from --config:
+its parsed copy, Manim folder and videos are named after the file. Videos of each
+project go to <media_dir>/<project>.
+
+Every project's config is validated and compiled before the first project runs, so
+a typo in the last config stops the batch before anything is rendered.
+"""
+import argparse
+import time
+from pathlib import Path
+
+from src.config_loader import ConfigError, ConfigLoader
+from src.instrumentation import Instrumentation, get_instrumentation, set_instrumentation
+from src.pipeline import PipelineContext, project_config, run_pipeline
+from src.plan import compile_plan
+
+INPUT_SUFFIXES = (".json", ".csv", ".txt")
+
+
+def load_config(path: Path) -> dict:
+    """Reads and validates a config; raises ConfigError listing every problem"""
+    return ConfigLoader(path).load()
+
+
+def projects_from_configs(paths: list[Path]) -> list[tuple[str, dict]]:
+    """Loads every config, raising one ConfigError with the problems of all of them"""
+    projects, problems = [], []
+    for path in paths:
+        try:
+            projects.append((path.stem, load_config(path)))
+        except ConfigError as e:
+            problems.extend(f"{path.stem}: {problem}" for problem in e.problems)
+    if problems:
+        raise ConfigError(problems)
+    return projects
+
+
+def projects_from_input_dir(input_dir: Path, base_config: dict) -> list[tuple[str, dict]]:
+    files = sorted(p for p in input_dir.iterdir() if p.is_file() and p.suffix.lower() in INPUT_SUFFIXES)
+    return [(path.stem, project_config(base_config, path)) for path in files]
+
+
+def validate_projects(projects: list[tuple[str, dict]]):
+    """Compiles every project's plan; raises one ConfigError with the problems of all of them"""
+    problems = []
+    for name, config in projects:
+        try:
+            compile_plan(config)
+        except ConfigError as e:
+            problems.extend(f"{name}: {problem}" for problem in e.problems)
+    if problems:
+        raise ConfigError(problems)
+
+
+def run_batch(projects: list[tuple[str, dict]], context: PipelineContext | None = None, resume=False) -> list[dict]:
+    """
+    Runs each project in turn; a failing project is reported and the batch carries on.
+    Every config is validated first and an invalid one raises ConfigError before any project runs.
+    resume=True continues each project's run journal (see run_pipeline).
+    """
+    validate_projects(projects)
+    context = context or PipelineContext()
+    metrics = get_instrumentation()
+    results = []
+
+    for name, config in projects:
+        print(f"\n📦 Project {name}")
+        media_dir = Path(config["video_output"].get("media_dir", "media")) / name
+        summary = {"project": name, "status": "ok", "sequences": None, "rendered": 0, "error": None}
+        start = time.perf_counter()
+        try:
+            result = run_pipeline(config, context, media_dir=media_dir, resume=resume)
+            if result["generated"] is not None:
+                summary["sequences"] = len(result["generated"]["py_files"])
+            summary["rendered"] = len(result["rendered"])
+        except Exception as e:
+            summary.update(status="error", error=repr(e))
+            print(f"❌ Project {name} failed: {e}")
+        summary["seconds"] = round(time.perf_counter() - start, 3)
+        metrics.emit({"stage": "project", **summary, "wall_s": summary["seconds"]})
+        results.append(summary)
+
+    return results
+
+
+def format_summary(results: list[dict]) -> str:
+    rows = [("project", "status", "sequences", "rendered", "seconds")]
+    for r in results:
+        sequences = "-" if r["sequences"] is None else str(r["sequences"])
+        rows.append((r["project"], r["status"], sequences, str(r["rendered"]), f"{r['seconds']:.2f}"))
+    rows.append(("total", "", "", str(sum(r["rendered"] for r in results)), f"{sum(r['seconds'] for r in results):.2f}"))
+
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(w) if i == 0 else cell.rjust(w) for i, (cell, w) in enumerate(zip(row, widths)))
+             for row in rows]
+    lines.insert(1, "-" * len(lines[0]))
+    lines.insert(-1, "-" * len(lines[0]))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("configs", nargs="*", type=Path, help="project config files")
+    parser.add_argument("--input-dir", type=Path, help="folder of input files, one project each")
+    parser.add_argument("--config", type=Path, default=Path("config.json"), help="base config for --input-dir")
+    parser.add_argument("--resume", action="store_true", help="skip work finished by an interrupted run")
+    args = parser.parse_args(argv)
+
+    if not args.input_dir and not args.configs:
+        parser.error("pass config files or --input-dir")
+    try:
+        if args.input_dir:
+            base_config = load_config(args.config)
+            projects = projects_from_input_dir(args.input_dir, base_config)
+        else:
+            projects = projects_from_configs(args.configs)
+            base_config = projects[0][1]
+        validate_projects(projects)
+    except ConfigError as e:
+        print(f"❌ {e}")
+        return 2
+
+    set_instrumentation(Instrumentation.from_config(base_config.get("metrics")))
+    results = run_batch(projects, resume=args.resume)
+    print("\n" + format_summary(results))
+    return 0 if all(r["status"] == "ok" for r in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
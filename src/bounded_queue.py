@@ -0,0 +1,91 @@
+import queue
+import threading
+
+
+class QueueCancelled(Exception):
+    """The consumer stopped; the producer should stop too"""
+
+
+_CLOSED = object()
+
+
+class BoundedQueue:
+    """
+    Hands items from one pipeline stage to the next across threads.
+
+    put() blocks while the queue is full, so a slow consumer holds back the
+    producer and memory stays bounded (backpressure). Iterating yields items
+    until the producer calls close(); an error passed to close() is re-raised
+    in the consumer. cancel() makes pending and future put() calls raise QueueCancelled.
+    """
+
+    # how often a blocked put() checks for cancellation
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, maxsize: int):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self._queue = queue.Queue(maxsize)
+        self._cancelled = threading.Event()
+        self._error = None
+
+    def put(self, item):
+        while True:
+            if self._cancelled.is_set():
+                raise QueueCancelled()
+            try:
+                self._queue.put(item, timeout=self.POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def close(self, error: BaseException | None = None):
+        """Marks the end of the stream; the consumer re-raises error, if given"""
+        self._error = error
+        try:
+            self.put(_CLOSED)
+        except QueueCancelled:
+            pass
+
+    def cancel(self):
+        self._cancelled.set()
+
+    def __iter__(self):
+        while True:
+            item = self._queue.get()
+            if item is _CLOSED:
+                if self._error is not None:
+                    raise self._error
+                return
+            yield item
+
+    def __len__(self):
+        return self._queue.qsize()
+
+
+def prefetch(iterable, maxsize: int):
+    """
+    Produces items of iterable on a background thread, at most maxsize ahead of the consumer.
+    Closing the returned generator early stops the background thread.
+    """
+    items = BoundedQueue(maxsize)
+
+    def produce():
+        try:
+            for item in iterable:
+                items.put(item)
+        except QueueCancelled:
+            return
+        except BaseException as e:
+            items.close(e)
+            return
+        items.close()
+
+    thread = threading.Thread(target=produce, name="prefetch", daemon=True)
+    thread.start()
+    try:
+        yield from items
+    finally:
+        items.cancel()
+        thread.join()
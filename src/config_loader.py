@@ -1,12 +1,211 @@
+import importlib.util
 import json
+import shutil
 from pathlib import Path
 
+from src.factories.input_handler_factory import InputHandlerFactory
+from src.factories.output_handler_factory import OutputHandlerFactory
+from src.factories.parser_factory import ParserFactory
+
+SECTIONS = ("input", "parsed_copy", "manim_output", "video_output")
+OPTIONAL_SECTIONS = ("voice_over", "concat_output", "pipeline", "journal", "metrics")
+
+QUALITIES = ("low", "medium", "high", "production", "4k")
+ENGINES = ("subprocess", "inprocess")
+WRITERS = ("sequential", "concurrent")
+MODES = ("staged", "streaming")
+UPGRADES = ("approved", "all")
+
+
+class ConfigError(ValueError):
+    """Every problem found in a config, reported together before any stage runs"""
+
+    def __init__(self, problems: list[str]):
+        self.problems = problems
+        super().__init__("invalid config:\n" + "\n".join(f"  - {problem}" for problem in problems))
+
+
 class ConfigLoader:
     def __init__(self, config_path="config.json"):
         self.config_path = Path(config_path)
 
     def load(self):
+        """Reads and validates the config; raises ConfigError listing every problem"""
         if not self.config_path.exists():
             raise FileNotFoundError(f"Config file {self.config_path} not found")
         with open(self.config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
+            config = json.load(f)
+        validate_config(config)
+        return config
+
+    def plan(self):
+        """The compiled PipelinePlan of the config"""
+        from src.plan import compile_plan
+
+        return compile_plan(self.load())
+
+
+def validate_config(config) -> None:
+    """Raises ConfigError when config would fail in any pipeline stage"""
+    if not isinstance(config, dict):
+        raise ConfigError(["a config is a JSON object"])
+    problems = []
+    for key in config:
+        if key not in SECTIONS + OPTIONAL_SECTIONS:
+            problems.append(f"unknown section {key!r}")
+    for key in SECTIONS:
+        if not isinstance(config.get(key), dict):
+            problems.append(f"missing section {key!r}")
+    for key in OPTIONAL_SECTIONS:
+        if key in config and not isinstance(config[key], dict):
+            problems.append(f"{key}: expected an object")
+    sections = {key: value for key, value in config.items() if isinstance(value, dict)}
+
+    if "input" in sections:
+        _check_input(sections["input"], problems)
+    if "parsed_copy" in sections:
+        _check_parsed_copy(sections["parsed_copy"], problems)
+    if "manim_output" in sections:
+        _check_manim(sections["manim_output"], problems)
+    if "video_output" in sections:
+        _check_video(sections["video_output"], problems)
+    if "voice_over" in sections:
+        _check_voice_over(sections["voice_over"], problems)
+    if "concat_output" in sections:
+        section = sections["concat_output"]
+        _check_output_type("concat_output", section, problems)
+        _check_number("concat_output", section, "segment_size", problems, integer=True, minimum=1)
+        _check_tool("concat_output", section, "ffmpeg", problems)
+        _check_tool("concat_output", section, "ffprobe", problems)
+    if "pipeline" in sections:
+        section = sections["pipeline"]
+        _check_choice("pipeline", section, "mode", MODES, problems)
+        _check_number("pipeline", section, "queue_size", problems, integer=True, minimum=1)
+        video = sections.get("video_output", {})
+        regenerate = sections.get("manim_output", {}).get("regenerate", True)
+        if section.get("mode") == "streaming" and regenerate and video.get("passes"):
+            # streaming renders each scene once as it is generated; there is no second pass to queue
+            problems.append("pipeline.mode: 'streaming' cannot render video_output.passes; use 'staged'")
+
+    if problems:
+        raise ConfigError(problems)
+
+
+def _check_input(section: dict, problems: list[str]):
+    source_type = section.get("type")
+    if not isinstance(source_type, str) or source_type.lower() not in InputHandlerFactory.types():
+        problems.append(f"input.type: {source_type!r} is not one of {', '.join(InputHandlerFactory.types())}")
+    file_type = section.get("file_type", "json")
+    if not isinstance(file_type, str) or file_type.lower() not in ParserFactory.parsers:
+        problems.append(f"input.file_type: {file_type!r} is not one of {', '.join(ParserFactory.parsers)}")
+    if source_type == "local":
+        _check_required("input", section, ("path", "file"), problems)
+    elif source_type == "db":
+        _check_required("input", section, ("table",), problems)
+
+
+def _check_parsed_copy(section: dict, problems: list[str]):
+    from src.parsed_copy import FORMATS
+
+    _check_output_type("parsed_copy", section, problems)
+    if section.get("type") == "local":
+        _check_required("parsed_copy", section, ("path", "file"), problems)
+        _check_choice("parsed_copy", section, "format", FORMATS, problems)
+        if section.get("format") == "arrow" and importlib.util.find_spec("pyarrow") is None:
+            problems.append('parsed_copy.format: "arrow" requires pyarrow: pip install pyarrow')
+
+
+def _check_manim(section: dict, problems: list[str]):
+    from src.output_handler import ManimOutputHandler
+
+    _check_output_type("manim_output", section, problems)
+    _check_required("manim_output", section, ("base_name",), problems)
+    _check_choice("manim_output", section, "writer", WRITERS, problems)
+    _check_number("manim_output", section, "writer_workers", problems, integer=True, minimum=1)
+    if "path" in section and "base_output_path" in section and isinstance(section.get("base_name"), str):
+        # generation and rendering used to read different keys; both must name the same folder
+        legacy = Path(section["base_output_path"]) / "manim_files" / section["base_name"]
+        if legacy != ManimOutputHandler.base_path(section):
+            problems.append(f"manim_output: path gives {ManimOutputHandler.base_path(section)} but base_output_path "
+                            f"gives {legacy}; keep only path")
+
+
+def _check_video(section: dict, problems: list[str]):
+    _check_output_type("video_output", section, problems)
+    _check_choice("video_output", section, "quality", QUALITIES, problems)
+    _check_choice("video_output", section, "engine", ENGINES, problems)
+    _check_number("video_output", section, "max_workers", problems, integer=True, minimum=1)
+    _check_number("video_output", section, "max_scenes_per_worker", problems, integer=True, minimum=1)
+    _check_number("video_output", section, "timeout", problems, minimum=0, exclusive=True)
+    _check_number("video_output", section, "retries", problems, integer=True, minimum=0)
+    _check_number("video_output", section, "retry_backoff", problems, minimum=0)
+    if "cache" in section and not isinstance(section["cache"], dict):
+        problems.append("video_output.cache: expected an object")
+    if section.get("progress") and section.get("engine") == "inprocess":
+        # live progress is read from `manim render` output; warm workers have none to stream
+        problems.append("video_output.progress: needs engine 'subprocess', not 'inprocess'")
+    passes = section.get("passes")
+    if passes is not None:
+        if not isinstance(passes, dict):
+            problems.append("video_output.passes: expected an object")
+        else:
+            _check_choice("video_output.passes", passes, "preview", QUALITIES, problems)
+            _check_choice("video_output.passes", passes, "final", QUALITIES, problems)
+            _check_choice("video_output.passes", passes, "upgrade", UPGRADES, problems)
+
+
+def _check_voice_over(section: dict, problems: list[str]):
+    from src.tts import ENGINES as TTS_ENGINES
+
+    _check_output_type("voice_over", section, problems)
+    engine = section.get("engine", "espeak")
+    if not isinstance(engine, str) or (engine not in TTS_ENGINES and ":" not in engine):
+        problems.append(f"voice_over.engine: {engine!r} is not one of {', '.join(TTS_ENGINES)} or module:Class")
+    _check_number("voice_over", section, "max_workers", problems, integer=True, minimum=1)
+    if engine == "espeak":
+        options = section.get("engine_options")
+        executable = options.get("executable") if isinstance(options, dict) else None
+        found = shutil.which(executable) if executable else shutil.which("espeak-ng") or shutil.which("espeak")
+        if found is None:
+            problems.append(f"voice_over.engine: 'espeak' needs {executable or 'espeak-ng or espeak'} on PATH")
+    if section.get("mux", True):
+        _check_tool("voice_over", section, "ffmpeg", problems)
+
+
+def _check_tool(name: str, section: dict, tool: str, problems: list[str]):
+    """section[tool], or tool itself, must name an executable on PATH"""
+    executable = section.get(tool, tool)
+    if not isinstance(executable, str) or shutil.which(executable) is None:
+        problems.append(f"{name}.{tool}: {executable!r} not found on PATH")
+
+
+def _check_output_type(name: str, section: dict, problems: list[str]):
+    output_type = section.get("type")
+    if output_type not in OutputHandlerFactory.types():
+        problems.append(f"{name}.type: {output_type!r} is not one of {', '.join(OutputHandlerFactory.types())}")
+
+
+def _check_required(name: str, section: dict, keys, problems: list[str]):
+    for key in keys:
+        if not isinstance(section.get(key), str) or not section[key]:
+            problems.append(f"{name}.{key}: required")
+
+
+def _check_choice(name: str, section: dict, key: str, choices, problems: list[str]):
+    value = section.get(key)
+    if value is None:
+        return
+    if not isinstance(value, str) or value.lower() not in choices:
+        problems.append(f"{name}.{key}: {value!r} is not one of {', '.join(choices)}")
+
+
+def _check_number(name: str, section: dict, key: str, problems: list[str], integer=False, minimum=None,
+                  exclusive=False):
+    value = section.get(key)
+    if value is None:
+        return
+    kind = int if integer else (int, float)
+    if isinstance(value, bool) or not isinstance(value, kind):
+        problems.append(f"{name}.{key}: expected {'an integer' if integer else 'a number'}, got {value!r}")
+    elif minimum is not None and (value <= minimum if exclusive else value < minimum):
+        problems.append(f"{name}.{key}: must be {'above' if exclusive else 'at least'} {minimum}, got {value!r}")
@@ -0,0 +1,88 @@
+import os
+import queue
+import re
+import threading
+from contextlib import contextmanager
+
+
+def postgres_config() -> dict:
+    """Connection settings from the environment and .env (loaded on first use, not at import)"""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    return {
+        "host": os.getenv("POSTGRES_HOST"),
+        "port": os.getenv("POSTGRES_PORT"),
+        "dbname": os.getenv("POSTGRES_DB"),
+        "user": os.getenv("POSTGRES_USER"),
+        "password": os.getenv("POSTGRES_PASSWORD"),
+    }
+
+
+def identifier(name: str) -> str:
+    """Guards table/column names that have to be formatted into SQL"""
+    if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?", str(name)):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return name
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of DB-API connections shared by the database handlers.
+
+    Connections are opened lazily, at most max_size are handed out at once and
+    idle ones are reused. placeholder is the driver's parameter marker
+    ("%s" for psycopg2, "?" for sqlite3).
+    """
+
+    def __init__(self, connect=None, max_size=4, placeholder="%s"):
+        self._connect = connect or _connect_postgres
+        self.placeholder = placeholder
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    @contextmanager
+    def connection(self):
+        """Borrows a connection; any open transaction is rolled back on error"""
+        self._slots.acquire()
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                if not getattr(conn, "closed", False):
+                    self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close_all(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def _connect_postgres():
+    import psycopg2
+
+    return psycopg2.connect(**postgres_config())
+
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+
+def default_pool() -> ConnectionPool:
+    """Process-wide Postgres pool configured from the environment"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ConnectionPool()
+        return _default_pool
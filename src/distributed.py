@@ -0,0 +1,183 @@
+"""
+Renders one Manim project on many machines through a shared SQLite work queue.
+
+    python -m src.distributed coordinator --queue shared/queue.sqlite --manim-path shared/manim_files/script_data --wait
+    python -m src.distributed worker --queue shared/queue.sqlite --output shared/media --config config.json
+
+The coordinator turns every script_seqN.py of --manim-path into a render job. Workers
+(any number, on any node that sees the shared folder) claim jobs under a lease, render
+them into a local scratch media folder with the config's video_output settings and
+publish each video to --output under the same videos/<scene>/<resolution>/ layout, so
+the output folder can be joined by the concat handler like a media folder. The scratch
+folder is removed when the worker exits.
+Jobs of a worker that dies are reclaimed once their lease expires.
+
+The shared folder must support POSIX file locks, which SQLite relies on; see src.work_queue
+for the network file system caveat.
+"""
+import argparse
+import os
+import shutil
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from src.config_loader import ConfigError, ConfigLoader
+from src.factories.output_handler_factory import OutputHandlerFactory
+from src.output_handler import VideoOutputHandler
+from src.work_queue import WorkQueue
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+def coordinate(queue: WorkQueue, manim_base_path, wait: bool = False, poll_interval: float = 2.0) -> dict:
+    """
+    Queues the scenes of manim_base_path; with wait=True blocks until every job is done
+    or failed, reclaiming expired leases meanwhile. Returns the job counts.
+    """
+    py_files = VideoOutputHandler.scene_files(Path(manim_base_path))
+    queued = queue.enqueue(py_files)
+    print(f"📮 Queued {queued} of {len(py_files)} scenes from {manim_base_path}")
+    while wait and not queue.finished():
+        time.sleep(poll_interval)
+        queue.reclaim_expired()
+    counts = queue.counts()
+    print(f"📊 Render jobs: {counts}")
+    return counts
+
+
+class RenderWorker:
+    """
+    Claims render jobs until the queue is finished (or forever with stop_when_idle=False).
+    A heartbeat thread renews the lease while a scene renders; when the lease is lost the
+    render is cancelled and its result dropped.
+    """
+
+    def __init__(self, queue: WorkQueue, handler: VideoOutputHandler, output_dir, worker_id: str | None = None,
+                 heartbeat_interval: float | None = None, poll_interval: float = 1.0):
+        self.queue = queue
+        self.worker_id = worker_id or default_worker_id()
+        # every worker renders into its own scratch folder; only finished videos reach output_dir
+        self.handler = handler.with_media_dir(Path(handler.media_dir) / "workers" / self.worker_id)
+        self.output_dir = Path(output_dir)
+        self.heartbeat_interval = heartbeat_interval or queue.lease_seconds / 3
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+
+    def run(self, stop_when_idle: bool = True) -> dict:
+        """Returns {"done": n, "failed": n, "lost": n} for the jobs this worker claimed"""
+        stats = {"done": 0, "failed": 0, "lost": 0}
+        try:
+            while not self._stop.is_set():
+                job = self.queue.claim(self.worker_id)
+                if job is None:
+                    if stop_when_idle and self.queue.finished():
+                        break
+                    # other workers still hold leases that may expire and come back
+                    self._stop.wait(self.poll_interval)
+                    continue
+                stats[self.process(job)] += 1
+        finally:
+            # published videos live in output_dir; the scratch renders are not needed again
+            shutil.rmtree(self.handler.media_dir, ignore_errors=True)
+        return stats
+
+    def stop(self):
+        self._stop.set()
+
+    def process(self, job) -> str:
+        print(f"👷 {self.worker_id} rendering {job.py_file} (attempt {job.attempts} of {job.max_attempts})")
+        # a clone per job, so cancelling a render on a lost lease leaves the next job alone
+        handler = self.handler.with_media_dir(self.handler.media_dir)
+        lost = threading.Event()
+        done = threading.Event()
+
+        def heartbeat():
+            while not done.wait(self.heartbeat_interval):
+                if not self.queue.heartbeat(job.id, self.worker_id):
+                    lost.set()
+                    handler.cancel()
+                    return
+
+        beater = threading.Thread(target=heartbeat, name=f"heartbeat-{job.id}", daemon=True)
+        beater.start()
+        result, error = None, None
+        try:
+            result = handler.render(job.py_file)
+        except Exception as e:
+            error = repr(e)
+        finally:
+            done.set()
+            beater.join()
+
+        if lost.is_set():
+            print(f"⚠️ {self.worker_id} lost the lease on {job.py_file}; dropping its result")
+            return "lost"
+        if result is not None and result.ok:
+            output = self.publish(handler, result.video)
+            if self.queue.complete(job.id, self.worker_id, str(output)):
+                return "done"
+            return "lost"
+        if result is not None:
+            error = result.error or f"exit code {result.returncode}"
+        self.queue.fail(job.id, self.worker_id, error)
+        return "failed"
+
+    def publish(self, handler: VideoOutputHandler, video: Path) -> Path:
+        """Copies a rendered video to the shared output folder; the file appears complete or not at all"""
+        target = self.output_dir / Path(video).relative_to(handler.media_dir)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f".{target.name}.{self.worker_id}.partial")
+        shutil.copyfile(video, partial)
+        os.replace(partial, target)
+        return target
+
+
+def _video_handler(config_path: Path) -> VideoOutputHandler:
+    return OutputHandlerFactory.get_handler(ConfigLoader(config_path).load()["video_output"])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queue", type=Path, default=Path("render_queue.sqlite"), help="shared SQLite queue file")
+    parser.add_argument("--lease", type=float, default=60.0, help="seconds a claimed job stays leased without a heartbeat")
+    parser.add_argument("--max-attempts", type=int, default=3)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    coordinator = commands.add_parser("coordinator", help="queue the scenes of a Manim project")
+    coordinator.add_argument("--manim-path", type=Path, required=True, help="folder holding the script_seq folders")
+    coordinator.add_argument("--wait", action="store_true", help="block until every job is done or failed")
+
+    worker = commands.add_parser("worker", help="claim and render queued scenes")
+    worker.add_argument("--output", type=Path, required=True, help="shared folder the videos are published to")
+    worker.add_argument("--config", type=Path, default=Path("config.json"), help="config with a video_output section")
+    worker.add_argument("--worker-id", default=None)
+    worker.add_argument("--forever", action="store_true", help="keep polling once the queue is finished")
+    args = parser.parse_args(argv)
+
+    queue = WorkQueue(args.queue, lease_seconds=args.lease, max_attempts=args.max_attempts)
+    if args.command == "coordinator":
+        counts = coordinate(queue, args.manim_path, wait=args.wait)
+        return 1 if args.wait and counts["failed"] else 0
+
+    try:
+        handler = _video_handler(args.config)
+    except ConfigError as e:
+        print(f"❌ {args.config}: {e}")
+        return 2
+    render_worker = RenderWorker(queue, handler, args.output, worker_id=args.worker_id)
+    try:
+        stats = render_worker.run(stop_when_idle=not args.forever)
+    except KeyboardInterrupt:
+        # the running manim gets the same Ctrl+C; its job comes back once the lease expires
+        return 130
+    print(f"🏁 {render_worker.worker_id}: {stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,14 +1,50 @@
-from src.input_handler import LocalFileInputHandler, DatabaseInputHandler, CloudInputHandler
+import importlib
+import threading
+
 
 class InputHandlerFactory:
-    @staticmethod
-    def get_handler(source_type: str):
-        match source_type.lower():
-            case "local":
-                return LocalFileInputHandler()
-            case "db":
-                return DatabaseInputHandler()
-            case "cloud":
-                return CloudInputHandler()
-            case _:
-                raise ValueError(f"Unknown input handler type: {source_type}")
+    """
+    Registry of input handlers.
+    A handler's module is imported only when its type is first requested; instances are cached per type.
+    """
+
+    # type -> (module, class name)
+    _registry = {}
+    _instances = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def register(cls, source_type: str, target: str):
+        """target: "package.module:ClassName\""""
+        cls._registry[source_type] = tuple(target.split(":"))
+
+    @classmethod
+    def types(cls) -> list[str]:
+        return sorted(cls._registry)
+
+    @classmethod
+    def target(cls, source_type: str) -> str:
+        """"package.module:ClassName" registered for source_type"""
+        return ":".join(cls._registry[source_type.lower()])
+
+    @classmethod
+    def get_handler(cls, source_type: str):
+        source_type = source_type.lower()
+        if source_type not in cls._registry:
+            raise ValueError(f"Unknown input handler type: {source_type}")
+
+        with cls._lock:
+            if source_type not in cls._instances:
+                module, class_name = cls._registry[source_type]
+                cls._instances[source_type] = getattr(importlib.import_module(module), class_name)()
+            return cls._instances[source_type]
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._instances.clear()
+
+
+InputHandlerFactory.register("local", "src.input_handler:LocalFileInputHandler")
+InputHandlerFactory.register("db", "src.input_handler:DatabaseInputHandler")
+InputHandlerFactory.register("cloud", "src.input_handler:CloudInputHandler")
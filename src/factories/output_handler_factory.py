@@ -1,15 +1,113 @@
-from src.output_handler import LocalOutputHandler, DatabaseOutputHandler, ManimOutputHandler, VideoOutputHandler
+import importlib
+import json
+import threading
+
+
+def _build_video(handler_cls, output_config: dict):
+    return handler_cls(
+        quality=output_config.get("quality", "low"),
+        max_workers=output_config.get("max_workers"),
+        timeout=output_config.get("timeout"),
+        media_dir=output_config.get("media_dir", "media"),
+        cache=OutputHandlerFactory.render_cache(output_config.get("cache", {})),
+        engine=output_config.get("engine", "subprocess"),
+        max_scenes_per_worker=output_config.get("max_scenes_per_worker"),
+        retries=output_config.get("retries", 0),
+        retry_backoff=output_config.get("retry_backoff", 1.0),
+        validate=output_config.get("validate", True),
+    )
+
+
+def _build_concat(handler_cls, output_config: dict):
+    return handler_cls(
+        segment_size=output_config.get("segment_size", 32),
+        ffmpeg=output_config.get("ffmpeg", "ffmpeg"),
+        ffprobe=output_config.get("ffprobe", "ffprobe"),
+    )
+
+
+def _build_voice_over(handler_cls, output_config: dict):
+    from src.tts import engine_from_config
+
+    engine = engine_from_config(output_config)
+    return handler_cls(
+        engine=engine,
+        cache=OutputHandlerFactory.render_cache(output_config.get("cache", {}), ".tts_cache", engine.suffix),
+        max_workers=output_config.get("max_workers"),
+        ffmpeg=output_config.get("ffmpeg", "ffmpeg"),
+        mux=output_config.get("mux", True),
+    )
+
 
 class OutputHandlerFactory:
-    @staticmethod
-    def get_handler(output_config: dict):
-        mapping = {
-            "local": LocalOutputHandler(),
-            "db": DatabaseOutputHandler(),
-            "manim": ManimOutputHandler(),
-            "video": VideoOutputHandler(quality=output_config.get("quality", "low"))
-        }
+    """
+    Registry of output handlers.
+
+    A handler's module is imported only when its type is first requested, only the
+    requested handler is built, and instances are cached per distinct config.
+    """
+
+    # type -> (module, class name, builder(handler_cls, output_config))
+    _registry = {}
+    _instances = {}
+    _render_caches = {}
+    _lock = threading.RLock()
+
+    @classmethod
+    def register(cls, output_type: str, target: str, builder=None):
+        """target: "package.module:ClassName"; builder defaults to calling the class with no arguments"""
+        module, class_name = target.split(":")
+        cls._registry[output_type] = (module, class_name, builder or (lambda handler_cls, _: handler_cls()))
+
+    @classmethod
+    def types(cls) -> list[str]:
+        return sorted(cls._registry)
+
+    @classmethod
+    def target(cls, output_type: str) -> str:
+        """"package.module:ClassName" registered for output_type"""
+        module, class_name, _ = cls._registry[output_type]
+        return f"{module}:{class_name}"
+
+    @classmethod
+    def get_handler(cls, output_config: dict):
         output_type = output_config["type"]
-        if output_type not in mapping:
+        if output_type not in cls._registry:
             raise ValueError(f"Unsupported output type: {output_type}")
-        return mapping[output_type]
+
+        key = (output_type, json.dumps(output_config, sort_keys=True, default=str))
+        with cls._lock:
+            if key not in cls._instances:
+                module, class_name, builder = cls._registry[output_type]
+                handler_cls = getattr(importlib.import_module(module), class_name)
+                cls._instances[key] = builder(handler_cls, output_config)
+            return cls._instances[key]
+
+    @classmethod
+    def render_cache(cls, cache_config: dict, default_path=".render_cache", suffix=".mp4"):
+        """One RenderCache per cache folder, shared by every handler using it"""
+        if not cache_config.get("enabled", True):
+            return None
+        from src.render_cache import RenderCache
+
+        path = cache_config.get("path", default_path)
+        with cls._lock:
+            if path not in cls._render_caches:
+                cls._render_caches[path] = RenderCache(
+                    path=path, max_size_mb=cache_config.get("max_size_mb", 2048), suffix=suffix
+                )
+            return cls._render_caches[path]
+
+    @classmethod
+    def clear_cache(cls):
+        with cls._lock:
+            cls._instances.clear()
+            cls._render_caches.clear()
+
+
+OutputHandlerFactory.register("local", "src.output_handler:LocalOutputHandler")
+OutputHandlerFactory.register("db", "src.output_handler:DatabaseOutputHandler")
+OutputHandlerFactory.register("manim", "src.output_handler:ManimOutputHandler")
+OutputHandlerFactory.register("video", "src.output_handler:VideoOutputHandler", _build_video)
+OutputHandlerFactory.register("concat", "src.output_handler:ConcatOutputHandler", _build_concat)
+OutputHandlerFactory.register("voice_over", "src.output_handler:VoiceOverOutputHandler", _build_voice_over)
@@ -1,16 +1,19 @@
 from src.parser import JSONParser, CSVParser, TXTParser, DBParser
 
 class ParserFactory:
+    parsers = {
+        "json": JSONParser,
+        # compact parsed copies, see src.parsed_copy
+        "jsonl": JSONParser,
+        "arrow": JSONParser,
+        "csv": CSVParser,
+        "txt": TXTParser,
+        "db": DBParser
+    }
+
     @staticmethod
     def get_parser(parser_type: str):
-        parser_map = {
-            "json": JSONParser,
-            "csv": CSVParser,
-            "txt": TXTParser,
-            "db": DBParser
-        }
-
-        if parser_type.lower() not in parser_map:
+        if parser_type.lower() not in ParserFactory.parsers:
             raise ValueError(f"Unsupported parser type: {parser_type}")
 
-        return parser_map[parser_type.lower()]()
+        return ParserFactory.parsers[parser_type.lower()]()
@@ -1,5 +1,7 @@
 from pathlib import Path
 from datetime import datetime
+from src.file_writer import FileWriter
+from src.sequence import normalize
 
 class FileGenerator:
     """
@@ -9,27 +11,33 @@ class FileGenerator:
 
     BASE_INPUT_PATH = Path("input")  # Base folder for all generated files
 
-    def generate(self, data: list[dict], base_name: str):
+    def __init__(self, writer: FileWriter | None = None):
+        # FileWriter writes sequentially; pass a ConcurrentFileWriter for network filesystems
+        self.writer = writer or FileWriter()
+
+    def generate(self, data: list, base_name: str):
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         base_path = self.BASE_INPUT_PATH / f"{base_name}_{timestamp}"
         base_path.mkdir(parents=True, exist_ok=True)
 
         generated_files = {"py_files": [], "txt_files": []}
 
-        for item in data:
-            seq = item.get("script_seq", "seq_unknown")
-            folder_path = base_path / f"script_seq{seq}"
-            folder_path.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with self.writer as writer:
+            for item in normalize(data):
+                seq = item.script_seq if item.script_seq is not None else "seq_unknown"
+                folder_path = base_path / f"script_seq{seq}"
 
-            py_path = folder_path / f"script_seq{seq}.py"
-            py_content = item.get("script_for_manim", "")
-            py_path.write_text(py_content, encoding="utf-8")
-            generated_files["py_files"].append(str(py_path))
+                py_path = folder_path / f"script_seq{seq}.py"
+                py_content = item.script_for_manim
+                writer.write(py_path, py_content)
+                generated_files["py_files"].append(str(py_path))
 
-            txt_path = folder_path / f"script_seq{seq}.txt"
-            txt_content = item.get("script_voice_over", "")
-            txt_path.write_text(txt_content, encoding="utf-8")
-            generated_files["txt_files"].append(str(txt_path))
+                txt_path = folder_path / f"script_seq{seq}.txt"
+                txt_content = item.script_voice_over
+                writer.write(txt_path, txt_content)
+                generated_files["txt_files"].append(str(txt_path))
+                count += 1
 
-        print(f"🎉 Generated .py and .txt files for {len(data)} sequences at {base_path}")
+        print(f"🎉 Generated .py and .txt files for {count} sequences at {base_path}")
         return generated_files
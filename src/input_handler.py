@@ -1,10 +1,8 @@
 from pathlib import Path
-import os
-import psycopg2
+import uuid
 from abc import ABC, abstractmethod
-from dotenv import load_dotenv
-
-load_dotenv()
+from src.db import ConnectionPool, default_pool, identifier
+from src.sequence import SequenceBatch
 
 
 class InputHandler(ABC):
@@ -13,6 +11,10 @@ class InputHandler(ABC):
         """Load raw data from source"""
         pass
 
+    def stream(self, source: dict):
+        """Yield raw data in chunks. Handlers that cannot stream yield everything at once."""
+        yield self.load(source)
+
     @staticmethod
     def validate_source(source: str | Path):
         if not source:
@@ -22,38 +24,102 @@ class InputHandler(ABC):
 class LocalFileInputHandler(InputHandler):
     """Reads raw file from local data/ folder"""
 
+    CHUNK_SIZE = 1024 * 1024
+
     def load(self, config: dict) -> str:
+        path = self._path(config)
+        return path.read_text(encoding="utf-8")
+
+    def stream(self, config: dict):
+        """Yields the file as text chunks of config["chunk_size"] characters"""
+        path = self._path(config)
+        chunk_size = config.get("chunk_size", self.CHUNK_SIZE)
+        with open(path, "r", encoding="utf-8") as f:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+    @staticmethod
+    def _path(config: dict) -> Path:
         path = Path(config["path"]) / config["file"]
         if not path.exists():
             raise FileNotFoundError(f"File not found: {path}")
-        return path.read_text(encoding="utf-8")
+        return path
 
 
 class DatabaseInputHandler(InputHandler):
-    """Optional DB input handler"""
-
-    def __init__(self):
-        self.db_config = {
-            "host": os.getenv("POSTGRES_HOST"),
-            "port": os.getenv("POSTGRES_PORT"),
-            "dbname": os.getenv("POSTGRES_DB"),
-            "user": os.getenv("POSTGRES_USER"),
-            "password": os.getenv("POSTGRES_PASSWORD"),
-        }
-
-    def load(self, config: dict):
-        table_name = config["table"]
-
-        conn = psycopg2.connect(**self.db_config)
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT * FROM {table_name}")
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
-
-        cursor.close()
-        conn.close()
-
-        return [dict(zip(columns, row)) for row in rows]
+    """
+    Reads script rows from Postgres.
+
+    Rows are read through a named (server-side) cursor and yielded in batches of
+    config["fetch_size"], so a table is never loaded into memory in full.
+    Connections come from the pool shared with DatabaseOutputHandler.
+    """
+
+    FETCH_SIZE = 1000
+
+    def __init__(self, pool: ConnectionPool | None = None):
+        self.pool = pool or default_pool()
+
+    def load(self, config: dict) -> SequenceBatch:
+        sequences = SequenceBatch()
+        for batch in self.stream(config):
+            sequences.extend(batch)
+        return sequences
+
+    def stream(self, config: dict):
+        """
+        Yields a SequenceBatch per fetch; columns are mapped to Sequence fields once per batch.
+        config: {"table", "columns": [...], "where": "...", "since_column", "since", "order_by", "fetch_size"}
+        """
+        query, params = self.build_query(config)
+        fetch_size = config.get("fetch_size", self.FETCH_SIZE)
+
+        with self.pool.connection() as conn:
+            cursor = self._cursor(conn, fetch_size)
+            try:
+                cursor.execute(query, params)
+                columns = None
+                while rows := cursor.fetchmany(fetch_size):
+                    # named cursors only describe their columns after the first fetch
+                    if columns is None:
+                        columns = [desc[0] for desc in cursor.description]
+                    yield SequenceBatch.from_rows(columns, rows)
+            finally:
+                cursor.close()
+                conn.rollback()  # read-only: just end the transaction that held the cursor
+
+    def build_query(self, config: dict) -> tuple[str, list]:
+        table_name = identifier(config["table"])
+        columns = config.get("columns")
+        select = ", ".join(identifier(col) for col in columns) if columns else "*"
+
+        clauses, params = [], []
+        order_by = config.get("order_by")
+        if config.get("where"):
+            clauses.append(f"({config['where']})")
+        if config.get("since") is not None:
+            # incremental pull: only rows changed after the last seen value, oldest first
+            since_column = identifier(config.get("since_column", "updated_at"))
+            clauses.append(f"{since_column} > {self.pool.placeholder}")
+            params.append(config["since"])
+            order_by = order_by or since_column
+
+        query = f"SELECT {select} FROM {table_name}"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        if order_by:
+            query += f" ORDER BY {identifier(order_by)}"
+        return query, params
+
+    @staticmethod
+    def _cursor(conn, fetch_size: int):
+        try:
+            cursor = conn.cursor(name=f"script_rows_{uuid.uuid4().hex}")
+        except TypeError:
+            # DB-API drivers without server-side cursors (e.g. sqlite3)
+            return conn.cursor()
+        cursor.itersize = fetch_size
+        return cursor
 
 
 class CloudInputHandler(InputHandler):
@@ -0,0 +1,259 @@
+import asyncio
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# per-thread I/O counters; falls back to the whole process on older kernels
+_IO_FILE = next((p for p in ("/proc/thread-self/io", "/proc/self/io") if os.path.exists(p)), None)
+# ru_maxrss is KiB on Linux and bytes on macOS
+_RSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+_thread_state = threading.local()
+
+
+class _IOCounterFile:
+    """Descriptor on _IO_FILE owned by one thread; closed when the thread's locals are dropped"""
+
+    def __init__(self):
+        self.fd = os.open(_IO_FILE, os.O_RDONLY)
+
+    def __del__(self):
+        os.close(self.fd)
+
+
+def _io_counters() -> tuple[int, int]:
+    """(rchar, wchar) of the calling thread"""
+    if _IO_FILE is None:
+        return 0, 0
+    try:
+        io_file = _thread_state.__dict__.get("io_file")
+        if io_file is None:
+            io_file = _thread_state.io_file = _IOCounterFile()
+        counters = dict(line.split(b": ") for line in os.pread(io_file.fd, 4096, 0).splitlines())
+        return int(counters[b"rchar"]), int(counters[b"wchar"])
+    except (OSError, KeyError, ValueError):
+        return 0, 0
+
+
+def _snapshot() -> dict:
+    bytes_read, bytes_written = _io_counters()
+    snap = {"wall_s": time.perf_counter(), "cpu_s": time.thread_time(), "children_cpu_s": 0.0,
+            "bytes_read": bytes_read, "bytes_written": bytes_written}
+    if resource is not None:
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        snap["children_cpu_s"] = children.ru_utime + children.ru_stime
+    return snap
+
+
+def _current_task() -> asyncio.Task | None:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:  # no event loop running in this thread
+        return None
+
+
+def peak_rss_bytes() -> int | None:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _RSS_UNIT
+
+
+class _Measurement:
+    """Accumulates metrics over one or more timed sections, excluding time spent in nested sections"""
+
+    METRICS = ("wall_s", "cpu_s", "children_cpu_s", "bytes_read", "bytes_written")
+
+    def __init__(self):
+        self.totals = dict.fromkeys(self.METRICS, 0)
+        self.nested = dict.fromkeys(self.METRICS, 0)
+
+    def exclusive(self) -> dict:
+        values = {key: self.totals[key] - self.nested[key] for key in self.METRICS}
+        for key in ("wall_s", "cpu_s", "children_cpu_s"):
+            values[key] = round(values[key], 6)
+        return values
+
+
+class Instrumentation:
+    """
+    Records wall time, CPU time, peak RSS, bytes read/written and exit codes per pipeline stage.
+
+    Metrics of a stage exclude nested stages on the same thread, so streamed stages
+    (load → parse → save) each report only their own share. cpu_s and bytes are per
+    thread; children_cpu_s (time of finished subprocesses) and peak RSS are process-wide.
+    Stages opened in an asyncio task are kept apart like those of another thread, so
+    concurrent tasks on one event loop are not nested in one another.
+    Records are passed to every sink, e.g. JsonLinesSink.
+    """
+
+    def __init__(self, sinks=None, run_id: str | None = None):
+        self.sinks = list(sinks or [])
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        # (measurement, asyncio task) of the open sections, innermost last; per thread and per task
+        self._stack = contextvars.ContextVar(f"instrumentation_stack_{self.run_id}", default=())
+
+    @classmethod
+    def from_config(cls, metrics_config: dict | None):
+        """metrics_config: {"path": "metrics/pipeline.jsonl"}; no path means no sinks"""
+        path = (metrics_config or {}).get("path")
+        return cls([JsonLinesSink(path)] if path else [])
+
+    @contextmanager
+    def stage(self, name: str, **attrs):
+        """
+        Times the block as one stage. The yielded record can be updated with extra
+        fields such as exit_code before the block ends.
+        """
+        record = {"stage": name, **attrs}
+        if not self.sinks:
+            yield record
+            return
+        measurement = _Measurement()
+        started_at = datetime.now(timezone.utc).isoformat()
+        try:
+            with self._section(measurement):
+                yield record
+        except BaseException as e:
+            record.setdefault("status", "error")
+            record.setdefault("error", repr(e))
+            raise
+        finally:
+            record.setdefault("status", "ok")
+            self.emit(record, measurement, started_at)
+
+    def timed(self, name: str | None = None, **attrs):
+        """Decorator form of stage()"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__qualname__, **attrs):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def iterate(self, name: str, iterable, **attrs):
+        """
+        Wraps a lazy iterable and times only the work done to produce its items.
+        The stage is recorded once the iterable is exhausted or closed.
+        """
+        if not self.sinks:
+            yield from iterable
+            return
+        record = {"stage": name, **attrs, "items": 0}
+        measurement = _Measurement()
+        started_at = datetime.now(timezone.utc).isoformat()
+        iterator = iter(iterable)
+        try:
+            while True:
+                with self._section(measurement):
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        break
+                record["items"] += 1
+                yield item
+        except BaseException as e:
+            if not isinstance(e, GeneratorExit):
+                record.setdefault("status", "error")
+                record.setdefault("error", repr(e))
+            raise
+        finally:
+            record.setdefault("status", "ok")
+            self.emit(record, measurement, started_at)
+
+    def emit(self, record: dict, measurement: _Measurement | None = None, started_at: str | None = None):
+        if not self.sinks:
+            return
+        full = {"run_id": self.run_id, "started_at": started_at or datetime.now(timezone.utc).isoformat()}
+        full.update(record)
+        if measurement is not None:
+            full.update(measurement.exclusive())
+        full["peak_rss_bytes"] = peak_rss_bytes()
+        for sink in self.sinks:
+            sink(full)
+
+    @contextmanager
+    def _section(self, measurement: _Measurement):
+        task = _current_task()
+        stack = self._stack.get()
+        if stack and stack[-1][1] is not task:
+            stack = ()  # opened by another task, which runs concurrently with this one
+        start = _snapshot()
+        token = self._stack.set(stack + ((measurement, task),))
+        try:
+            yield
+        finally:
+            self._stack.reset(token)
+            end = _snapshot()
+            for key in _Measurement.METRICS:
+                delta = end[key] - start[key]
+                measurement.totals[key] += delta
+                if stack:
+                    stack[-1][0].nested[key] += delta
+
+
+class JsonLinesSink:
+    """Appends one JSON object per stage to a metrics file"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def __call__(self, record: dict):
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+
+class MemorySink(list):
+    """Keeps records in memory"""
+
+    def __call__(self, record: dict):
+        self.append(record)
+
+
+_current = Instrumentation()
+
+
+def get_instrumentation() -> Instrumentation:
+    return _current
+
+
+def set_instrumentation(instrumentation: Instrumentation) -> Instrumentation:
+    """Installs the process-wide instrumentation used by handlers; returns the previous one"""
+    global _current
+    previous, _current = _current, instrumentation
+    return previous
+
+
+def stage(name: str, **attrs):
+    """Context manager timing a stage with the current instrumentation"""
+    return get_instrumentation().stage(name, **attrs)
+
+
+def timed(name: str | None = None, **attrs):
+    """Decorator timing a function as a stage with the instrumentation current at call time"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_instrumentation().stage(name or func.__qualname__, **attrs):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
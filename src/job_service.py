@@ -0,0 +1,410 @@
+"""
+Local HTTP service that queues and runs pipeline jobs.
+
+    python -m src.job_service --root jobs --port 8765 --workers 2
+
+    POST /jobs        body: a config.json, optionally with "input_data" holding the input file's
+                      content (a string, or any JSON value for json input)
+                      → 201 {"id", "status", "deduplicated": false}, or 200 with the existing job
+    GET  /jobs        → [{"id", "status", ...}, ...]
+    GET  /jobs/<id>   → status, per-stage timings and artifact paths
+    GET  /health
+
+Jobs are kept in an SQLite file under --root and run on --workers threads. Each job
+runs `python -m src.main` in its own folder, jobs/<id>/, because every path in a config
+is relative to the working directory; a job whose paths are absolute or climb out of that
+folder is rejected. The render and TTS caches are pinned to shared
+folders under --root, so a scene rendered for one job is reused by the next; jobs
+running side by side update them under the cache's file lock. A
+submission identical to an earlier one (same config and input, by content hash) returns
+the earlier job instead of running again; only failed jobs run again.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.config_loader import ConfigError, validate_config
+from src.output_handler import ManimOutputHandler
+from src.work_queue import Transaction, connect
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    content_hash TEXT NOT NULL UNIQUE,
+    status TEXT NOT NULL,
+    config TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    returncode INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+
+class JobRejected(ValueError):
+    """A submission that is not a runnable job; reported as 400"""
+
+
+def content_hash(job: dict) -> str:
+    return hashlib.sha256(json.dumps(job, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+
+class JobStore:
+    """Pipeline jobs in an SQLite file, safe to use from many threads"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def submit(self, job: dict) -> tuple[dict, bool]:
+        """Returns (job row, created); an identical earlier job is returned instead, queued again if it failed"""
+        digest = content_hash(job)
+        now = time.time()
+        with Transaction(self._connection()) as conn:
+            row = conn.execute("SELECT id, status FROM jobs WHERE content_hash = ?", (digest,)).fetchone()
+            if row is None:
+                cursor = conn.execute(
+                    "INSERT INTO jobs (content_hash, status, config, created_at) VALUES (?, ?, ?, ?)",
+                    (digest, QUEUED, json.dumps(job), now),
+                )
+                return self._get(conn, cursor.lastrowid), True
+            if row["status"] == FAILED:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, created_at = ?, started_at = NULL, finished_at = NULL, "
+                    "returncode = NULL, error = NULL WHERE id = ?",
+                    (QUEUED, now, row["id"]),
+                )
+            return self._get(conn, row["id"]), False
+
+    def claim(self) -> dict | None:
+        """Marks the oldest queued job running and returns it"""
+        with Transaction(self._connection()) as conn:
+            row = conn.execute("SELECT id FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (QUEUED,)).fetchone()
+            if row is None:
+                return None
+            conn.execute("UPDATE jobs SET status = ?, started_at = ? WHERE id = ?", (RUNNING, time.time(), row["id"]))
+            return self._get(conn, row["id"])
+
+    def finish(self, job_id: int, returncode: int | None, error: str | None = None):
+        status = DONE if returncode == 0 and error is None else FAILED
+        with Transaction(self._connection()) as conn:
+            conn.execute("UPDATE jobs SET status = ?, finished_at = ?, returncode = ?, error = ? WHERE id = ?",
+                         (status, time.time(), returncode, error, job_id))
+
+    def recover(self) -> int:
+        """Queues again the jobs that were running when the service stopped"""
+        with Transaction(self._connection()) as conn:
+            cursor = conn.execute("UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING))
+            return cursor.rowcount
+
+    def get(self, job_id: int) -> dict | None:
+        return self._get(self._connection(), job_id)
+
+    def jobs(self) -> list[dict]:
+        conn = self._connection()
+        return [self._get(conn, row[0]) for row in conn.execute("SELECT id FROM jobs ORDER BY id")]
+
+    @staticmethod
+    def _get(conn, job_id: int) -> dict | None:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["config"] = json.loads(job["config"])
+        return job
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class JobService:
+    """
+    Runs queued jobs on a pool of worker threads, one `python -m src.main` child process per job.
+    """
+
+    def __init__(self, root, workers: int = 2, poll_interval: float = 1.0, job_timeout: float | None = None):
+        self.root = Path(root).resolve()
+        self.store = JobStore(self.root / "jobs.sqlite")
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.job_timeout = job_timeout
+        self._wake = threading.Condition()
+        self._stop = threading.Event()
+        self._threads = []
+        recovered = self.store.recover()
+        if recovered:
+            print(f"♻️ Re-queued {recovered} job(s) interrupted by the last shutdown")
+
+    def submit(self, job: dict) -> tuple[dict, bool]:
+        validate_job(job)
+        row, created = self.store.submit(job)
+        if row["status"] == QUEUED:
+            with self._wake:
+                self._wake.notify()
+        return row, created
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, wait: bool = True):
+        self._stop.set()
+        with self._wake:
+            self._wake.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    def _work(self):
+        while not self._stop.is_set():
+            job = self.store.claim()
+            if job is None:
+                with self._wake:
+                    self._wake.wait(self.poll_interval)
+                continue
+            self.run(job)
+
+    def job_dir(self, job_id: int) -> Path:
+        return self.root / "jobs" / str(job_id)
+
+    def run(self, job: dict):
+        """Runs one claimed job in its folder and records the outcome"""
+        job_dir = self.job_dir(job["id"])
+        print(f"🚚 Running job {job['id']} in {job_dir}")
+        try:
+            self.prepare(job["config"], job_dir)
+            python_path = os.pathsep.join(filter(None, [str(REPO_ROOT), os.environ.get("PYTHONPATH")]))
+            with open(job_dir / "pipeline.log", "w", encoding="utf-8") as log:
+                completed = subprocess.run(
+                    [sys.executable, "-m", "src.main"], cwd=job_dir, stdout=log, stderr=subprocess.STDOUT,
+                    env=dict(os.environ, PYTHONPATH=python_path), timeout=self.job_timeout,
+                )
+            error = None if completed.returncode == 0 else f"pipeline exited with code {completed.returncode}"
+            self.store.finish(job["id"], completed.returncode, error)
+        except subprocess.TimeoutExpired:
+            self.store.finish(job["id"], None, f"timed out after {self.job_timeout}s")
+        except Exception as e:
+            self.store.finish(job["id"], None, repr(e))
+        print(f"🏁 Job {job['id']}: {self.store.get(job['id'])['status']}")
+
+    def prepare(self, job: dict, job_dir: Path):
+        """Writes the job's config.json and inline input into job_dir"""
+        config = {key: value for key, value in job.items() if key != "input_data"}
+        job_dir.mkdir(parents=True, exist_ok=True)
+        if "input_data" in job:
+            input_config = config["input"]
+            input_config["type"] = "local"
+            input_config.setdefault("path", "data")
+            input_config.setdefault("file", "input.json")
+            input_path = job_dir / input_config["path"] / input_config["file"]
+            input_path.parent.mkdir(parents=True, exist_ok=True)
+            data = job["input_data"]
+            input_path.write_text(data if isinstance(data, str) else json.dumps(data, ensure_ascii=False),
+                                  encoding="utf-8")
+        # caches are shared by all jobs; metrics stay with the job for its stage timings
+        for section, default in (("video_output", ".render_cache"), ("voice_over", ".tts_cache")):
+            cache = config.get(section, {}).get("cache")
+            if section in config and (cache is None or cache.get("enabled", True)):
+                cache = config[section].setdefault("cache", {})
+                path = Path(cache.get("path", default))
+                cache["path"] = str(path if path.is_absolute() else self.root / path)
+        config["metrics"] = {"path": "metrics.jsonl"}
+        (job_dir / "config.json").write_text(json.dumps(config, indent=2, ensure_ascii=False), encoding="utf-8")
+
+    def status(self, job_id: int) -> dict | None:
+        """The job with its per-stage timings and artifact paths"""
+        job = self.store.get(job_id)
+        if job is None:
+            return None
+        job_dir = self.job_dir(job_id)
+        config = job.pop("config")
+        job["stages"] = stage_timings(job_dir / "metrics.jsonl")
+        job["artifacts"] = artifacts(config, job_dir) if job_dir.exists() else {}
+        return job
+
+    def summaries(self) -> list[dict]:
+        return [{key: job[key] for key in ("id", "status", "created_at", "finished_at", "error")}
+                for job in self.store.jobs()]
+
+
+def validate_job(job) -> None:
+    if not isinstance(job, dict):
+        raise JobRejected("a job is a JSON object in the config.json schema")
+    config = {key: value for key, value in job.items() if key != "input_data"}
+    if "input_data" in job and isinstance(config.get("input"), dict):
+        # prepare() writes the inline data to a local input file with these defaults
+        config["input"] = {"path": "data", "file": "input.json", **config["input"], "type": "local"}
+    try:
+        validate_config(config)
+    except ConfigError as e:
+        raise JobRejected(str(e)) from e
+    if "input_data" not in job and job["input"]["type"] == "local":
+        raise JobRejected("a local input needs inline input_data; the service cannot read files of the caller")
+    problems = [f"{name}: {path} is outside the job's folder" for name, path in _job_paths(config) if _escapes(path)]
+    problems += [f"{section}.cache: {config[section]['cache']['path']} is outside --root"
+                 for section in ("video_output", "voice_over")
+                 if isinstance(config.get(section, {}).get("cache"), dict)
+                 and _escapes(config[section]["cache"].get("path", "."))]
+    if problems:
+        raise JobRejected("; ".join(problems))
+
+
+def _job_paths(config: dict) -> list[tuple[str, str]]:
+    """(name, path) of every file or folder a job reads or writes, relative to its folder"""
+    paths = []
+    for section in ("input", "parsed_copy"):
+        if config[section].get("type") == "local":
+            section_config = config[section]
+            paths.append((section, os.path.join(str(section_config.get("path", "")), str(section_config.get("file", "")))))
+    paths.append(("manim_output", str(ManimOutputHandler.base_path(config["manim_output"]))))
+    paths.append(("video_output.media_dir", str(config["video_output"].get("media_dir", "media"))))
+    if "concat_output" in config:
+        paths.append(("concat_output.output", str(config["concat_output"].get("output", "output/video.mp4"))))
+    if config.get("journal", {}).get("path"):
+        paths.append(("journal", str(config["journal"]["path"])))
+    return paths
+
+
+def _escapes(path) -> bool:
+    """Whether path is absolute or climbs out of the folder it is relative to"""
+    return Path(path).is_absolute() or os.path.normpath(path).split(os.sep)[0] == ".."
+
+
+def stage_timings(metrics_path: Path) -> dict:
+    """{stage: {"wall_s": total, "count": n, "status": "ok" | "error"}} from a job's metrics file"""
+    stages = {}
+    if not metrics_path.exists():
+        return stages
+    for line in metrics_path.read_text(encoding="utf-8").splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue  # a line being written
+        entry = stages.setdefault(record["stage"], {"wall_s": 0.0, "count": 0, "status": "ok"})
+        entry["wall_s"] = round(entry["wall_s"] + record.get("wall_s", 0.0), 6)
+        entry["count"] += 1
+        if record.get("status") == "error":
+            entry["status"] = "error"
+    return stages
+
+
+def artifacts(config: dict, job_dir: Path) -> dict:
+    """Absolute paths of what a job produced"""
+    parsed = config["parsed_copy"]
+    media_dir = job_dir / config["video_output"].get("media_dir", "media")
+    result = {
+        "log": str(job_dir / "pipeline.log"),
+        "parsed_copy": str(job_dir / parsed.get("path", "") / parsed.get("file", "")) if parsed.get("type") == "local" else None,
+        "manim_files": str(job_dir / ManimOutputHandler.base_path(config["manim_output"])),
+        "videos": sorted(str(path) for path in media_dir.glob("videos/*/*/*.mp4")),
+        "concat": None,
+    }
+    if "concat_output" in config:
+        output = job_dir / config["concat_output"].get("output", "output/video.mp4")
+        result["concat"] = str(output) if output.exists() else None
+    return result
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    server_version = "factory-manim-jobs/1"
+
+    @property
+    def service(self) -> JobService:
+        return self.server.service
+
+    def do_GET(self):
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if parts == ["health"]:
+            return self._reply(HTTPStatus.OK, {"status": "ok"})
+        if parts == ["jobs"]:
+            return self._reply(HTTPStatus.OK, self.service.summaries())
+        if len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit():
+            job = self.service.status(int(parts[1]))
+            if job is not None:
+                return self._reply(HTTPStatus.OK, job)
+        self._reply(HTTPStatus.NOT_FOUND, {"error": f"no such resource: {self.path}"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            return self._reply(HTTPStatus.NOT_FOUND, {"error": f"no such resource: {self.path}"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job, created = self.service.submit(json.loads(self.rfile.read(length) or b"null"))
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            return self._reply(HTTPStatus.BAD_REQUEST, {"error": f"invalid JSON: {e}"})
+        except JobRejected as e:
+            return self._reply(HTTPStatus.BAD_REQUEST, {"error": str(e)})
+        self._reply(HTTPStatus.CREATED if created else HTTPStatus.OK,
+                    {"id": job["id"], "status": job["status"], "deduplicated": not created})
+
+    def _reply(self, status: HTTPStatus, body):
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        print(f"🌐 {self.address_string()} {format % args}")
+
+
+def make_server(service: JobService, host: str = "127.0.0.1", port: int = 8765) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), JobRequestHandler)
+    server.service = service
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root", type=Path, default=Path("jobs"), help="folder for the job database, job folders and caches")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=2, help="jobs run at the same time")
+    parser.add_argument("--job-timeout", type=float, default=None, help="seconds before a job is killed")
+    args = parser.parse_args(argv)
+
+    service = JobService(args.root, workers=args.workers, job_timeout=args.job_timeout)
+    server = make_server(service, args.host, args.port)
+    service.start()
+    print(f"🌐 Serving pipeline jobs on http://{args.host}:{server.server_port} ({args.workers} workers)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Shutting down; running jobs are queued again on the next start")
+    finally:
+        server.server_close()
+        service.stop(wait=False)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
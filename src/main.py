@@ -1,50 +1,47 @@
-from pathlib import Path
-import json
-from src.factories.input_handler_factory import InputHandlerFactory
-from src.factories.output_handler_factory import OutputHandlerFactory
-from src.parser import JSONParser
-
-
-def main():
-    # Load config
-    with open("config.json", "r", encoding="utf-8") as f:
-        config = json.load(f)
-
-    input_config = config["input"]
-    parsed_config = config["parsed_copy"]
-    manim_config = config["manim_output"]
-    video_config = config["video_output"]
-
-    # Get factories
-    input_handler = InputHandlerFactory.get_handler(input_config["type"])
-    video_handler = OutputHandlerFactory.get_handler(video_config)
-    manim_handler = OutputHandlerFactory.get_handler(manim_config)
-
-    if manim_config.get("regenerate", True):
-        # Step 1: Load raw JSON
-        raw_data = input_handler.load(input_config)
-
-        # Step 2: Parse JSON into structured data
-        parser = JSONParser()
-        parsed_data = parser.parse(raw_data)
-
-        # Step 3: Save parsed copy
-        parsed_output_handler = OutputHandlerFactory.get_handler(parsed_config)
-        parsed_output_handler.save(parsed_data, parsed_config)
-        print("✅ Saved parsed JSON copy")
-
-        # Step 4: Generate Manim .py & .txt files
-        generated_files = manim_handler.save(parsed_data, manim_config)
-        print("✅ Generated Manim files:", generated_files)
-
-    else:
-        print("♻️ Skipping parsing and Manim file generation. Using existing files.")
-
-    # Step 5: Render videos from Manim files
-    manim_base_path = Path(manim_config["path"]) / manim_config["base_name"]
-    rendered_videos = video_handler.save(manim_base_path)
-    print("🎬 Rendered videos:", rendered_videos)
+import argparse
+from src.config_loader import ConfigError, ConfigLoader
+from src.instrumentation import Instrumentation, set_instrumentation
+from src.pipeline import run_pipeline
+from src.plan import compile_plan, estimate_work, format_plan
+from src.watch import Watcher, watch_config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate and render Manim videos from config.json")
+    parser.add_argument("--config", default="config.json")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run, skipping scenes that are already rendered")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and re-render only the scenes touched by each edit")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="print the pipeline plan and the work a run would do, without running it")
+    args = parser.parse_args(argv)
+
+    # Load and validate config before any stage runs
+    try:
+        config = ConfigLoader(args.config).load()
+    except ConfigError as e:
+        print(f"❌ {args.config}: {e}")
+        return 2
+
+    if args.dry_run:
+        plan = compile_plan(config)
+        print(format_plan(plan, estimate_work(plan, config)))
+        return 0
+
+    # Stage metrics go to config["metrics"]["path"] as JSON lines, if set
+    set_instrumentation(Instrumentation.from_config(config.get("metrics")))
+
+    if args.watch:
+        try:
+            Watcher(watch_config(config)).run()
+        except KeyboardInterrupt:
+            print("👋 Stopped watching")
+        return 0
+
+    run_pipeline(config, resume=args.resume)
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,42 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+
+class Manifest:
+    """
+    Content hashes of the sequences generated under input/manim_files/<base_name>/.
+    Stored as manifest.json next to the script_seq folders.
+    """
+
+    FILE_NAME = "manifest.json"
+
+    def __init__(self, base_path: Path):
+        self.path = Path(base_path) / self.FILE_NAME
+        self.entries = self._load()
+
+    @staticmethod
+    def content_hash(py_content: str, txt_content: str) -> str:
+        digest = hashlib.sha256()
+        for part in (py_content, txt_content):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def save(self, entries: dict):
+        """entries: {str(script_seq): {"seq": script_seq, "hash": content_hash}}"""
+        self.entries = entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"sequences": entries}, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8")).get("sequences", {})
+        except (json.JSONDecodeError, OSError):
+            print(f"⚠️ Ignoring unreadable manifest: {self.path}")
+            return {}
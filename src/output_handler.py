@@ -1,9 +1,27 @@
 from pathlib import Path
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import copy
+import filecmp
+import hashlib
+import shutil
 import subprocess
+import threading
+import csv
+import io
 import os
-import psycopg2
+import re
+import sys
 import json
+from src.db import ConnectionPool, default_pool, identifier
+from src.file_writer import create_writer
+from src.instrumentation import stage
+from src.manifest import Manifest
+from src.parsed_copy import FORMATS, copy_path, write_arrow, write_jsonl
+from src.render_engine import EngineUnavailable, InProcessRenderEngine
+from src.scene_validator import SceneCheck, check_scene_file, check_scene_files
+from src.sequence import as_dict, normalize
 
 
 class OutputHandler(ABC):
@@ -11,6 +29,17 @@ class OutputHandler(ABC):
     def save(self, data, destination):
         pass
 
+    def write_through(self, sequences, destination):
+        """
+        Yields each sequence while saving it, so a stream can be saved and consumed in one pass.
+        Handlers that cannot write incrementally save everything once the stream is exhausted.
+        """
+        saved = []
+        for seq in sequences:
+            saved.append(seq)
+            yield seq
+        self.save({"sequences": saved}, destination)
+
     @staticmethod
     def validate_data(data):
         if data is None:
@@ -18,121 +47,911 @@ class OutputHandler(ABC):
 
 
 class LocalOutputHandler(OutputHandler):
-    """Saves parsed.json under input/parsed_file/"""
+    """
+    Saves parsed.json under input/parsed_file/.
+    output_config["format"] selects "json" (default), or the compact "jsonl"/"arrow"
+    copies of src.parsed_copy that can be read one sequence at a time.
+    """
 
     def save(self, data: dict, output_config: dict):
         self.validate_data(data)
+        if output_config.get("format", "json") != "json":
+            for _ in self.write_through(data.get("sequences", []), output_config):
+                pass
+            return copy_path(output_config)
+
         path = Path(output_config["path"]) / output_config["file"]
         path.parent.mkdir(parents=True, exist_ok=True)
 
+        if isinstance(data, dict) and "sequences" in data:
+            data = dict(data, sequences=[as_dict(seq) for seq in data["sequences"]])
         with open(path, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=4, ensure_ascii=False)
 
         return path
 
+    def write_through(self, sequences, output_config: dict):
+        """
+        Streams the sequences to disk one item at a time; the copy replaces the old one once
+        the stream is complete. In "json" format the file is byte-identical to save().
+        """
+        fmt = output_config.get("format", "json")
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported parsed copy format: {fmt} (expected one of {', '.join(FORMATS)})")
+        path = copy_path(output_config)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if fmt == "jsonl":
+            return write_jsonl(sequences, path)
+        if fmt == "arrow":
+            return write_arrow(sequences, path, output_config.get("batch_size", 1024))
+        return self._write_json(sequences, path)
+
+    @staticmethod
+    def _write_json(sequences, path: Path):
+        tmp_path = path.with_name(f"{path.name}.partial")
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write('{\n    "sequences": [')
+            count = 0
+            for seq in sequences:
+                item = json.dumps(as_dict(seq), indent=4, ensure_ascii=False).replace("\n", "\n        ")
+                f.write(("," if count else "") + "\n        " + item)
+                count += 1
+                yield seq
+            f.write("\n    ]\n}" if count else "]\n}")
+
+        os.replace(tmp_path, path)
+
 
 class DatabaseOutputHandler(OutputHandler):
-    """Optional handler for saving parsed data into DB"""
-
-    def __connect(self):
-        return psycopg2.connect(
-            host=os.getenv("POSTGRES_HOST"),
-            port=os.getenv("POSTGRES_PORT"),
-            dbname=os.getenv("POSTGRES_DB"),
-            user=os.getenv("POSTGRES_USER"),
-            password=os.getenv("POSTGRES_PASSWORD"),
-        )
+    """
+    Saves parsed data into a Postgres table.
 
-    def save(self, data, table_name: str):
-        self.validate_data(data)
+    Rows are written in batches of destination["batch_size"], one transaction per
+    batch, with execute_values (method "values") or COPY FROM STDIN (method "copy").
+    Method "row" keeps the old one-INSERT-per-row path. With upsert enabled rows
+    are keyed on script_seq. Connections come from the pool shared with
+    DatabaseInputHandler.
+    """
 
-        conn = self.__connect()
-        cursor = conn.cursor()
+    BATCH_SIZE = 1000
+    METHODS = ("values", "copy", "row")
 
-        if isinstance(data, dict):
-            data = [data]
+    def __init__(self, pool: ConnectionPool | None = None):
+        self._pool = pool
+
+    @property
+    def pool(self) -> ConnectionPool:
+        # resolved on first use so building the handler never touches the database
+        if self._pool is None:
+            self._pool = default_pool()
+        return self._pool
 
-        columns = data[0].keys()
-        col_defs = ", ".join([f"{col} TEXT" for col in columns])
+    def save(self, data, destination):
+        """
+        data: {"sequences": [...]}, a list of Sequence records or row dicts, or a single row dict
+        destination: table name or {"table", "batch_size", "method", "upsert"}
+        """
+        self.validate_data(data)
+        if isinstance(data, dict):
+            data = data["sequences"] if "sequences" in data else [data]
+
+        count = sum(1 for _ in self.write_through(data, destination))
+        return f"Saved {count} records to Postgres table {self._config(destination)['table']}"
+
+    def write_through(self, sequences, destination):
+        config = self._config(destination)
+        batch_size = config.get("batch_size", self.BATCH_SIZE)
+
+        with self.pool.connection() as conn:
+            columns = None
+            batch = []
+            for seq in sequences:
+                row = as_dict(seq)
+                if columns is None:
+                    columns = list(row.keys())
+                    self._create_table(conn, config, columns)
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    self._write_batch(conn, config, columns, batch)
+                    batch = []
+                yield seq
+            if batch:
+                self._write_batch(conn, config, columns, batch)
+
+    def _config(self, destination) -> dict:
+        config = {"table": destination} if isinstance(destination, str) else dict(destination)
+        identifier(config["table"])
+        method = config.setdefault("method", "values")
+        if method not in self.METHODS:
+            raise ValueError(f"Unsupported DB write method: {method}")
+        if method == "copy" and config.get("upsert"):
+            raise ValueError("COPY cannot upsert; use method 'values' with upsert")
+        return config
+
+    def _create_table(self, conn, config: dict, columns: list[str]):
+        table_name = config["table"]
+        col_defs = ", ".join(f"{identifier(col)} TEXT" for col in columns)
+        cursor = conn.cursor()
         cursor.execute(f"CREATE TABLE IF NOT EXISTS {table_name} ({col_defs})")
+        if config.get("upsert"):
+            if "script_seq" not in columns:
+                raise ValueError("Upsert needs a script_seq column")
+            index_name = f"{table_name.replace('.', '_')}_script_seq_key"
+            cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {table_name} (script_seq)")
+        conn.commit()
+        cursor.close()
 
-        for row in data:
-            placeholders = ", ".join(["%s"] * len(row))
-            cursor.execute(
-                f"INSERT INTO {table_name} ({', '.join(row.keys())}) VALUES ({placeholders})",
-                tuple(row.values()),
-            )
+    def _write_batch(self, conn, config: dict, columns: list[str], batch: list[dict]):
+        table_name = config["table"]
+        column_list = ", ".join(columns)
+        values = [tuple(row.get(col) for col in columns) for row in batch]
+        conflict = ""
+        if config.get("upsert"):
+            updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in columns if col != "script_seq")
+            conflict = f" ON CONFLICT (script_seq) DO UPDATE SET {updates}" if updates else " ON CONFLICT (script_seq) DO NOTHING"
 
+        cursor = conn.cursor()
+        match config["method"]:
+            case "copy":
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(values)
+                buffer.seek(0)
+                cursor.copy_expert(f"COPY {table_name} ({column_list}) FROM STDIN WITH (FORMAT csv)", buffer)
+            case "values" if type(cursor).__module__.startswith("psycopg2"):
+                from psycopg2.extras import execute_values
+
+                execute_values(
+                    cursor, f"INSERT INTO {table_name} ({column_list}) VALUES %s{conflict}", values, page_size=len(values)
+                )
+            case "values":
+                # other DB-API drivers: one executemany round-trip per batch
+                placeholders = ", ".join([self.pool.placeholder] * len(columns))
+                cursor.executemany(f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders}){conflict}", values)
+            case "row":
+                placeholders = ", ".join([self.pool.placeholder] * len(columns))
+                for row in values:
+                    cursor.execute(f"INSERT INTO {table_name} ({column_list}) VALUES ({placeholders}){conflict}", row)
         conn.commit()
         cursor.close()
-        conn.close()
-        return f"Saved {len(data)} records to Postgres table {table_name}"
 
 
 class ManimOutputHandler(OutputHandler):
-    def save(self, data, config: dict):
+    """
+    Writes script_seqN/script_seqN.py and .txt files for each sequence.
+
+    A manifest of content hashes makes generation incremental: only new or
+    changed sequences are written, and folders of sequences that disappeared
+    from the input are removed.
+    """
+
+    @staticmethod
+    def base_path(config: dict) -> Path:
+        """
+        Folder holding the script_seq folders and manifest.json: <path>/<base_name>, or
+        <base_output_path>/manim_files/<base_name> for configs without a path
+        """
+        base_name = config.get("base_name", "script_data")
+        if "path" in config:
+            return Path(config["path"]) / base_name
+        return Path(config.get("base_output_path", "input")) / "manim_files" / base_name
+
+    @staticmethod
+    def contents(seq) -> tuple[str, str]:
         """
-        data: {"sequences": [...]}
-        config: {"type": "manim", "base_name": "...", "base_output_path": "..."}
+        (script_seqN.py, script_seqN.txt) contents generated for a sequence. The .py file is a
+        ScriptSeqN(Scene) skeleton with the description as its docstring and comment, ready to fill in.
+        """
+        description = str(seq.script_for_manim)
+        # escaped so quotes and backslashes in the description cannot end the docstring or form escapes
+        docstring = description.replace("\\", "\\\\").replace('"', '\\"')
+        comment = "\n".join(f"        # {line}".rstrip() for line in description.splitlines() or [""])
+        py_content = (f'"""{docstring}"""\n\nfrom manim import *\n\n'
+                      f"class ScriptSeq{seq.script_seq}(Scene):\n    def construct(self):\n{comment}\n        self.wait(2)\n")
+        return py_content, seq.script_voice_over
+
+    def save(self, data, config: dict, on_scene=None):
+        """
+        data: {"sequences": [...]}, where the list may be any iterable of Sequence records or row dicts
+        config: {"type": "manim", "base_name": "...", "path": "...", "writer": "sequential" | "concurrent"}
+        on_scene(py_file) is called as soon as each scene file is on disk, unchanged ones included,
+        so rendering can start while later sequences are still being generated.
+        Returns {"py_files", "txt_files", "diff": {"added", "changed", "unchanged", "removed"}}
         """
         self.validate_data(data)
-        sequences = data.get("sequences", [])
+        # data may be {"sequences": iterable} or the iterable itself, e.g. a parser stream
+        sequences = data.get("sequences", []) if isinstance(data, dict) else data
 
-        base_name = config.get("base_name", "script_data")
-        base_path = Path(config.get("base_output_path", "input")) / "manim_files" / base_name
+        base_path = self.base_path(config)
         base_path.mkdir(parents=True, exist_ok=True)
 
+        manifest = Manifest(base_path)
+        previous = manifest.entries
+        current = {}
         generated_files = {"py_files": [], "txt_files": []}
+        diff = {"added": [], "changed": [], "unchanged": [], "removed": []}
+
+        with create_writer(config) as writer:
+            for seq in normalize(sequences):
+                seq_num = seq.script_seq
+                py_content, txt_content = self.contents(seq)
+
+                seq_folder = base_path / f"script_seq{seq_num}"
+                py_file = seq_folder / f"script_seq{seq_num}.py"
+                txt_file = seq_folder / f"script_seq{seq_num}.txt"
+
+                digest = Manifest.content_hash(py_content, txt_content)
+                key = str(seq_num)
+                current[key] = {"seq": seq_num, "hash": digest}
+                old = previous.get(key)
+
+                if old is not None and old["hash"] == digest and py_file.exists() and txt_file.exists():
+                    diff["unchanged"].append(seq_num)
+                    if on_scene is not None:
+                        on_scene(py_file)
+                else:
+                    writer.write(txt_file, txt_content)
+                    writer.write(py_file, py_content, on_written=on_scene)
+                    diff["added" if old is None else "changed"].append(seq_num)
+
+                generated_files["py_files"].append(str(py_file))
+                generated_files["txt_files"].append(str(txt_file))
+
+        for key in previous.keys() - current.keys():
+            shutil.rmtree(base_path / f"script_seq{key}", ignore_errors=True)
+            diff["removed"].append(previous[key]["seq"])
+        diff["removed"].sort(key=lambda seq: seq_number(f"script_seq{seq}"))
+
+        manifest.save(current)
+        generated_files["diff"] = diff
+        return generated_files
 
-        for seq in sequences:
-            seq_num = seq.get("script_seq")
-            py_content = f'"""{seq.get("script_for_manim")}"""'
-            txt_content = seq.get("script_voice_over", "")
 
-            seq_folder = base_path / f"script_seq{seq_num}"
-            seq_folder.mkdir(parents=True, exist_ok=True)
+def seq_number(path) -> int:
+    """Returns N for a script_seqN file or folder; unnumbered names sort last"""
+    match = re.search(r"(\d+)$", Path(path).stem)
+    return int(match.group(1)) if match else sys.maxsize
 
-            py_file = seq_folder / f"script_seq{seq_num}.py"
-            py_file.write_text(py_content, encoding="utf-8")
-            generated_files["py_files"].append(str(py_file))
 
-            txt_file = seq_folder / f"script_seq{seq_num}.txt"
-            txt_file.write_text(txt_content, encoding="utf-8")
-            generated_files["txt_files"].append(str(txt_file))
-
-        return generated_files
+@dataclass
+class RenderResult:
+    """Outcome of rendering a single scene"""
+    py_file: Path
+    scene: str
+    returncode: int | None = None
+    error: str | None = None
+    video: Path | None = None
+    cached: bool = False
+    attempts: int = 1
+    # skipped because a resumed run had already rendered it
+    resumed: bool = False
 
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and self.error is None
 
 
 class VideoOutputHandler(OutputHandler):
     """Renders videos from generated .py files"""
 
-    def __init__(self, quality="low"):
-        self.quality_map = {
-            "low": "l", "medium": "m", "high": "h", "production": "p", "4k": "k"
-        }
+    # manim's output folder name for each quality flag
+    resolution_dirs = {"l": "480p15", "m": "720p30", "h": "1080p60", "p": "1440p60", "k": "2160p60"}
+    quality_map = {
+        "low": "l", "medium": "m", "high": "h", "production": "p", "4k": "k"
+    }
+
+    def __init__(self, quality="low", max_workers=None, timeout=None, media_dir="media", cache=None, engine="subprocess",
+                 max_scenes_per_worker=None, retries=0, retry_backoff=1.0, validate=True):
         self.quality = self.quality_map.get(quality.lower(), "l")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.media_dir = Path(media_dir)
+        self.cache = cache
+        # a failed scene is retried after retry_backoff seconds, doubling each time
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        # ast checks reject broken files before a render starts and find the real scene class names
+        self.validate = validate
+        self._checks = {}  # str(py_file) -> ((mtime_ns, size), SceneCheck)
+        # "inprocess" renders on warm manim workers and falls back to `manim render` subprocesses
+        match engine:
+            case "subprocess":
+                self.engine = None
+            case "inprocess":
+                self.engine = InProcessRenderEngine(self.max_workers, max_scenes_per_worker)
+            case _:
+                raise ValueError(f"Unsupported render engine: {engine}")
+        self._reset_state()
+
+    def _reset_state(self):
+        self._cancelled = threading.Event()
+        self._processes = set()
+        self._lock = threading.Lock()
+
+    def with_media_dir(self, media_dir) -> "VideoOutputHandler":
+        """Handler with the same settings and render cache that writes videos under another media folder"""
+        clone = copy.copy(self)
+        clone.media_dir = Path(media_dir)
+        clone._reset_state()
+        return clone
+
+    def with_quality(self, quality: str) -> "VideoOutputHandler":
+        """
+        Handler rendering at another quality. It shares the render cache, workers and
+        running processes with this one, so cancel() on either stops both.
+        """
+        clone = copy.copy(self)
+        clone.quality = self.quality_map.get(quality.lower(), "l")
+        return clone
 
     def save(self, manim_base_path: Path):
         self.validate_data(manim_base_path)
         if not manim_base_path.exists():
             raise FileNotFoundError(f"Manim folder not found: {manim_base_path}")
 
-        py_files = list(manim_base_path.glob("script_seq*/script_seq*.py"))
-        rendered_videos = []
-
-        for py_file in py_files:
-            scene_name = py_file.stem.capitalize()
-            cmd = [
-                "manim", "render",
-                f"-q{self.quality}",
-                str(py_file), scene_name
-            ]
-            print("🎬 Running:", " ".join(cmd))
+        results = self.render_all(self.scene_files(manim_base_path))
+        return [str(result.py_file) for result in results if result.ok]
+
+    @staticmethod
+    def scene_files(manim_base_path: Path) -> list[Path]:
+        """All generated scene files, in script_seq order"""
+        return sorted(manim_base_path.glob("script_seq*/script_seq*.py"), key=seq_number)
+
+    def render_all(self, py_files: list[Path]) -> list[RenderResult]:
+        """
+        Renders scenes on a bounded worker pool.
+        Results keep the order of py_files; a failed scene does not stop the rest.
+        """
+        if not py_files:
+            return []
+        self.validate_all(py_files)
+        return self.render_stream(py_files)
+
+    def render_stream(self, py_files, render=None) -> list[RenderResult]:
+        """
+        Renders scenes from any iterable, e.g. a queue fed by Manim generation.
+        The next scene is taken only once a worker is free, so a slow render holds
+        back the producer instead of piling up scenes. Results keep arrival order.
+        render(item) -> RenderResult replaces self.render, e.g. to render items at other qualities.
+        """
+        render = render or self.render
+        self._cancelled.clear()
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        free_workers = threading.BoundedSemaphore(self.max_workers)
+        futures = []
+        try:
+            for py_file in py_files:
+                free_workers.acquire()
+                future = pool.submit(render, py_file)
+                future.add_done_callback(lambda _: free_workers.release())
+                futures.append(future)
+            results = [future.result() for future in futures]
+        except BaseException:
+            # Ctrl+C or any unexpected error: drop queued jobs and stop running renders
+            self.cancel()
+            pool.shutdown(wait=True, cancel_futures=True)
+            raise
+        pool.shutdown()
+        return results
+
+    def video_path(self, py_file: Path, scene_name: str) -> Path:
+        """Where manim writes the MP4 for a scene"""
+        return self.media_dir / "videos" / Path(py_file).stem / self.resolution_dirs[self.quality] / f"{scene_name}.mp4"
+
+    def command(self, py_file: Path, scene_name: str) -> list[str]:
+        return [
+            "manim", "render",
+            f"-q{self.quality}",
+            "--media_dir", str(self.media_dir),
+            str(py_file), scene_name
+        ]
+
+    def cache_key(self, py_file: Path) -> str | None:
+        if self.cache is None:
+            return None
+        return self.cache.key(Path(py_file).read_text(encoding="utf-8"), self.quality)
+
+    def restore_cached(self, result: RenderResult, cache_key: str | None) -> bool:
+        """
+        Copies a cached render to result.video; returns whether there was one. A video already
+        rendered from cache_key is left alone, so whatever was done to it since (e.g. a muxed
+        voice-over) and its mtime are kept.
+        """
+        if cache_key is None:
+            return False
+        if result.video.exists() and self.rendered_key(result.video) == cache_key:
+            result.returncode = 0
+            result.cached = True
+            print(f"♻️ {result.video} is up to date")
+            return True
+        cached_video = self.cache.get(cache_key)
+        if cached_video is None:
+            return False
+        result.video.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if not (result.video.exists() and filecmp.cmp(cached_video, result.video, shallow=False)):
+                shutil.copyfile(cached_video, result.video)
+        except FileNotFoundError:
+            return False  # evicted by another process in the meantime
+        self.mark_rendered(result.video, cache_key)
+        result.returncode = 0
+        result.cached = True
+        print(f"♻️ Reusing cached render for {result.py_file}")
+        return True
+
+    @staticmethod
+    def rendered_key(video: Path) -> str | None:
+        """Cache key of the render video was made from, per its <Scene>.render.json sidecar"""
+        try:
+            return json.loads(video.with_suffix(".render.json").read_text(encoding="utf-8")).get("key")
+        except (OSError, ValueError, AttributeError):
+            return None
+
+    @staticmethod
+    def mark_rendered(video: Path, cache_key: str | None):
+        """Records which render cache key video was made from; without a key the record is dropped"""
+        sidecar = video.with_suffix(".render.json")
+        if cache_key is None:
+            sidecar.unlink(missing_ok=True)
+        else:
+            sidecar.write_text(json.dumps({"key": cache_key}), encoding="utf-8")
+
+    def check(self, py_file: Path) -> SceneCheck | None:
+        """Static check of a scene file, cached until the file changes; None when validation is off"""
+        if not self.validate:
+            return None
+        try:
+            stat = os.stat(py_file)
+        except OSError:
+            return check_scene_file(py_file)
+        fingerprint = (stat.st_mtime_ns, stat.st_size)
+        cached = self._checks.get(str(py_file))
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        check = check_scene_file(py_file)
+        self._checks[str(py_file)] = (fingerprint, check)
+        return check
+
+    def validate_all(self, py_files: list[Path]) -> list[SceneCheck]:
+        """Checks every file before rendering starts, on a process pool for large projects"""
+        if not self.validate:
+            return []
+        with stage("validate", scenes=len(py_files)) as record:
+            stale = [Path(f) for f in py_files if str(f) not in self._checks]
+            for py_file, check in zip(stale, check_scene_files(stale, self.max_workers)):
+                stat = os.stat(py_file) if py_file.exists() else None
+                if stat is not None:
+                    self._checks[str(py_file)] = ((stat.st_mtime_ns, stat.st_size), check)
+            checks = [self.check(f) for f in py_files]
+            invalid = [check for check in checks if not check.ok]
+            record["invalid"] = len(invalid)
+        for check in invalid:
+            print(f"❌ Invalid scene file {check.py_file}: {check.error}")
+        return checks
+
+    def scene_name(self, py_file: Path) -> str:
+        """The Scene subclass defined in the file, or the name generated files use (script_seq1.py → ScriptSeq1)"""
+        check = self.check(py_file)
+        if check is not None and check.scene is not None:
+            return check.scene
+        return Path(py_file).stem.title().replace("_", "")
+
+    def render(self, py_file: Path) -> RenderResult:
+        py_file = Path(py_file)
+        scene_name = self.scene_name(py_file)
+        check = self.check(py_file)
+        if check is not None and not check.ok:
+            # rejected without starting a render, and not retried
+            return RenderResult(py_file=py_file, scene=scene_name, video=self.video_path(py_file, scene_name),
+                                error=f"invalid scene file: {check.error}")
+        with stage("render", scene=scene_name, py_file=str(py_file), quality=self.quality) as record:
+            result = self._render(py_file, scene_name)
+            for attempt in range(1, self.retries + 1):
+                if result.ok or result.error == "cancelled":
+                    break
+                delay = self.retry_backoff * 2 ** (attempt - 1)
+                print(f"🔁 Retrying {py_file} in {delay:g}s (attempt {attempt + 1} of {self.retries + 1})")
+                if self._cancelled.wait(delay):
+                    break
+                result = self._render(py_file, scene_name)
+                result.attempts = attempt + 1
+            record.update(exit_code=result.returncode, cached=result.cached, error=result.error,
+                          attempts=result.attempts)
+            if result.ok and result.video.exists():
+                record["output_bytes"] = result.video.stat().st_size
+        return result
+
+    def _render(self, py_file: Path, scene_name: str) -> RenderResult:
+        result = RenderResult(py_file=py_file, scene=scene_name, video=self.video_path(py_file, scene_name))
+        if self._cancelled.is_set():
+            result.error = "cancelled"
+            return result
+
+        cache_key = self.cache_key(py_file)
+        if self.restore_cached(result, cache_key):
+            return result
+
+        if self.engine is not None:
             try:
-                subprocess.run(cmd, check=True)
-                rendered_videos.append(str(py_file))
-            except subprocess.CalledProcessError as e:
-                print(f"❌ Error rendering {py_file}: {e}")
+                error = self.engine.render(py_file, scene_name, self.quality, self.media_dir, self.timeout)
+                result.returncode = 0 if error is None else 1
+                result.error = error
+            except TimeoutError as e:
+                result.error = str(e)
+            except EngineUnavailable as e:
+                print(f"⚠️ Falling back to manim subprocess for {py_file}: {e}")
+                self._render_subprocess(result)
+        else:
+            self._render_subprocess(result)
+
+        if self._cancelled.is_set() and result.returncode != 0:
+            result.error = "cancelled"
+        if not result.ok:
+            print(f"❌ Error rendering {py_file}: {result.error}")
+        elif result.video.exists():
+            self.mark_rendered(result.video, cache_key)
+            if cache_key is not None:
+                try:
+                    self.cache.put(cache_key, result.video)
+                except OSError as e:
+                    # the video is rendered; only a later run misses it in the cache
+                    print(f"⚠️ Could not cache the render of {py_file}: {e}")
+        return result
+
+    def _render_subprocess(self, result: RenderResult):
+        """Renders with a `manim render` subprocess, filling in result"""
+        cmd = self.command(result.py_file, result.scene)
+        print("🎬 Running:", " ".join(cmd))
+        try:
+            process = subprocess.Popen(cmd)
+        except OSError as e:
+            result.error = str(e)
+            return
+
+        with self._lock:
+            self._processes.add(process)
+        try:
+            result.returncode = process.wait(timeout=self.timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            result.returncode = process.wait()
+            result.error = f"timed out after {self.timeout}s"
+        finally:
+            with self._lock:
+                self._processes.discard(process)
+
+        if result.error is None and result.returncode != 0:
+            result.error = f"manim exited with code {result.returncode}"
+
+    def cancel(self):
+        """Stops queued jobs and terminates running manim processes"""
+        self._cancelled.set()
+        with self._lock:
+            for process in self._processes:
+                process.terminate()
+        if self.engine is not None:
+            self.engine.shutdown(cancel=True)
+
+    def close(self):
+        """Stops the warm render workers, if any"""
+        if self.engine is not None:
+            self.engine.shutdown()
+
+
+class ConcatOutputHandler(OutputHandler):
+    """
+    Joins rendered scene MP4s into one video with ffmpeg's concat demuxer.
+
+    Clips are stream-copied (-c copy), so nothing is re-encoded. Clips are first
+    joined into segments of segment_size scenes, and the segments into the output.
+    A changed scene only rebuilds its own segment, clips are fingerprinted by content
+    (hashed again only when their size or mtime moved), durations are cached per
+    fingerprint, and an unchanged input skips ffmpeg entirely. Chapters are
+    embedded in the output and written to <output>.chapters.json.
+    """
+
+    def __init__(self, segment_size=32, ffmpeg="ffmpeg", ffprobe="ffprobe"):
+        if segment_size < 1:
+            raise ValueError("segment_size must be at least 1")
+        self.segment_size = segment_size
+        self.ffmpeg = ffmpeg
+        self.ffprobe = ffprobe
+
+    def save(self, clips, config: dict) -> dict:
+        """
+        clips: MP4 paths or {"video": path, "title": str} dicts, in any order; or the media
+               folder, in which case every scene rendered at config["quality"] is used
+        config: {"type": "concat", "output": "output/video.mp4", "quality": "low"}
+        Returns {"output", "chapters", "rebuilt_segments", "skipped"}
+        """
+        self.validate_data(clips)
+        output = Path(config.get("output", "output/video.mp4"))
+        if isinstance(clips, (str, Path)):
+            clips = self.find_clips(Path(clips), config.get("quality", "low"))
+        entries = self._entries(clips)
+        if not entries:
+            raise ValueError("No rendered videos to concatenate")
+
+        work_dir = output.parent / ".concat" / output.stem
+        work_dir.mkdir(parents=True, exist_ok=True)
+        index_path = work_dir / "index.json"
+        index = self._load_index(index_path)
+
+        durations = index.get("durations", {})
+        for entry in entries:
+            cached = durations.get(str(entry["video"]))
+            previous = cached["fingerprint"] if cached is not None else None
+            fingerprint = self.fingerprint(entry["video"], previous)
+            if cached is None or not self.same_content(previous, fingerprint):
+                cached = {"fingerprint": fingerprint, "duration": self.probe_duration(entry["video"])}
+            cached["fingerprint"] = fingerprint
+            durations[str(entry["video"])] = cached
+            entry["duration"] = cached["duration"]
+            entry["fingerprint"] = fingerprint["sha256"]
+
+        segments, rebuilt = [], []
+        segment_keys = index.get("segments", {})
+        for number, start in enumerate(range(0, len(entries), self.segment_size)):
+            group = entries[start:start + self.segment_size]
+            segment = work_dir / f"segment_{number:04d}.mp4"
+            key = self._key([(str(e["video"]), e["fingerprint"]) for e in group])
+            if segment_keys.get(segment.name) != key or not segment.exists():
+                self._concat([e["video"] for e in group], segment, work_dir)
+                segment_keys[segment.name] = key
+                rebuilt.append(segment.name)
+            segments.append(segment)
+        for stale in sorted(work_dir.glob("segment_*.mp4"))[len(segments):]:
+            stale.unlink()
+            segment_keys.pop(stale.name, None)
+
+        chapters = self.chapters(entries)
+        output_key = self._key([segment_keys[s.name] for s in segments] + [chapters])
+        skipped = index.get("output") == output_key and output.exists()
+        if not skipped:
+            metadata = work_dir / "chapters.ffmeta"
+            metadata.write_text(self.ffmetadata(chapters), encoding="utf-8")
+            self._concat(segments, output, work_dir, metadata=metadata)
+            print(f"🎞️ Assembled {len(entries)} scenes into {output} ({len(rebuilt)} segments rebuilt)")
+        else:
+            print(f"♻️ {output} is up to date")
+
+        chapters_path = output.with_suffix(".chapters.json")
+        chapters_path.write_text(json.dumps(chapters, indent=2, ensure_ascii=False), encoding="utf-8")
+        index.update(durations=durations, segments=segment_keys, output=output_key)
+        self._save_index(index_path, index)
+        return {"output": str(output), "chapters": chapters, "rebuilt_segments": rebuilt, "skipped": skipped}
+
+    @staticmethod
+    def find_clips(media_dir: Path, quality: str = "low") -> list[Path]:
+        """Scene MP4s manim rendered at quality under media_dir/videos/script_seqN/<resolution>/"""
+        flag = VideoOutputHandler.quality_map.get(quality.lower(), "l")
+        resolution = VideoOutputHandler.resolution_dirs[flag]
+        return list((media_dir / "videos").glob(f"script_seq*/{resolution}/*.mp4"))
+
+    @staticmethod
+    def _entries(clips) -> list[dict]:
+        entries = []
+        for clip in clips:
+            entry = dict(clip) if isinstance(clip, dict) else {"video": clip}
+            entry["video"] = Path(entry["video"])
+            if not entry["video"].exists():
+                print(f"⚠️ Skipping missing video: {entry['video']}")
+                continue
+            entry["seq"] = seq_number(entry["video"])
+            entry.setdefault("title", f"Scene {entry['seq']}")
+            entries.append(entry)
+        return sorted(entries, key=lambda e: e["seq"])
+
+    @staticmethod
+    def chapters(entries: list[dict]) -> list[dict]:
+        """Chapter per scene with start/end in seconds and an HH:MM:SS.mmm timecode"""
+        chapters, position = [], 0.0
+        for entry in entries:
+            end = position + entry["duration"]
+            chapters.append({
+                "seq": entry["seq"], "title": entry["title"], "video": str(entry["video"]),
+                "start": round(position, 3), "end": round(end, 3), "timecode": timecode(position),
+            })
+            position = end
+        return chapters
+
+    @staticmethod
+    def ffmetadata(chapters: list[dict]) -> str:
+        lines = [";FFMETADATA1"]
+        for chapter in chapters:
+            title = re.sub(r"([=;#\\\n])", r"\\\1", chapter["title"])
+            lines += ["[CHAPTER]", "TIMEBASE=1/1000", f"START={round(chapter['start'] * 1000)}",
+                      f"END={round(chapter['end'] * 1000)}", f"title={title}"]
+        return "\n".join(lines) + "\n"
 
-        return rendered_videos
+    @staticmethod
+    def fingerprint(video: Path, previous: dict | None = None) -> dict:
+        """
+        {"stat": [size, mtime_ns], "sha256": ...} of a video. The hash of previous is reused while
+        the size and mtime are unchanged, so a video copied over with the same bytes still matches.
+        """
+        stat = video.stat()
+        stat_key = [stat.st_size, stat.st_mtime_ns]
+        if isinstance(previous, dict) and previous.get("stat") == stat_key and previous.get("sha256"):
+            return previous
+        digest = hashlib.sha256()
+        with open(video, "rb") as f:
+            while chunk := f.read(1024 * 1024):
+                digest.update(chunk)
+        return {"stat": stat_key, "sha256": digest.hexdigest()}
+
+    @staticmethod
+    def same_content(previous, fingerprint: dict) -> bool:
+        return isinstance(previous, dict) and previous.get("sha256") == fingerprint["sha256"]
+
+    def probe_duration(self, video: Path) -> float:
+        cmd = [self.ffprobe, "-v", "error", "-show_entries", "format=duration",
+               "-of", "default=noprint_wrappers=1:nokey=1", str(video)]
+        completed = subprocess.run(cmd, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"ffprobe failed for {video}: {completed.stderr.strip()}")
+        return float(completed.stdout.strip())
+
+    def _concat(self, videos: list[Path], output: Path, work_dir: Path, metadata: Path | None = None):
+        """Stream-copies videos into output, replacing it atomically"""
+        list_file = work_dir / f"{output.stem}.txt"
+        list_file.write_text(
+            "".join("file '{}'\n".format(str(Path(v).resolve()).replace("'", "'\\''")) for v in videos),
+            encoding="utf-8",
+        )
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp = output.with_name(f".{output.stem}.tmp{output.suffix}")
+        cmd = [self.ffmpeg, "-y", "-v", "error", "-f", "concat", "-safe", "0", "-i", str(list_file)]
+        if metadata is not None:
+            cmd += ["-i", str(metadata), "-map", "0", "-map_metadata", "1", "-map_chapters", "1"]
+        cmd += ["-c", "copy", str(tmp)]
+        completed = subprocess.run(cmd, capture_output=True, text=True)
+        if completed.returncode != 0:
+            tmp.unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg concat failed for {output}: {completed.stderr.strip()}")
+        os.replace(tmp, output)
+
+    @staticmethod
+    def _key(parts) -> str:
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _load_index(path: Path) -> dict:
+        if not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (json.JSONDecodeError, OSError):
+            print(f"⚠️ Ignoring unreadable concat index: {path}")
+            return {}
+
+    @staticmethod
+    def _save_index(path: Path, index: dict):
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(index, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+
+class VoiceOverOutputHandler(OutputHandler):
+    """
+    Narrates rendered scenes: the script_seqN.txt voice-over is synthesized by a TTS
+    engine (src.tts) and muxed into the scene's MP4 as its audio track.
+
+    Audio is cached by a hash of the text and the engine settings, and identical texts
+    are synthesized once per run, so unchanged narration is never synthesized twice.
+    A <Scene>.voice.json sidecar records which audio a video carries; a scene is muxed
+    again only when its video was re-rendered or its narration changed.
+    """
+
+    def __init__(self, engine, cache=None, max_workers=None, ffmpeg="ffmpeg", mux=True):
+        self.engine = engine
+        self.cache = cache
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.ffmpeg = ffmpeg
+        self.mux = mux
+
+    def save(self, scenes, config: dict) -> dict:
+        """
+        scenes: {"txt": path, "video": path} dicts, one per rendered scene
+        config: {"type": "voice_over", "engine": "espeak", "engine_options": {...}, "mux": true}
+        Returns {"synthesized", "cached", "muxed", "unchanged", "silent", "audio": {video: audio}}
+        """
+        self.validate_data(scenes)
+        result = {"synthesized": 0, "cached": 0, "muxed": [], "unchanged": [], "silent": [], "audio": {}}
+
+        narrated = []
+        for scene in scenes:
+            txt, video = Path(scene["txt"]), Path(scene["video"])
+            text = txt.read_text(encoding="utf-8").strip() if txt.exists() else ""
+            if not text:
+                result["silent"].append(str(video))
+                continue
+            narrated.append((txt, video, self.engine.key(text), text))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            # one synthesis per distinct text, however many scenes share it
+            pending = {}
+            audio_paths = {}
+            for txt, _, key, text in narrated:
+                if key in audio_paths or key in pending:
+                    continue
+                cached = self.cache.get(key) if self.cache is not None else None
+                if cached is not None:
+                    audio_paths[key] = cached
+                    result["cached"] += 1
+                else:
+                    pending[key] = pool.submit(self._synthesize, key, text, txt.with_suffix(self.engine.suffix))
+            for key, future in pending.items():
+                audio_paths[key] = future.result()
+                result["synthesized"] += 1
+
+            muxes = {}
+            for _, video, key, _ in narrated:
+                audio = audio_paths[key]
+                result["audio"][str(video)] = str(audio)
+                if not self.mux:
+                    continue
+                if not video.exists():
+                    print(f"⚠️ Skipping voice-over for missing video: {video}")
+                elif self._unchanged(video, key):
+                    result["unchanged"].append(str(video))
+                else:
+                    muxes[str(video)] = pool.submit(self._mux, video, audio, key)
+            for video, future in muxes.items():
+                future.result()
+                result["muxed"].append(video)
+
+        print(f"🔊 Voice-over: {result['synthesized']} synthesized, {result['cached']} cached, "
+              f"{len(result['muxed'])} scenes muxed")
+        return result
+
+    def _synthesize(self, key: str, text: str, fallback: Path) -> Path:
+        """Synthesizes into the cache, or next to the .txt file when caching is off"""
+        target = fallback if self.cache is None else self.cache.object_path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_name(f".{target.stem}.{threading.get_ident()}.tmp{target.suffix}")
+        try:
+            self.engine.synthesize(text, tmp)
+            if self.cache is None:
+                os.replace(tmp, target)
+                return target
+            return self.cache.put(key, tmp)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def _mux(self, video: Path, audio: Path, key: str):
+        """Replaces the video with a copy carrying audio as its only audio track; video is not re-encoded"""
+        tmp = video.with_name(f".{video.stem}.voice.tmp{video.suffix}")
+        cmd = [self.ffmpeg, "-y", "-v", "error", "-i", str(video), "-i", str(audio),
+               "-map", "0:v:0", "-map", "1:a:0", "-c:v", "copy", "-c:a", "aac", str(tmp)]
+        completed = subprocess.run(cmd, capture_output=True, text=True)
+        if completed.returncode != 0:
+            tmp.unlink(missing_ok=True)
+            raise RuntimeError(f"ffmpeg mux failed for {video}: {completed.stderr.strip()}")
+        os.replace(tmp, video)
+        sidecar = {"audio": key, "video": ConcatOutputHandler.fingerprint(video)}
+        video.with_suffix(".voice.json").write_text(json.dumps(sidecar), encoding="utf-8")
+
+    def _unchanged(self, video: Path, key: str) -> bool:
+        """Whether video is, byte for byte, what the last mux of audio key wrote"""
+        sidecar = self._sidecar(video)
+        if not isinstance(sidecar, dict) or sidecar.get("audio") != key:
+            return False
+        return ConcatOutputHandler.same_content(sidecar.get("video"),
+                                                ConcatOutputHandler.fingerprint(video, sidecar.get("video")))
+
+    @staticmethod
+    def _sidecar(video: Path) -> dict | None:
+        try:
+            return json.loads(video.with_suffix(".voice.json").read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+
+def timecode(seconds: float) -> str:
+    """HH:MM:SS.mmm"""
+    millis = round(seconds * 1000)
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
@@ -0,0 +1,227 @@
+"""
+Compact parsed-copy formats that can be read one sequence at a time.
+
+"jsonl": one compact JSON object per line in <name>.jsonl, plus <name>.jsonl.idx holding
+         a little-endian (offset, script_seq) int64 pair per line and a final end offset.
+         Both files are memory-mapped; fetching sequence i decodes only that line.
+"arrow": an Arrow IPC file of fixed-size record batches (requires pyarrow). The file is
+         memory-mapped and only the batches holding the requested rows are read.
+"""
+import bisect
+import json
+import mmap
+import os
+import struct
+from pathlib import Path
+
+from src.sequence import as_dict
+
+FORMATS = ("json", "jsonl", "arrow")
+SUFFIXES = {"jsonl": ".jsonl", "arrow": ".arrow"}
+
+_INDEX_MAGIC = b"PCIDX1\0\0"
+_ENTRY = struct.Struct("<qq")
+# script_seq stored in the index when a sequence has none, or a non-integer one
+_NO_SEQ = -1
+
+
+def copy_path(output_config: dict) -> Path:
+    """Where the parsed copy of output_config is written, with the suffix of its format"""
+    path = Path(output_config["path"]) / output_config["file"]
+    suffix = SUFFIXES.get(output_config.get("format", "json"))
+    return path.with_suffix(suffix) if suffix else path
+
+
+def _seq_key(seq) -> int:
+    try:
+        return int(seq.get("script_seq"))
+    except (TypeError, ValueError):
+        return _NO_SEQ
+
+
+def write_jsonl(sequences, path: Path):
+    """Yields each sequence while writing it; both files replace the old copy once the stream is complete"""
+    index_path = path.with_name(path.name + ".idx")
+    tmp_path = path.with_name(path.name + ".partial")
+    tmp_index = index_path.with_name(index_path.name + ".partial")
+
+    with open(tmp_path, "wb") as data, open(tmp_index, "wb") as index:
+        index.write(_INDEX_MAGIC)
+        offset = 0
+        for seq in sequences:
+            line = json.dumps(as_dict(seq), ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+            data.write(line)
+            index.write(_ENTRY.pack(offset, _seq_key(seq)))
+            offset += len(line)
+            yield seq
+        index.write(_ENTRY.pack(offset, _NO_SEQ))
+
+    os.replace(tmp_path, path)
+    os.replace(tmp_index, index_path)
+
+
+def write_arrow(sequences, path: Path, batch_size: int = 1024):
+    """Yields each sequence while writing record batches of batch_size rows"""
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError('parsed_copy format "arrow" requires pyarrow: pip install pyarrow') from e
+
+    tmp_path = path.with_name(path.name + ".partial")
+    writer = None
+    schema = None
+    rows = []
+
+    def flush():
+        nonlocal writer, schema
+        if schema is None:
+            schema = pa.Table.from_pylist(rows).schema
+            writer = pa.ipc.new_file(str(tmp_path), schema)
+        extra = {key for row in rows for key in row} - set(schema.names)
+        if extra:
+            raise ValueError(f"Sequences have fields missing from the first batch: {sorted(extra)}")
+        writer.write_batch(pa.RecordBatch.from_pylist(rows, schema=schema))
+        rows.clear()
+
+    try:
+        for seq in sequences:
+            rows.append(as_dict(seq))
+            if len(rows) == batch_size:
+                flush()
+            yield seq
+        if rows:
+            flush()
+        if writer is None:  # empty stream
+            writer = pa.ipc.new_file(str(tmp_path), pa.schema([]))
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, path)
+
+
+class JsonLinesCopy:
+    """Random access to a "jsonl" parsed copy through memory-mapped data and index files"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._data_file = open(self.path, "rb")
+        self._index_file = open(self.path.with_name(self.path.name + ".idx"), "rb")
+        self._data = mmap.mmap(self._data_file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if os.path.getsize(self.path) else b""
+        self._index = mmap.mmap(self._index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._index[:len(_INDEX_MAGIC)] != _INDEX_MAGIC:
+            self.close()
+            raise ValueError(f"Not a parsed-copy index: {self.path}.idx")
+        self._count = (len(self._index) - len(_INDEX_MAGIC)) // _ENTRY.size - 1
+        self._positions = None
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._decode(i) for i in range(*item.indices(self._count))]
+        if item < 0:
+            item += self._count
+        if not 0 <= item < self._count:
+            raise IndexError("sequence index out of range")
+        return self._decode(item)
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._decode(i)
+
+    def by_seq(self, script_seq: int) -> dict:
+        """The sequence with this script_seq, found through the index without decoding other lines"""
+        if self._positions is None:
+            self._positions = {}
+            for i in range(self._count):
+                self._positions.setdefault(self._entry(i)[1], i)
+        if script_seq not in self._positions:
+            raise KeyError(script_seq)
+        return self._decode(self._positions[script_seq])
+
+    def _entry(self, i: int) -> tuple[int, int]:
+        return _ENTRY.unpack_from(self._index, len(_INDEX_MAGIC) + i * _ENTRY.size)
+
+    def _decode(self, i: int) -> dict:
+        start = self._entry(i)[0]
+        end = self._entry(i + 1)[0]
+        return json.loads(self._data[start:end])
+
+    def close(self):
+        for resource in (self._data, self._index, self._data_file, self._index_file):
+            if hasattr(resource, "close"):
+                resource.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ArrowCopy:
+    """Random access to an "arrow" parsed copy; only the record batches holding requested rows are read"""
+
+    def __init__(self, path):
+        import pyarrow as pa
+
+        self.path = Path(path)
+        self._source = pa.memory_map(str(self.path), "r")
+        self._reader = pa.ipc.open_file(self._source)
+        self._starts = [0]
+        for i in range(self._reader.num_record_batches):
+            self._starts.append(self._starts[-1] + self._reader.get_batch(i).num_rows)
+
+    def __len__(self):
+        return self._starts[-1]
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._row(i) for i in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("sequence index out of range")
+        return self._row(item)
+
+    def __iter__(self):
+        for i in range(self._reader.num_record_batches):
+            yield from self._reader.get_batch(i).to_pylist()
+
+    def by_seq(self, script_seq: int) -> dict:
+        """The sequence with this script_seq; only the script_seq column is scanned"""
+        for i in range(self._reader.num_record_batches):
+            batch = self._reader.get_batch(i)
+            if "script_seq" not in batch.schema.names:
+                break
+            for row, value in enumerate(batch.column("script_seq").to_pylist()):
+                if _seq_key({"script_seq": value}) == script_seq:
+                    return batch.slice(row, 1).to_pylist()[0]
+        raise KeyError(script_seq)
+
+    def _row(self, i: int) -> dict:
+        batch = bisect.bisect_right(self._starts, i) - 1
+        return self._reader.get_batch(batch).slice(i - self._starts[batch], 1).to_pylist()[0]
+
+    def close(self):
+        self._source.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def open_copy(path):
+    """Reader for a parsed copy, chosen by suffix: .jsonl or .arrow"""
+    path = Path(path)
+    match path.suffix:
+        case ".jsonl":
+            return JsonLinesCopy(path)
+        case ".arrow":
+            return ArrowCopy(path)
+        case _:
+            raise ValueError(f"Not a compact parsed copy: {path}")
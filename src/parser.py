@@ -1,21 +1,145 @@
 import json
 import csv
 from abc import ABC, abstractmethod
+from pathlib import Path
+
+from src.parsed_copy import SUFFIXES, open_copy
+from src.sequence import Sequence, SequenceBatch, normalize, row_reader
 
 
 class Parser(ABC):
-    """Abstract base class for all parsers"""
+    """
+    Abstract base class for all parsers.
+    parse() returns {"sequences": SequenceBatch} and iter_parse() yields Sequence records,
+    whatever the column names of the source format.
+    """
 
     @abstractmethod
     def parse(self, raw_data):
         pass
 
+    def iter_parse(self, chunks):
+        """
+        Yields sequences one at a time from an iterable of raw data chunks.
+        Parsers without a streaming implementation join the chunks and parse them at once.
+        """
+        yield from self.parse("".join(chunks))["sequences"]
+
     @staticmethod
     def validate_raw_data(raw_data):
         if raw_data is None or (isinstance(raw_data, str) and not raw_data.strip()):
             raise ValueError("Raw data cannot be empty")
 
 
+def iter_lines(chunks):
+    """Re-splits text chunks into lines, keeping line endings"""
+    pending = ""
+    for chunk in chunks:
+        pending += chunk
+        start = 0
+        while (end := pending.find("\n", start)) != -1:
+            yield pending[start:end + 1]
+            start = end + 1
+        pending = pending[start:]
+    if pending:
+        yield pending
+
+
+class _JSONStreamReader:
+    """
+    Incremental reader over JSON text chunks.
+    Only one array item is decoded at a time, so memory is bounded by the largest item.
+    """
+
+    WHITESPACE = " \t\n\r"
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def sequences(self):
+        match self._next_char():
+            case "[":
+                yield from self._array_items()
+            case "{":
+                yield from self._sequences_from_object()
+            case "":
+                raise ValueError("Raw data cannot be empty")
+            case _:
+                raise ValueError("Invalid JSON format. Expected a list of sequences or a dict with 'sequences'.")
+
+    def _sequences_from_object(self):
+        self._pos += 1
+        if self._next_char() == "}":
+            raise ValueError("Invalid JSON format. Expected a list of sequences or a dict with 'sequences'.")
+        while True:
+            key = self._decode()
+            self._expect(":")
+            if key == "sequences" and self._next_char() == "[":
+                yield from self._array_items()
+                return
+            self._decode()
+            if self._next_char() == "}":
+                raise ValueError("Invalid JSON format. Expected a list of sequences or a dict with 'sequences'.")
+            self._expect(",")
+
+    def _array_items(self):
+        self._pos += 1
+        if self._next_char() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self._decode()
+            if self._next_char() == "]":
+                self._pos += 1
+                return
+            self._expect(",")
+
+    def _expect(self, char: str):
+        if self._next_char() != char:
+            raise ValueError(f"Invalid JSON: expected '{char}' at offset {self._pos}")
+        self._pos += 1
+
+    def _next_char(self) -> str:
+        """Skips whitespace and returns the next character without consuming it ('' at EOF)"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in self.WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _decode(self):
+        self._next_char()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A value touching the end of the buffer (e.g. a number) may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+
 class JSONParser(Parser):
     def parse(self, raw_data: str):
         self.validate_raw_data(raw_data)
@@ -23,35 +147,79 @@ class JSONParser(Parser):
 
         # If the root is already a list of sequences
         if isinstance(data, list):
-            return {"sequences": data}
+            return {"sequences": SequenceBatch(data)}
 
         # If root is a dict with "sequences"
         if isinstance(data, dict) and "sequences" in data:
-            return data
+            return dict(data, sequences=SequenceBatch(data["sequences"]))
 
         raise ValueError("Invalid JSON format. Expected a list of sequences or a dict with 'sequences'.")
 
+    def iter_parse(self, chunks):
+        """Streams items of a root list, or of the "sequences" list of a root dict"""
+        yield from normalize(_JSONStreamReader(chunks).sequences())
+
+    @staticmethod
+    def is_compact_copy(path) -> bool:
+        return Path(path).suffix in SUFFIXES.values()
+
+    def iter_parse_file(self, path, start: int = 0, stop: int | None = None):
+        """
+        Sequences [start:stop] of a compact parsed copy (.jsonl / .arrow). The copy is
+        memory-mapped and only the requested sequences are decoded.
+        """
+        with open_copy(path) as copy:
+            stop = len(copy) if stop is None else min(stop, len(copy))
+            for i in range(start, stop):
+                yield Sequence.from_mapping(copy[i])
+
 
 # Keep other parsers for future use
 class CSVParser(Parser):
     def parse(self, raw_data: str):
         self.validate_raw_data(raw_data)
-        reader = csv.DictReader(raw_data.splitlines())
-        return {"sequences": list(reader)}
+        return {"sequences": SequenceBatch(self._rows(raw_data.splitlines()))}
+
+    def iter_parse(self, chunks):
+        yield from self._rows(iter_lines(chunks))
+
+    @staticmethod
+    def _rows(lines):
+        """Header columns are mapped once; blank lines are skipped like csv.DictReader does"""
+        reader = csv.reader(lines)
+        columns = next(reader, None)
+        if columns is None:
+            return
+        read = row_reader(columns)
+        for row in reader:
+            if row:
+                yield read(row)
 
 
 class TXTParser(Parser):
     def parse(self, raw_data: str):
         self.validate_raw_data(raw_data)
         return {
-            "sequences": [
-                {"id": i + 1, "script": line.strip(), "voice_over": line.strip()}
+            "sequences": SequenceBatch(
+                Sequence(i + 1, line.strip(), line.strip())
                 for i, line in enumerate(raw_data.splitlines()) if line.strip()
-            ]
+            )
         }
 
+    def iter_parse(self, chunks):
+        for i, line in enumerate(iter_lines(chunks)):
+            if line.strip():
+                yield Sequence(i + 1, line.strip(), line.strip())
+
 
 class DBParser(Parser):
-    def parse(self, raw_data: list[dict]):
+    def parse(self, raw_data):
+        """raw_data: DatabaseInputHandler.load() output, or a list of row dicts"""
         self.validate_raw_data(raw_data)
-        return {"sequences": raw_data}
+        sequences = raw_data if isinstance(raw_data, SequenceBatch) else SequenceBatch(raw_data)
+        return {"sequences": sequences}
+
+    def iter_parse(self, chunks):
+        """chunks are batches of rows (SequenceBatch from DatabaseInputHandler, or row dicts)"""
+        for batch in chunks:
+            yield from normalize(batch)
@@ -0,0 +1,351 @@
+import copy
+import threading
+from contextlib import nullcontext
+from pathlib import Path
+
+from src.bounded_queue import BoundedQueue, prefetch
+from src.factories.input_handler_factory import InputHandlerFactory
+from src.factories.output_handler_factory import OutputHandlerFactory
+from src.factories.parser_factory import ParserFactory
+from src.instrumentation import get_instrumentation
+from src.output_handler import ManimOutputHandler, seq_number
+from src.parser import JSONParser
+from src.plan import PipelinePlan, compile_plan
+from src.render_orchestrator import render_with_progress
+from src.render_passes import MultiPassRenderer
+from src.run_journal import RunJournal, file_hash
+
+
+class PipelineContext:
+    """
+    Handlers shared by every pipeline run in one process.
+
+    The factories build each handler once per distinct config and reuse it, so batch
+    runs share DB connections, render caches and worker settings across projects.
+    """
+
+    def input_handler(self, input_config: dict):
+        return InputHandlerFactory.get_handler(input_config["type"])
+
+    def output_handler(self, output_config: dict):
+        return OutputHandlerFactory.get_handler(output_config)
+
+
+def run_pipeline(config: dict, context: PipelineContext | None = None, media_dir: str | Path | None = None,
+                 resume: bool = False) -> dict:
+    """
+    Runs input → parse → parsed copy → Manim generation → render for one config.
+    media_dir overrides video_output.media_dir so projects sharing a handler keep separate videos.
+    With config["pipeline"]["mode"] == "streaming", rendering overlaps generation (see _run_streaming).
+    Progress is recorded in a run journal; resume=True continues the journal of an interrupted
+    run and skips generation and scenes whose outputs are still intact.
+    Returns {"generated": ..., "rendered": [...], "voice_over": ..., "concat": ...}; "generated" is None
+    when generation was skipped, "voice_over" is None without a voice_over config and "concat" is
+    None without a concat_output config.
+    The config is validated before any stage runs and raises ConfigError when it is invalid.
+    """
+    plan = compile_plan(config)
+    with open_journal(config, resume) as journal:
+        return _run(config, plan, context or PipelineContext(), media_dir, journal)
+
+
+def open_journal(config: dict, resume: bool = False):
+    """config["journal"]: {"enabled": true, "path": ".journal/<base_name>.jsonl"}"""
+    journal_config = config.get("journal", {})
+    if not journal_config.get("enabled", True):
+        return nullcontext()
+    path = journal_config.get("path") or Path(".journal") / f"{config['manim_output']['base_name']}.jsonl"
+    return RunJournal(path, resume=resume)
+
+
+def _run(config: dict, plan: PipelinePlan, context: PipelineContext, media_dir, journal: RunJournal | None) -> dict:
+    metrics = get_instrumentation()
+
+    input_config = config["input"]
+    manim_config = config["manim_output"]
+    video_config = config["video_output"]
+
+    input_handler = context.input_handler(input_config)
+    video_handler = context.output_handler(video_config)
+    manim_handler = context.output_handler(manim_config)
+    if media_dir is not None:
+        video_handler = video_handler.with_media_dir(media_dir)
+
+    if plan.streaming:
+        sequences = _sequences(config, context, input_handler)
+        result = _run_streaming(sequences, manim_handler, manim_config, video_handler,
+                                config["pipeline"].get("queue_size", 16), journal, _input_hash(input_config))
+        videos = _scene_videos(video_handler, result["rendered"])
+        result["voice_over"] = _voice_over(config, context, videos, journal)
+        result["concat"] = _assemble(config, context, video_handler, videos)
+        return result
+
+    generated_files = None
+    input_hash = _input_hash(input_config)
+    regenerate = plan.regenerate
+    if regenerate and journal is not None and journal.generation_done(input_hash, _manifest_path(manim_config)):
+        print("♻️ Resuming: input unchanged since Manim files were generated")
+        regenerate = False
+
+    if regenerate:
+        # Steps 1-3: stream, parse and copy the input
+        sequences = _sequences(config, context, input_handler)
+
+        # Step 4: Generate Manim .py & .txt files, one sequence at a time
+        with metrics.stage("manim_generation"):
+            generated_files = manim_handler.save({"sequences": sequences}, manim_config)
+        _report_generated(generated_files)
+        _record_generated(journal, generated_files, manim_config, input_hash)
+
+    else:
+        print("♻️ Skipping parsing and Manim file generation. Using existing files.")
+
+    # Step 5: Render videos from Manim files
+    manim_base_path = plan.manim_dir
+    videos = None
+    with metrics.stage("video_render") as record:
+        if video_config.get("passes"):
+            report = MultiPassRenderer.from_config(video_handler, video_config["passes"]).save(manim_base_path, journal)
+            rendered_videos = report["rendered"]
+            # a scene's video is its final render once upgraded, else its preview
+            videos = report["videos"]
+            print(f"🎞️ {len(report['previews'])} previews, {len(report['finals'])} final renders, "
+                  f"{len(report['final'])} scenes final")
+        elif video_config.get("progress"):
+            rendered_videos = render_with_progress(video_handler, manim_base_path, journal)
+        elif journal is not None:
+            rendered_videos = _render_journaled(video_handler, manim_base_path, journal)
+        else:
+            rendered_videos = video_handler.save(manim_base_path)
+        record["scenes_rendered"] = len(rendered_videos)
+    print("🎬 Rendered videos:", rendered_videos)
+
+    if videos is None:
+        videos = _scene_videos(video_handler, rendered_videos)
+
+    # Step 6: Narrate the rendered scenes
+    voice_over = _voice_over(config, context, videos, journal)
+
+    # Step 7: Join the rendered scenes into one video
+    concat = _assemble(config, context, video_handler, videos)
+    return {"generated": generated_files, "rendered": rendered_videos, "voice_over": voice_over, "concat": concat}
+
+
+def rerender(config: dict, context: PipelineContext, video_handler, scenes, regenerate: bool = False,
+             on_generated=None) -> dict:
+    """
+    Renders only the given scene files on video_handler, e.g. the ones an edit touched.
+    With regenerate=True the Manim files are first regenerated from the input and the added
+    and changed sequences are rendered as well; on_generated() is called once they are written.
+    Voice-over and concat then run over every scene that has a video, redoing only changed ones.
+    Returns {"generated", "rendered", "failed", "voice_over", "concat"}; "generated" is the
+    manifest diff, or None without regenerate.
+    """
+    metrics = get_instrumentation()
+    plan = compile_plan(config)
+    scenes = set(map(Path, scenes))
+    generated = None
+
+    if regenerate:
+        manim_config = config["manim_output"]
+        sequences = _sequences(config, context, context.input_handler(config["input"]))
+        with metrics.stage("manim_generation"):
+            generated_files = context.output_handler(manim_config).save({"sequences": sequences}, manim_config)
+        _report_generated(generated_files)
+        generated = generated_files["diff"]
+        scenes.update(plan.manim_dir / f"script_seq{seq}" / f"script_seq{seq}.py"
+                      for seq in generated["added"] + generated["changed"])
+        if on_generated is not None:
+            on_generated()
+
+    scenes = sorted((path for path in scenes if path.exists()), key=seq_number)
+    with metrics.stage("video_render", scenes=len(scenes)) as record:
+        results = video_handler.render_all(scenes)
+        record["scenes_rendered"] = sum(result.ok for result in results)
+
+    finished = [str(py_file) for py_file in video_handler.scene_files(plan.manim_dir)
+                if video_handler.video_path(py_file, video_handler.scene_name(py_file)).exists()]
+    videos = _scene_videos(video_handler, finished)
+    return {
+        "generated": generated,
+        "rendered": [str(result.py_file) for result in results if result.ok],
+        "failed": [str(result.py_file) for result in results if not result.ok],
+        "voice_over": _voice_over(config, context, videos),
+        "concat": _assemble(config, context, video_handler, videos),
+    }
+
+
+def _sequences(config: dict, context: PipelineContext, input_handler):
+    """Lazy stream of parsed sequences, saved to the parsed copy as they pass"""
+    metrics = get_instrumentation()
+    input_config = config["input"]
+    parsed_config = config["parsed_copy"]
+
+    parser = ParserFactory.get_parser(input_config.get("file_type", "json"))
+    input_path = Path(input_config.get("path", "")) / input_config.get("file", "")
+    if input_config["type"] == "local" and isinstance(parser, JSONParser) and parser.is_compact_copy(input_path):
+        # Steps 1-2: a compact parsed copy is memory-mapped and decoded one sequence at a time
+        sequences = metrics.iterate("parse", parser.iter_parse_file(input_path))
+    else:
+        # Step 1: Stream raw input in chunks
+        raw_chunks = metrics.iterate("input_load", input_handler.stream(input_config))
+
+        # Step 2: Parse chunks into a stream of sequences
+        sequences = metrics.iterate("parse", parser.iter_parse(raw_chunks))
+
+    # Step 3: Save parsed copy as the sequences stream past
+    parsed_output_handler = context.output_handler(parsed_config)
+    return metrics.iterate("parsed_copy_save", parsed_output_handler.write_through(sequences, parsed_config))
+
+
+def _input_hash(input_config: dict) -> str | None:
+    """Content hash of a local input file; other inputs cannot be checked cheaply"""
+    if input_config.get("type") != "local":
+        return None
+    path = Path(input_config["path"]) / input_config["file"]
+    return file_hash(path) if path.exists() else None
+
+
+def _manifest_path(manim_config: dict) -> Path:
+    return ManimOutputHandler.base_path(manim_config) / "manifest.json"
+
+
+def _record_generated(journal: RunJournal | None, generated_files: dict, manim_config: dict, input_hash: str | None):
+    if journal is None:
+        return
+    journal.record("parse", status="done", sequences=len(generated_files["py_files"]))
+    manifest_path = _manifest_path(manim_config)
+    journal.record("generate", status="done", input_hash=input_hash,
+                   manifest_hash=file_hash(manifest_path) if manifest_path.exists() else None,
+                   **{kind: len(seqs) for kind, seqs in generated_files["diff"].items()})
+
+
+def _render_journaled(video_handler, manim_base_path: Path, journal: RunJournal) -> list[str]:
+    """Renders every scene not already done according to the journal, recording each outcome"""
+    if not manim_base_path.exists():
+        raise FileNotFoundError(f"Manim folder not found: {manim_base_path}")
+    results = video_handler.render_stream(video_handler.scene_files(manim_base_path),
+                                          render=journal.render_with(video_handler))
+    resumed = sum(result.resumed for result in results)
+    if resumed:
+        print(f"♻️ Resuming: {resumed} scenes were already rendered")
+    return [str(result.py_file) for result in results if result.ok]
+
+
+def _report_generated(generated_files: dict):
+    print("✅ Saved parsed JSON copy")
+    diff = generated_files["diff"]
+    print(
+        f"✅ Generated Manim files for {len(generated_files['py_files'])} sequences: "
+        f"{len(diff['added'])} added, {len(diff['changed'])} changed, "
+        f"{len(diff['unchanged'])} unchanged, {len(diff['removed'])} removed"
+    )
+
+
+def _run_streaming(sequences, manim_handler, manim_config: dict, video_handler, queue_size: int,
+                   journal: RunJournal | None = None, input_hash: str | None = None) -> dict:
+    """
+    Overlaps generation with rendering through bounded queues:
+
+        input/parse/parsed copy ──queue──▶ Manim generation ──queue──▶ render workers
+
+    Scene 1 renders while later sequences are still parsed and written. Every queue
+    holds at most queue_size items, so when rendering is the bottleneck generation
+    blocks and input is no longer read, instead of piling up in memory.
+    """
+    metrics = get_instrumentation()
+    scenes = BoundedQueue(queue_size)
+    generated = {}
+
+    def generate():
+        try:
+            with metrics.stage("manim_generation"):
+                generated.update(manim_handler.save(
+                    {"sequences": prefetch(sequences, queue_size)}, manim_config, on_scene=scenes.put
+                ))
+        except BaseException as e:
+            scenes.close(e)
+            return
+        scenes.close()
+
+    generator = threading.Thread(target=generate, name="manim-generation", daemon=True)
+    generator.start()
+    try:
+        with metrics.stage("video_render") as record:
+            render = journal.render_with(video_handler) if journal is not None else None
+            results = video_handler.render_stream(scenes, render=render)
+            record["scenes_rendered"] = len(results)
+    finally:
+        # unblocks generation if rendering stopped early
+        scenes.cancel()
+        generator.join()
+
+    _report_generated(generated)
+    _record_generated(journal, generated, manim_config, input_hash)
+    rendered_videos = sorted((str(result.py_file) for result in results if result.ok), key=seq_number)
+    print("🎬 Rendered videos:", rendered_videos)
+    return {"generated": generated, "rendered": rendered_videos}
+
+
+def _voice_over(config: dict, context: PipelineContext, videos: dict[str, Path],
+                journal: RunJournal | None = None) -> dict | None:
+    """
+    Synthesizes each scene's .txt narration and muxes it into its video when config has a voice_over.
+    videos maps each rendered py_file to the video to narrate; muxed videos are recorded in journal.
+    """
+    voice_config = config.get("voice_over")
+    if not voice_config or not videos:
+        return None
+    scenes = [{"txt": Path(py_file).with_suffix(".txt"), "video": video} for py_file, video in videos.items()]
+    with get_instrumentation().stage("voice_over", scenes=len(scenes)):
+        result = context.output_handler(voice_config).save(scenes, voice_config)
+    if journal is not None:
+        journal.record_voice_over(result.get("muxed", []))
+    return result
+
+
+def _scene_videos(video_handler, rendered_videos: list[str]) -> dict[str, Path]:
+    """py_file -> the video video_handler renders it to, for each rendered scene"""
+    return {py_file: video_handler.video_path(py_file, video_handler.scene_name(py_file)) for py_file in rendered_videos}
+
+
+def _assemble(config: dict, context: PipelineContext, video_handler, videos: dict[str, Path]) -> dict | None:
+    """
+    Concatenates the rendered scenes when config has a concat_output; chapters are titled by voice-over.
+    videos maps each rendered py_file to the video to use for it.
+    """
+    concat_config = config.get("concat_output")
+    if not concat_config or not videos:
+        return None
+    clips = []
+    for py_file, video in videos.items():
+        py_file = Path(py_file)
+        txt_file = py_file.with_suffix(".txt")
+        voice_over = txt_file.read_text(encoding="utf-8").strip() if txt_file.exists() else ""
+        clips.append({
+            "video": video,
+            "title": voice_over.splitlines()[0][:80] if voice_over else video_handler.scene_name(py_file),
+        })
+    with get_instrumentation().stage("concat"):
+        return context.output_handler(concat_config).save(clips, concat_config)
+
+
+def project_config(base_config: dict, input_file: Path) -> dict:
+    """
+    Copy of base_config that reads input_file and writes to folders named after it.
+    Generation is always on: the Manim folder is derived from the file, and the manifest
+    keeps regeneration incremental.
+    """
+    config = copy.deepcopy(base_config)
+    name = input_file.stem
+    config["input"].update(type="local", path=str(input_file.parent), file=input_file.name,
+                           file_type=input_file.suffix.lstrip(".").lower())
+    config["parsed_copy"]["file"] = f"{name}.json"
+    config["manim_output"].update(base_name=name, regenerate=True)
+    if config.get("journal", {}).get("path"):
+        journal_path = Path(config["journal"]["path"])
+        config["journal"]["path"] = str(journal_path.with_name(f"{name}{journal_path.suffix}"))
+    if "concat_output" in config:
+        output = Path(config["concat_output"].get("output", "output/video.mp4"))
+        config["concat_output"]["output"] = str(output.with_name(f"{name}{output.suffix}"))
+    return config
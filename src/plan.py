@@ -0,0 +1,201 @@
+"""
+Compiled, immutable view of what a config will run.
+
+compile_plan validates a config once and resolves its stages, handlers and paths into
+a PipelinePlan. Plans are cached by a hash of the config, so batch projects and watch
+rounds that reuse a config do not validate and resolve it again. estimate_work counts
+what a run would do without writing anything; `python -m src.main --dry-run` prints both.
+"""
+import hashlib
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.config_loader import validate_config
+from src.factories.input_handler_factory import InputHandlerFactory
+from src.factories.output_handler_factory import OutputHandlerFactory
+from src.factories.parser_factory import ParserFactory
+from src.manifest import Manifest
+from src.output_handler import ManimOutputHandler, VideoOutputHandler
+from src.parsed_copy import copy_path
+from src.render_cache import RenderCache
+
+
+@dataclass(frozen=True, slots=True)
+class PlanStage:
+    name: str
+    handler: str  # "package.module:ClassName"
+    paths: tuple[tuple[str, Path], ...] = ()
+    enabled: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class PipelinePlan:
+    config_hash: str
+    mode: str
+    stages: tuple[PlanStage, ...]
+    input_file: Path | None
+    manim_dir: Path
+    media_dir: Path
+    quality: str
+    regenerate: bool
+
+    @property
+    def streaming(self) -> bool:
+        return self.mode == "streaming" and self.regenerate
+
+    def stage(self, name: str) -> PlanStage | None:
+        return next((stage for stage in self.stages if stage.name == name), None)
+
+
+_plans = {}
+_lock = threading.Lock()
+
+
+def config_hash(config: dict) -> str:
+    return hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def compile_plan(config: dict) -> PipelinePlan:
+    """Validates config (raising ConfigError) and resolves its plan; cached per config hash"""
+    key = config_hash(config)
+    with _lock:
+        plan = _plans.get(key)
+    if plan is None:
+        validate_config(config)
+        plan = _compile(config, key)
+        with _lock:
+            _plans[key] = plan
+    return plan
+
+
+def clear_plan_cache():
+    with _lock:
+        _plans.clear()
+
+
+def _compile(config: dict, key: str) -> PipelinePlan:
+    input_config = config["input"]
+    parsed_config = config["parsed_copy"]
+    manim_config = config["manim_output"]
+    video_config = config["video_output"]
+    regenerate = manim_config.get("regenerate", True)
+
+    input_file = None
+    if input_config["type"] == "local":
+        input_file = Path(input_config["path"]) / input_config["file"]
+        input_paths = (("file", input_file),)
+    else:
+        input_paths = tuple((k, Path(str(input_config[k]))) for k in ("table",) if k in input_config)
+    parser = ParserFactory.parsers[input_config.get("file_type", "json").lower()]
+    parsed_paths = (("file", copy_path(parsed_config)),) if parsed_config["type"] == "local" else ()
+    manim_dir = ManimOutputHandler.base_path(manim_config)
+    media_dir = Path(video_config.get("media_dir", "media"))
+
+    stages = [
+        PlanStage("input_load", InputHandlerFactory.target(input_config["type"]), input_paths, regenerate),
+        PlanStage("parse", f"{parser.__module__}:{parser.__name__}", enabled=regenerate),
+        PlanStage("parsed_copy_save", OutputHandlerFactory.target(parsed_config["type"]), parsed_paths, regenerate),
+        PlanStage("manim_generation", OutputHandlerFactory.target(manim_config["type"]),
+                  (("folder", manim_dir), ("manifest", manim_dir / Manifest.FILE_NAME)), regenerate),
+        PlanStage("video_render", OutputHandlerFactory.target(video_config["type"]), (("media_dir", media_dir),)),
+    ]
+    if config.get("voice_over"):
+        voice_config = config["voice_over"]
+        cache = voice_config.get("cache", {})
+        paths = (("cache", Path(cache.get("path", ".tts_cache"))),) if cache.get("enabled", True) else ()
+        stages.append(PlanStage("voice_over", OutputHandlerFactory.target(voice_config["type"]), paths))
+    if config.get("concat_output"):
+        concat_config = config["concat_output"]
+        stages.append(PlanStage("concat", OutputHandlerFactory.target(concat_config["type"]),
+                                (("output", Path(concat_config.get("output", "output/video.mp4"))),)))
+
+    return PipelinePlan(
+        config_hash=key,
+        mode=config.get("pipeline", {}).get("mode", "staged"),
+        stages=tuple(stages),
+        input_file=input_file,
+        manim_dir=manim_dir,
+        media_dir=media_dir,
+        quality=VideoOutputHandler.quality_map[video_config.get("quality", "low").lower()],
+        regenerate=regenerate,
+    )
+
+
+def estimate_work(plan: PipelinePlan, config: dict) -> dict:
+    """
+    What a run of config would do, found without writing anything:
+    {"sequences", "generate": {"added", "changed", "unchanged", "removed"} | None, "scenes", "renders", "cached",
+     "input_error"}. Renders are scenes whose source is not in the render cache.
+    """
+    work = {"sequences": None, "generate": None, "scenes": 0, "renders": 0, "cached": 0, "input_error": None}
+    sources = []
+    if plan.regenerate:
+        try:
+            sequences = _read_sequences(config)
+            previous = Manifest(plan.manim_dir).entries
+            current = set()
+            generate = {"added": 0, "changed": 0, "unchanged": 0, "removed": 0}
+            for seq in sequences:
+                py_content, txt_content = ManimOutputHandler.contents(seq)
+                key = str(seq.script_seq)
+                current.add(key)
+                old = previous.get(key)
+                if old is None:
+                    generate["added"] += 1
+                elif old["hash"] == Manifest.content_hash(py_content, txt_content):
+                    generate["unchanged"] += 1
+                else:
+                    generate["changed"] += 1
+                sources.append(py_content)
+            generate["removed"] = len(previous.keys() - current)
+            work.update(sequences=len(sources), generate=generate)
+        except (OSError, ValueError) as e:
+            work["input_error"] = str(e)
+            return work
+    else:
+        sources = [py_file.read_text(encoding="utf-8") for py_file in VideoOutputHandler.scene_files(plan.manim_dir)]
+
+    work["scenes"] = len(sources)
+    cache_config = config["video_output"].get("cache", {})
+    if cache_config.get("enabled", True):
+        cache = RenderCache(cache_config.get("path", ".render_cache"))
+        work["cached"] = sum(RenderCache.key(source, plan.quality) in cache for source in sources)
+    work["renders"] = work["scenes"] - work["cached"]
+    return work
+
+
+def _read_sequences(config: dict):
+    """The input's sequences, read the way the pipeline reads them but without a parsed copy"""
+    from src.parser import JSONParser
+    from src.sequence import normalize
+
+    input_config = config["input"]
+    parser = ParserFactory.get_parser(input_config.get("file_type", "json"))
+    if input_config["type"] == "local" and isinstance(parser, JSONParser):
+        input_path = Path(input_config["path"]) / input_config["file"]
+        if parser.is_compact_copy(input_path):
+            return normalize(parser.iter_parse_file(input_path))
+    input_handler = InputHandlerFactory.get_handler(input_config["type"])
+    return normalize(parser.iter_parse(input_handler.stream(input_config)))
+
+
+def format_plan(plan: PipelinePlan, work: dict | None = None) -> str:
+    lines = [f"🧭 Pipeline plan {plan.config_hash[:12]} ({plan.mode})"]
+    width = max(len(stage.name) for stage in plan.stages)
+    for i, stage in enumerate(plan.stages, 1):
+        parts = [f"{i}. {stage.name.ljust(width)}", stage.handler, ", ".join(f"{k}={v}" for k, v in stage.paths)]
+        if not stage.enabled:
+            parts.append("(skipped: regenerate is off)")
+        lines.append("  " + "  ".join(part for part in parts if part))
+    if work is not None:
+        if work["input_error"]:
+            lines.append(f"⚠️ Could not read the input: {work['input_error']}")
+        elif work["generate"] is not None:
+            generate = work["generate"]
+            lines.append(f"📐 {work['sequences']} sequences: {generate['added']} added, {generate['changed']} changed, "
+                         f"{generate['unchanged']} unchanged, {generate['removed']} removed")
+        if not work["input_error"]:
+            lines.append(f"📐 {work['renders']} of {work['scenes']} scenes to render ({work['cached']} in the render cache)")
+    return "\n".join(lines)
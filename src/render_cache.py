@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+@lru_cache(maxsize=1)
+def manim_version() -> str:
+    """Installed manim version, read from package metadata so manim itself is not imported"""
+    from importlib import metadata
+
+    try:
+        return metadata.version("manim")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class RenderCache:
+    """
+    Content-addressed store of rendered scene videos.
+
+    Entries are keyed by a hash of the scene source, the render quality and the
+    manim version. The index lives in <path>/index.json and the least recently
+    used videos are evicted once the cache grows past max_size_mb. The same store keeps
+    synthesized voice-over audio under its own folder and suffix.
+
+    Many processes may share one cache folder (render workers, job service jobs). Every
+    index change re-reads index.json under an exclusive lock on index.lock, so concurrent
+    writers merge their entries instead of overwriting each other. The parsed index is kept
+    in memory and read again only when the file's mtime, size or inode changes.
+    """
+
+    INDEX_FILE = "index.json"
+    LOCK_FILE = "index.lock"
+
+    def __init__(self, path=".render_cache", max_size_mb=2048, suffix=".mp4"):
+        self.path = Path(path)
+        self.suffix = suffix
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._entries = {}
+        self._refresh()
+
+    @staticmethod
+    def key(script: str, quality: str, version: str | None = None) -> str:
+        digest = hashlib.sha256()
+        for part in (script, quality, version or manim_version()):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def object_path(self, key: str) -> Path:
+        return self.path / "objects" / key[:2] / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Path | None:
+        """Cached video for key, or None. A hit marks the entry as recently used."""
+        if key not in self:
+            return None  # a miss needs no lock and no index write
+        with self._index() as entries:
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            video = self.object_path(key)
+            if not video.exists():
+                del entries[key]
+                return None
+            entry["last_used"] = time.time()
+            return video
+
+    def put(self, key: str, video: Path) -> Path:
+        """Copies a freshly rendered video into the cache"""
+        target = self.object_path(key)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        shutil.copyfile(video, tmp)
+        os.replace(tmp, target)
+
+        with self._index() as entries:
+            entries[key] = {"size": target.stat().st_size, "last_used": time.time()}
+            self._evict(entries)
+        return target
+
+    def size(self) -> int:
+        with self._lock:
+            return sum(entry["size"] for entry in self._refresh().values())
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._refresh()
+
+    @contextmanager
+    def _index(self):
+        """Yields the current index entries for changing; they are written back when the block ends"""
+        with self._lock:
+            self.path.mkdir(parents=True, exist_ok=True)
+            with open(self.path / self.LOCK_FILE, "a") as lock_file:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                # other processes may have changed the index since we last read it
+                entries = self._refresh()
+                try:
+                    yield entries
+                finally:
+                    self._save_index()
+
+    def _evict(self, entries: dict):
+        total = sum(entry["size"] for entry in entries.values())
+        by_age = sorted(entries.items(), key=lambda item: item[1]["last_used"])
+        for key, entry in by_age:
+            if total <= self.max_size:
+                break
+            self.object_path(key).unlink(missing_ok=True)
+            del entries[key]
+            total -= entry["size"]
+
+    def _refresh(self) -> dict:
+        """The index entries, parsed again only if index.json changed since it was last read or written"""
+        stamp = self._index_stamp()
+        if stamp != self._stamp:
+            self._entries = self._load_index()
+            self._stamp = stamp
+        return self._entries
+
+    def _index_stamp(self) -> tuple | None:
+        try:
+            stat = (self.path / self.INDEX_FILE).stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def _load_index(self) -> dict:
+        index = self.path / self.INDEX_FILE
+        if not index.exists():
+            return {}
+        try:
+            return json.loads(index.read_text(encoding="utf-8")).get("entries", {})
+        except (json.JSONDecodeError, OSError):
+            print(f"⚠️ Ignoring unreadable render cache index: {index}")
+            return {}
+
+    def _save_index(self):
+        self.path.mkdir(parents=True, exist_ok=True)
+        index = self.path / self.INDEX_FILE
+        # a name of our own: another process may be writing its index at the same moment
+        tmp = index.with_name(f"{self.INDEX_FILE}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps({"entries": self._entries}, indent=2), encoding="utf-8")
+        os.replace(tmp, index)
+        self._stamp = self._index_stamp()
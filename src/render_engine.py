@@ -0,0 +1,152 @@
+import importlib.util
+import multiprocessing
+import sys
+import threading
+import traceback
+import uuid
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+
+
+# manim's config names for the -q flags
+QUALITY_NAMES = {
+    "l": "low_quality", "m": "medium_quality", "h": "high_quality", "p": "production_quality", "k": "fourk_quality"
+}
+
+
+class EngineUnavailable(RuntimeError):
+    """The in-process engine cannot render this scene; the caller should fall back to a subprocess"""
+
+
+def _warm_up():
+    """Worker initializer: pay for the manim/numpy/cairo imports once per worker"""
+    import manim  # noqa: F401
+
+
+def _render_scene(py_file: str, scene_name: str, quality: str, media_dir: str) -> str | None:
+    """
+    Renders one scene inside a warm worker. Returns None on success or the traceback.
+    The scene module is loaded under a unique name and dropped afterwards, and all
+    settings live in a tempconfig, so nothing leaks into the next scene.
+    """
+    from manim import tempconfig
+
+    module_name = f"_manim_scene_{uuid.uuid4().hex}"
+    try:
+        spec = importlib.util.spec_from_file_location(module_name, py_file)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        settings = {
+            "quality": QUALITY_NAMES[quality],
+            "media_dir": media_dir,
+            "input_file": py_file,  # manim names the video folder after the input file
+            "scene_names": [scene_name],
+            "write_to_movie": True,
+        }
+        with tempconfig(settings):
+            spec.loader.exec_module(module)
+            getattr(module, scene_name)().render()
+        return None
+    except Exception:
+        return traceback.format_exc()
+    finally:
+        sys.modules.pop(module_name, None)
+
+
+class InProcessRenderEngine:
+    """
+    Renders scenes through manim's Python API on a pool of long-lived worker processes.
+
+    Each worker imports manim once, so scenes skip interpreter start-up and the
+    manim/numpy/cairo imports. A scene that raises only fails itself. If a worker
+    dies or a scene times out, the pool is restarted; scenes lost with a dead worker
+    raise EngineUnavailable so the caller can fall back to `manim render`.
+
+    A crash breaks the pool for every scene running on it, but it counts once towards
+    MAX_BROKEN_POOLS, and scenes lost to a restart after a timeout do not count at all.
+    """
+
+    # after this many worker pool crashes the engine disables itself
+    MAX_BROKEN_POOLS = 3
+
+    def __init__(self, max_workers: int, max_scenes_per_worker: int | None = None):
+        self.max_workers = max_workers
+        self.max_scenes_per_worker = max_scenes_per_worker
+        self._pool = None
+        self._lock = threading.Lock()
+        self._broken_pools = 0
+        self._recycled = weakref.WeakSet()  # pools shut down after a timeout rather than a crash
+        self.available = importlib.util.find_spec("manim") is not None
+
+    def render(self, py_file: Path, scene_name: str, quality: str, media_dir: Path, timeout=None) -> str | None:
+        """
+        Returns None on success or the scene's traceback.
+        Raises TimeoutError, or EngineUnavailable when the caller should fall back to a subprocess.
+        """
+        if not self.available:
+            raise EngineUnavailable("manim is not importable in this interpreter")
+
+        args = (_render_scene, str(py_file), scene_name, quality, str(media_dir))
+        pool = self._get_pool()
+        try:
+            try:
+                future = pool.submit(*args)
+            except RuntimeError:
+                # another thread shut this pool down while restarting it
+                pool = self._get_pool()
+                future = pool.submit(*args)
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            # a running task cannot be cancelled on its own: recycle the workers
+            self._restart(pool, recycled=True)
+            raise TimeoutError(f"timed out after {timeout}s")
+        except BrokenProcessPool as e:
+            # every scene on the pool sees the crash; only the thread that replaces the pool counts it
+            if self._restart(pool):
+                with self._lock:
+                    self._broken_pools += 1
+                    if self._broken_pools >= self.MAX_BROKEN_POOLS:
+                        self.available = False
+                        print("⚠️ In-process rendering keeps crashing; using manim subprocesses from now on")
+            elif pool in self._recycled:
+                raise EngineUnavailable("render workers were restarted after another scene timed out")
+            raise EngineUnavailable(f"render worker died: {e}")
+
+    def shutdown(self, cancel=False):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            if cancel:
+                self._terminate(pool)
+            pool.shutdown(wait=not cancel, cancel_futures=cancel)
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_up,
+                    max_tasks_per_child=self.max_scenes_per_worker,
+                )
+            return self._pool
+
+    def _restart(self, pool: ProcessPoolExecutor, recycled: bool = False) -> bool:
+        """Drops pool so the next render starts a new one; False if another thread already replaced it"""
+        with self._lock:
+            if self._pool is not pool:
+                return False
+            self._pool = None
+            if recycled:
+                self._recycled.add(pool)
+        self._terminate(pool)
+        pool.shutdown(wait=False, cancel_futures=True)
+        return True
+
+    @staticmethod
+    def _terminate(pool: ProcessPoolExecutor):
+        for process in list((pool._processes or {}).values()):
+            process.terminate()
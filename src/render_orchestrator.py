@@ -0,0 +1,244 @@
+import asyncio
+import re
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.instrumentation import stage
+from src.output_handler import RenderResult, VideoOutputHandler
+
+# tqdm progress lines as printed by manim, e.g.
+# "Animation 0: Create(Circle):  45%|####5     | 27/60 [00:00<00:00, 95.57it/s]"
+PROGRESS_LINE = re.compile(r"^(?P<label>.*?):\s*(?P<percent>\d{1,3})%\|")
+
+
+@dataclass
+class RenderEvent:
+    """
+    kind: "started", "percent", "retrying", "finished" or "failed".
+    percent events carry the progress of the current animation (label) in percent.
+    A failed render that will be retried emits "retrying" instead of "failed".
+    """
+    kind: str
+    scene: str
+    py_file: Path
+    percent: int | None = None
+    label: str | None = None
+    returncode: int | None = None
+    video: Path | None = None
+    cached: bool = False
+    resumed: bool = False
+    attempts: int = 1
+    message: str | None = None
+
+
+def parse_progress(line: str) -> tuple[str, int] | None:
+    """(animation label, percent) for a manim progress line, else None"""
+    match = PROGRESS_LINE.match(line.strip())
+    if match is None:
+        return None
+    return match["label"].strip(), int(match["percent"])
+
+
+class AsyncRenderOrchestrator:
+    """
+    Renders scenes with asyncio subprocesses and streams their progress.
+
+    At most `concurrency` manim processes run at once. Their stdout/stderr are read
+    as they are written and turned into RenderEvents, so callers can show live
+    progress or start other work without polling:
+
+        async for event in AsyncRenderOrchestrator(handler).events(py_files):
+            ...
+
+    Failed renders are retried like VideoOutputHandler.render does, after
+    handler.retry_backoff seconds, doubling each time. With a RunJournal, scenes the
+    journal has as rendered are skipped and every outcome is recorded.
+    """
+
+    # stderr lines kept for the message of a failed event
+    TAIL_LINES = 20
+
+    def __init__(self, handler: VideoOutputHandler, concurrency: int | None = None, journal=None):
+        self.handler = handler
+        self.concurrency = concurrency or handler.max_workers
+        self.journal = journal
+
+    async def events(self, py_files):
+        """Async iterator of RenderEvents; leaving it early kills the running renders"""
+        queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        tasks = [asyncio.create_task(self._render(Path(f), queue, semaphore)) for f in py_files]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                event = await queue.get()
+                if event is None:
+                    remaining -= 1
+                    continue
+                yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def render_all(self, py_files, on_event=None) -> list[RenderResult]:
+        """Renders every scene and returns results in py_files order; on_event sees every event"""
+        py_files = [Path(f) for f in py_files]
+        results = {f: RenderResult(py_file=f, scene=self.handler.scene_name(f)) for f in py_files}
+        async for event in self.events(py_files):
+            if on_event is not None:
+                on_event(event)
+            if event.kind in ("finished", "failed"):
+                result = results[event.py_file]
+                result.returncode, result.video, result.cached = event.returncode, event.video, event.cached
+                result.resumed, result.attempts = event.resumed, event.attempts
+                result.error = event.message if event.kind == "failed" else None
+        return [results[f] for f in py_files]
+
+    async def _render(self, py_file: Path, queue: asyncio.Queue, semaphore: asyncio.Semaphore):
+        try:
+            async with semaphore:
+                await self._run(py_file, queue)
+        finally:
+            queue.put_nowait(None)
+
+    async def _run(self, py_file: Path, queue: asyncio.Queue):
+        handler = self.handler
+        check = await asyncio.to_thread(handler.check, py_file)
+        scene = handler.scene_name(py_file)
+        result = RenderResult(py_file=py_file, scene=scene, video=handler.video_path(py_file, scene))
+        emit = lambda kind, **fields: queue.put_nowait(RenderEvent(kind, scene, py_file, **fields))
+        if check is not None and not check.ok:
+            emit("failed", message=f"invalid scene file: {check.error}")
+            return
+
+        if self.journal is not None and await asyncio.to_thread(self.journal.scene_done, py_file, result.video):
+            emit("started", resumed=True)
+            emit("finished", returncode=0, video=result.video, resumed=True)
+            return
+
+        with stage("render", scene=scene, py_file=str(py_file), quality=handler.quality) as record:
+            cache_key = await asyncio.to_thread(handler.cache_key, py_file)
+            if await asyncio.to_thread(handler.restore_cached, result, cache_key):
+                emit("started", cached=True)
+            else:
+                emit("started")
+                await self._attempt(result, emit)
+                for attempt in range(1, handler.retries + 1):
+                    if result.ok:
+                        break
+                    delay = handler.retry_backoff * 2 ** (attempt - 1)
+                    emit("retrying", returncode=result.returncode, attempts=attempt,
+                         message=f"retrying in {delay:g}s (attempt {attempt + 1} of {handler.retries + 1})")
+                    await asyncio.sleep(delay)
+                    await self._attempt(result, emit)
+                    result.attempts = attempt + 1
+                if result.ok and result.video.exists():
+                    handler.mark_rendered(result.video, cache_key)
+                    if cache_key is not None:
+                        try:
+                            await asyncio.to_thread(handler.cache.put, cache_key, result.video)
+                        except OSError as e:
+                            # the video is rendered; only a later run misses it in the cache
+                            print(f"⚠️ Could not cache the render of {py_file}: {e}")
+            record.update(exit_code=result.returncode, cached=result.cached, error=result.error,
+                          attempts=result.attempts)
+            if result.ok and result.video.exists():
+                record["output_bytes"] = result.video.stat().st_size
+
+        if self.journal is not None:
+            await asyncio.to_thread(self.journal.record_render, result)
+        if result.ok:
+            emit("finished", returncode=0, video=result.video, cached=result.cached, attempts=result.attempts)
+        else:
+            emit("failed", returncode=result.returncode, message=result.error, attempts=result.attempts)
+
+    async def _attempt(self, result: RenderResult, emit):
+        """Runs `manim render` once, emitting percent events; sets result.returncode and result.error"""
+        handler = self.handler
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *handler.command(result.py_file, result.scene),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except OSError as e:
+            result.returncode, result.error = None, str(e)
+            return
+
+        tail = deque(maxlen=self.TAIL_LINES)
+        last_progress = {}
+
+        def on_line(line: str):
+            progress = parse_progress(line)
+            if progress is None:
+                if line.strip():
+                    tail.append(line.rstrip())
+                return
+            label, percent = progress
+            if last_progress.get(label) != percent:
+                last_progress[label] = percent
+                emit("percent", label=label, percent=percent)
+
+        try:
+            readers = asyncio.gather(self._read_lines(process.stdout, on_line), self._read_lines(process.stderr, on_line))
+            await asyncio.wait_for(readers, timeout=handler.timeout)
+            returncode = await process.wait()
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            result.returncode, result.error = process.returncode, f"timed out after {handler.timeout}s"
+            return
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
+
+        result.returncode = returncode
+        result.error = None if returncode == 0 else "\n".join(tail) or f"manim exited with code {returncode}"
+
+    @staticmethod
+    async def _read_lines(stream: asyncio.StreamReader, on_line):
+        """tqdm redraws with carriage returns, so both \\r and \\n end a line"""
+        pending = ""
+        while chunk := await stream.read(4096):
+            pending += chunk.decode("utf-8", errors="replace")
+            *lines, pending = re.split(r"[\r\n]", pending)
+            for line in lines:
+                on_line(line)
+        if pending:
+            on_line(pending)
+
+
+def print_event(event: RenderEvent):
+    match event.kind:
+        case "started":
+            print(f"🎬 {event.scene}: started")
+        case "percent":
+            print(f"⏳ {event.scene}: {event.label} {event.percent}%")
+        case "retrying":
+            print(f"🔁 {event.scene}: failed, {event.message}")
+        case "finished":
+            done = "already rendered" if event.resumed else "reused cached render" if event.cached else "finished"
+            print(f"✅ {event.scene}: {done} → {event.video}")
+        case "failed":
+            print(f"❌ {event.scene}: failed ({event.message})")
+
+
+def render_with_progress(handler: VideoOutputHandler, manim_base_path: Path, journal=None) -> list[str]:
+    """
+    Blocking wrapper with live progress; returns the rendered .py files like VideoOutputHandler.save.
+    With a RunJournal, scenes it has as rendered are skipped and every outcome is recorded.
+    """
+    if not manim_base_path.exists():
+        raise FileNotFoundError(f"Manim folder not found: {manim_base_path}")
+    py_files = handler.scene_files(manim_base_path)
+    handler.validate_all(py_files)
+    orchestrator = AsyncRenderOrchestrator(handler, journal=journal)
+    results = asyncio.run(orchestrator.render_all(py_files, on_event=print_event))
+    resumed = sum(result.resumed for result in results)
+    if resumed:
+        print(f"♻️ Resuming: {resumed} scenes were already rendered")
+    return [str(result.py_file) for result in results if result.ok]
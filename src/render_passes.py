@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from src.output_handler import RenderResult, VideoOutputHandler, seq_number
+
+
+class RenderState:
+    """
+    Which source each scene was last rendered from, per quality.
+    Stored as <media_dir>/render_state.json:
+        {"scenes": {"ScriptSeq1": {"seq": 1, "hash": "...", "rendered": {"l": "<hash>", "h": "<hash>"}}}}
+    """
+
+    FILE_NAME = "render_state.json"
+
+    def __init__(self, media_dir: Path):
+        self.path = Path(media_dir) / self.FILE_NAME
+        self.scenes = self._load()
+
+    def is_current(self, scene: str, source_hash: str, quality: str) -> bool:
+        return self.scenes.get(scene, {}).get("rendered", {}).get(quality) == source_hash
+
+    def record(self, scene: str, seq: int, source_hash: str, quality: str):
+        entry = self.scenes.setdefault(scene, {"seq": seq, "hash": source_hash, "rendered": {}})
+        entry.update(seq=seq, hash=source_hash)
+        entry["rendered"][quality] = source_hash
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps({"scenes": self.scenes}, indent=2, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def _load(self) -> dict:
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8")).get("scenes", {})
+        except (json.JSONDecodeError, OSError):
+            print(f"⚠️ Ignoring unreadable render state: {self.path}")
+            return {}
+
+
+def load_approvals(path) -> set[int]:
+    """Approved script_seq numbers from a JSON list, e.g. [1, 3, 4]; a missing file approves nothing"""
+    if path is None or not Path(path).exists():
+        return set()
+    return {int(seq) for seq in json.loads(Path(path).read_text(encoding="utf-8"))}
+
+
+class MultiPassRenderer:
+    """
+    Renders fast previews of every scene first, then upgrades selected scenes to final quality.
+
+    Preview jobs are queued ahead of final jobs on one worker pool. A scene is upgraded
+    when it is approved, or when it already had a final render and its source changed
+    since (the stale final is replaced). With upgrade="all" every scene is upgraded.
+    Renders whose source is unchanged at a quality are skipped, and the render cache
+    (keyed by quality) avoids re-rendering anything rendered before.
+    """
+
+    def __init__(self, handler: VideoOutputHandler, preview="low", final="high", approvals=None, upgrade="approved"):
+        if upgrade not in ("approved", "all"):
+            raise ValueError(f"Unsupported upgrade policy: {upgrade}")
+        self.preview = handler.with_quality(preview)
+        self.final = handler.with_quality(final)
+        self.approvals = approvals
+        self.upgrade = upgrade
+        self.state = RenderState(handler.media_dir)
+
+    @classmethod
+    def from_config(cls, handler: VideoOutputHandler, passes_config: dict):
+        """passes_config: {"preview": "low", "final": "high", "approvals": "approvals.json", "upgrade": "approved"}"""
+        return cls(handler, preview=passes_config.get("preview", "low"), final=passes_config.get("final", "high"),
+                   approvals=passes_config.get("approvals"), upgrade=passes_config.get("upgrade", "approved"))
+
+    def save(self, manim_base_path: Path, journal=None) -> dict:
+        """
+        Returns {"previews": [...], "finals": [...], "final": {scene: quality}, "rendered": [...], "videos": {...}}
+        with the py_files rendered in each pass, every scene that is now final, and for each rendered
+        py_file its best current video: the final render if it is current, else the preview.
+        With a RunJournal, renders it has as done are skipped and every outcome is recorded.
+        """
+        if not manim_base_path.exists():
+            raise FileNotFoundError(f"Manim folder not found: {manim_base_path}")
+
+        py_files = self.preview.scene_files(manim_base_path)
+        jobs = self.plan(py_files)
+        results = self._render(jobs, journal)
+
+        report = {"previews": [], "finals": [], "final": {}, "rendered": [], "videos": {}}
+        for (handler, py_file, source_hash), result in zip(jobs, results):
+            if result.ok:
+                self.state.record(result.scene, seq_number(py_file), source_hash, handler.quality)
+                report["previews" if handler is self.preview else "finals"].append(str(py_file))
+        self.state.save()
+
+        for py_file in py_files:
+            scene = self.final.scene_name(py_file)
+            source_hash = self.source_hash(py_file)
+            if self.state.is_current(scene, source_hash, self.final.quality):
+                report["final"][scene] = self.final.quality
+            for handler in (self.final, self.preview):
+                if self._rendered(handler, py_file, scene, source_hash):
+                    report["rendered"].append(str(py_file))
+                    report["videos"][str(py_file)] = handler.video_path(py_file, scene)
+                    break
+        return report
+
+    def plan(self, py_files: list[Path]) -> list[tuple[VideoOutputHandler, Path, str]]:
+        """(handler, py_file, source_hash) jobs: every preview before any final render"""
+        approved = load_approvals(self.approvals)
+        previews, finals = [], []
+        for py_file in py_files:
+            scene = self.final.scene_name(py_file)
+            source_hash = self.source_hash(py_file)
+            if self._rendered(self.final, py_file, scene, source_hash):
+                continue
+
+            if not self._rendered(self.preview, py_file, scene, source_hash):
+                previews.append((self.preview, py_file, source_hash))
+            had_final = self.final.quality in self.state.scenes.get(scene, {}).get("rendered", {})
+            if self.upgrade == "all" or seq_number(py_file) in approved or had_final:
+                finals.append((self.final, py_file, source_hash))
+        return previews + finals
+
+    def _rendered(self, handler: VideoOutputHandler, py_file: Path, scene: str, source_hash: str) -> bool:
+        return (self.state.is_current(scene, source_hash, handler.quality)
+                and handler.video_path(py_file, scene).exists())
+
+    def _render(self, jobs, journal=None) -> list[RenderResult]:
+        renders = {handler: handler.render if journal is None else journal.render_with(handler)
+                   for handler in (self.preview, self.final)}
+        # jobs are taken in order as workers free up, so previews start before finals
+        return self.preview.render_stream(jobs, render=lambda job: renders[job[0]](job[1]))
+
+    @staticmethod
+    def source_hash(py_file: Path) -> str:
+        return hashlib.sha256(Path(py_file).read_bytes()).hexdigest()
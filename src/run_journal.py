@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+from src.output_handler import RenderResult
+
+
+def file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class RunJournal:
+    """
+    Append-only record of a pipeline run: parse, generation and every scene render.
+
+    Each event is one JSON line, flushed and fsynced as soon as it happens, so a run
+    that crashes or is killed still knows what finished. A truncated last line from
+    a crash is ignored. A fresh run starts a new journal; a resumed run appends to it.
+
+    Events: {"stage": "parse" | "generate" | "render" | "voice_over", "status": "done" | "failed", ...}
+    A voice_over event records a video rewritten in place by muxing its narration.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = Path(path)
+        self.run_id = uuid.uuid4().hex[:12]
+        self._lock = threading.Lock()
+        self.events = self._load() if resume else []
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if not resume:
+            self.path.write_text("", encoding="utf-8")
+        self._file = open(self.path, "a", encoding="utf-8")
+        self.record("run", status="started", resume=resume)
+
+    def record(self, stage: str, **fields):
+        event = {"run_id": self.run_id, "time": datetime.now(timezone.utc).isoformat(), "stage": stage, **fields}
+        line = json.dumps(event, ensure_ascii=False, default=str)
+        with self._lock:
+            self.events.append(event)
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def last(self, stage: str, **match) -> dict | None:
+        """Latest event of stage whose fields equal match"""
+        with self._lock:
+            for event in reversed(self.events):
+                if event["stage"] == stage and all(event.get(k) == v for k, v in match.items()):
+                    return event
+        return None
+
+    def generation_done(self, input_hash: str | None, manifest_path: Path) -> bool:
+        """Whether generation finished for this exact input and its manifest is still the one written"""
+        event = self.last("generate")
+        return (input_hash is not None and event is not None and event["status"] == "done"
+                and event.get("input_hash") == input_hash
+                and manifest_path.exists() and file_hash(manifest_path) == event.get("manifest_hash"))
+
+    def scene_done(self, py_file: Path, video: Path) -> bool:
+        """
+        Whether the scene was rendered to video from its current source and the video is intact,
+        either as rendered or as narrated afterwards
+        """
+        event = self.last("render", py_file=str(py_file), video=str(video))
+        return (event is not None and event["status"] == "done"
+                and Path(py_file).exists() and file_hash(py_file) == event.get("source_hash")
+                and video.exists() and video.stat().st_size in self._video_sizes(event))
+
+    def _video_sizes(self, render: dict) -> set:
+        """Sizes the rendered video may have: as rendered, or after any voice-over muxed in since"""
+        with self._lock:
+            later = self.events[next(i for i, e in enumerate(self.events) if e is render) + 1:]
+        return {render.get("video_bytes")} | {e.get("video_bytes") for e in later
+                                              if e["stage"] == "voice_over" and e.get("video") == render["video"]}
+
+    def record_render(self, result: RenderResult):
+        if result.ok:
+            self.record("render", status="done", py_file=str(result.py_file), scene=result.scene,
+                        source_hash=file_hash(result.py_file), video=str(result.video),
+                        video_bytes=result.video.stat().st_size if result.video.exists() else None,
+                        cached=result.cached, attempts=result.attempts)
+        else:
+            self.record("render", status="failed", py_file=str(result.py_file), scene=result.scene,
+                        video=str(result.video), returncode=result.returncode, error=result.error,
+                        attempts=result.attempts)
+
+    def record_voice_over(self, videos):
+        """Records the videos a voice-over rewrote, so a resumed run still knows them intact"""
+        for video in videos:
+            self.record("voice_over", status="done", video=str(video), video_bytes=Path(video).stat().st_size)
+
+    def render_with(self, handler):
+        """
+        Wraps handler.render for VideoOutputHandler.render_stream: scenes already rendered
+        from their current source are skipped, every other outcome is recorded.
+        """
+        def render(py_file) -> RenderResult:
+            py_file = Path(py_file)
+            scene = handler.scene_name(py_file)
+            video = handler.video_path(py_file, scene)
+            if self.scene_done(py_file, video):
+                return RenderResult(py_file=py_file, scene=scene, returncode=0, video=video, resumed=True)
+            result = handler.render(py_file)
+            self.record_render(result)
+            return result
+        return render
+
+    def close(self, status="finished"):
+        self.record("run", status=status)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close("finished" if exc_type is None else "failed")
+
+    def _load(self) -> list[dict]:
+        if not self.path.exists():
+            return []
+        content = self.path.read_text(encoding="utf-8")
+        complete = content[:content.rfind("\n") + 1]
+        if complete != content:
+            # drop a line cut short by a crash so new events start on a fresh line
+            self.path.write_text(complete, encoding="utf-8")
+        return [json.loads(line) for line in complete.splitlines() if line]
@@ -0,0 +1,77 @@
+import ast
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+
+# below this many files, parsing in one process beats starting a worker pool
+PARALLEL_THRESHOLD = 256
+
+
+@dataclass
+class SceneCheck:
+    """Outcome of statically checking one generated scene file"""
+    py_file: Path
+    scenes: list[str] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    @property
+    def scene(self) -> str | None:
+        """Scene to render: the Scene subclass named after the file if there is one, else the first found"""
+        stem = Path(self.py_file).stem
+        for name in (stem.capitalize(), stem.title().replace("_", "")):
+            if name in self.scenes:
+                return name
+        return self.scenes[0] if self.scenes else None
+
+
+def scene_classes(tree: ast.Module) -> list[str]:
+    """
+    Top-level classes deriving from a manim scene (Scene, MovingCameraScene, ThreeDScene, ...)
+    directly or through another scene class of the same module.
+    """
+    scenes = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and any(_is_scene_base(base, scenes) for base in node.bases):
+            scenes.append(node.name)
+    return scenes
+
+
+def _is_scene_base(base: ast.expr, local_scenes: list[str]) -> bool:
+    match base:
+        case ast.Name(id=name) | ast.Attribute(attr=name):
+            return name in local_scenes or name.endswith("Scene")
+    return False
+
+
+def check_scene_file(py_file) -> SceneCheck:
+    check = SceneCheck(py_file=Path(py_file))
+    try:
+        source = Path(py_file).read_text(encoding="utf-8")
+        tree = ast.parse(source, filename=str(py_file))
+    except SyntaxError as e:
+        check.error = f"{type(e).__name__}: {e.msg} (line {e.lineno})"
+        return check
+    except (OSError, UnicodeDecodeError, ValueError) as e:
+        check.error = str(e)
+        return check
+    check.scenes = scene_classes(tree)
+    if not check.scenes:
+        check.error = "no manim Scene subclass defined"
+    return check
+
+
+def check_scene_files(py_files: list, max_workers: int | None = None) -> list[SceneCheck]:
+    """Checks files in order; large projects are parsed on a process pool"""
+    max_workers = max_workers or os.cpu_count() or 1
+    if len(py_files) < PARALLEL_THRESHOLD or max_workers == 1:
+        return [check_scene_file(py_file) for py_file in py_files]
+    chunksize = max(1, len(py_files) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(check_scene_file, py_files, chunksize=chunksize))
@@ -0,0 +1,176 @@
+"""
+Typed sequence records shared by the parsers and output handlers.
+
+Every input format is normalized here to script_seq / script_for_manim / script_voice_over:
+  - mappings (JSON items, parsed copies) through Sequence.from_mapping
+  - tabular rows (CSV lines, DB tuples) through row_reader(columns), which resolves the
+    column positions once so no per-row dict is built
+Source fields without a canonical name are kept in Sequence.extra.
+"""
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+FIELDS = ("script_seq", "script_for_manim", "script_voice_over")
+_CANONICAL = frozenset(FIELDS)
+
+# source column -> canonical field
+ALIASES = {
+    "script_seq": "script_seq",
+    "seq": "script_seq",
+    "id": "script_seq",
+    "script_for_manim": "script_for_manim",
+    "script": "script_for_manim",
+    "script_voice_over": "script_voice_over",
+    "voice_over": "script_voice_over",
+}
+
+
+def seq_value(value):
+    """script_seq as an int when it is a number, e.g. "12" from a CSV column"""
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return value
+
+
+@dataclass(slots=True)
+class Sequence:
+    """One scene of the script"""
+    script_seq: int | str | None = None
+    script_for_manim: str = ""
+    script_voice_over: str = ""
+    extra: dict | None = None
+
+    def get(self, key: str, default=None):
+        """Dict-style read, for code written against the old row dicts"""
+        if key in FIELDS:
+            return getattr(self, key)
+        return self.extra.get(key, default) if self.extra else default
+
+    def to_dict(self) -> dict:
+        row = {"script_seq": self.script_seq, "script_for_manim": self.script_for_manim,
+               "script_voice_over": self.script_voice_over}
+        if self.extra:
+            row.update(self.extra)
+        return row
+
+    @classmethod
+    def from_mapping(cls, row: Mapping) -> "Sequence":
+        if not isinstance(row, Mapping):
+            raise ValueError(f"Invalid sequence: expected an object, got {type(row).__name__}")
+        if row.keys() <= _CANONICAL:
+            return cls(seq_value(row.get("script_seq")), row.get("script_for_manim", ""), row.get("script_voice_over", ""))
+        values = {}
+        extra = None
+        for key, value in row.items():
+            field = ALIASES.get(key)
+            # a canonical column wins over its aliases; the losers are kept as extra fields
+            if field is None or field in values or (field != key and field in row):
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+            else:
+                values[field] = value
+        return cls(
+            seq_value(values.get("script_seq")),
+            values.get("script_for_manim", ""),
+            values.get("script_voice_over", ""),
+            extra,
+        )
+
+
+def row_reader(columns: list[str]):
+    """
+    Returns a function building a Sequence from a row tuple with these columns.
+    Missing trailing values (short CSV lines) read as absent.
+    """
+    positions = {}
+    extras = []
+    for i, column in enumerate(columns):
+        field = ALIASES.get(column)
+        if field is None or field in positions or (field != column and field in columns):
+            extras.append((i, column))
+        else:
+            positions[field] = i
+    seq_i, script_i, voice_i = (positions.get(field, -1) for field in FIELDS)
+
+    def read(row) -> Sequence:
+        n = len(row)
+        extra = {column: row[i] for i, column in extras if i < n} if extras else None
+        return Sequence(
+            seq_value(row[seq_i]) if 0 <= seq_i < n else None,
+            row[script_i] if 0 <= script_i < n and row[script_i] is not None else "",
+            row[voice_i] if 0 <= voice_i < n and row[voice_i] is not None else "",
+            extra or None,
+        )
+
+    return read
+
+
+def normalize(rows):
+    """Yields a Sequence for each row; rows may be Sequences, mappings or a SequenceBatch"""
+    for row in rows:
+        yield row if isinstance(row, Sequence) else Sequence.from_mapping(row)
+
+
+def as_dict(seq) -> dict:
+    """Row dict for writers that serialize sequences (JSON, Arrow, DB columns)"""
+    return seq.to_dict() if isinstance(seq, Sequence) else seq
+
+
+class SequenceBatch:
+    """
+    Column store for many sequences: three lists instead of one object per row.
+    Indexing and iteration build Sequence records on demand.
+    """
+
+    __slots__ = ("_seqs", "_scripts", "_voice_overs", "_extra")
+
+    def __init__(self, sequences=()):
+        self._seqs = []
+        self._scripts = []
+        self._voice_overs = []
+        self._extra = {}  # row index -> extra fields, only for rows that have any
+        self.extend(sequences)
+
+    @classmethod
+    def from_rows(cls, columns: list[str], rows) -> "SequenceBatch":
+        """Batch of tabular rows (DB tuples, CSV lines) with the given columns"""
+        read = row_reader(columns)
+        return cls(read(row) for row in rows)
+
+    def append(self, seq: Sequence):
+        if seq.extra:
+            self._extra[len(self._seqs)] = seq.extra
+        self._seqs.append(seq.script_seq)
+        self._scripts.append(seq.script_for_manim)
+        self._voice_overs.append(seq.script_voice_over)
+
+    def extend(self, sequences):
+        for seq in normalize(sequences):
+            self.append(seq)
+
+    def __len__(self):
+        return len(self._seqs)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._row(i) for i in range(*item.indices(len(self)))]
+        if item < 0:
+            item += len(self)
+        if not 0 <= item < len(self):
+            raise IndexError("sequence index out of range")
+        return self._row(item)
+
+    def __iter__(self):
+        extra = self._extra
+        for i, row in enumerate(zip(self._seqs, self._scripts, self._voice_overs)):
+            yield Sequence(*row, extra.get(i) if extra else None)
+
+    def _row(self, i: int) -> Sequence:
+        return Sequence(self._seqs[i], self._scripts[i], self._voice_overs[i], self._extra.get(i))
+
+    def to_dicts(self) -> list[dict]:
+        return [seq.to_dict() for seq in self]
+
+    def __repr__(self):
+        return f"SequenceBatch({len(self)} sequences)"
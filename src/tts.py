@@ -0,0 +1,99 @@
+"""
+Offline text-to-speech engines for the voice-over handler.
+
+    "espeak": espeak-ng / espeak on PATH, writes WAV
+    "stub":   silent WAV as long as the text would take to read; no dependencies
+    "package.module:ClassName": any TTSEngine subclass
+
+Engines are built from config["engine"] and config["engine_options"] by engine_from_config.
+"""
+import hashlib
+import importlib
+import json
+import shutil
+import subprocess
+import wave
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+
+class TTSUnavailable(RuntimeError):
+    """The engine's program or library is not installed"""
+
+
+class TTSEngine(ABC):
+    name = ""
+    suffix = ".wav"
+
+    def settings(self) -> dict:
+        """Everything besides the text that changes the audio; part of the cache key"""
+        return {}
+
+    def key(self, text: str) -> str:
+        payload = json.dumps({"engine": self.name, "settings": self.settings(), "text": text}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @abstractmethod
+    def synthesize(self, text: str, output: Path):
+        """Writes the spoken text to output"""
+
+
+class EspeakEngine(TTSEngine):
+    name = "espeak"
+
+    def __init__(self, voice: str = "en", speed: int = 175, pitch: int = 50, executable: str | None = None):
+        self.voice = voice
+        self.speed = speed
+        self.pitch = pitch
+        self.executable = executable or shutil.which("espeak-ng") or shutil.which("espeak")
+
+    def settings(self) -> dict:
+        return {"voice": self.voice, "speed": self.speed, "pitch": self.pitch}
+
+    def synthesize(self, text: str, output: Path):
+        if self.executable is None:
+            raise TTSUnavailable("voice_over engine \"espeak\" needs espeak-ng or espeak on PATH")
+        cmd = [self.executable, "-v", self.voice, "-s", str(self.speed), "-p", str(self.pitch),
+               "-w", str(output), "--stdin"]
+        completed = subprocess.run(cmd, input=text, capture_output=True, text=True)
+        if completed.returncode != 0:
+            raise RuntimeError(f"espeak failed: {completed.stderr.strip()}")
+
+
+class StubEngine(TTSEngine):
+    """Silence at the length of the narration, for previews and machines without a TTS engine"""
+    name = "stub"
+
+    def __init__(self, words_per_minute: int = 160, sample_rate: int = 8000):
+        self.words_per_minute = words_per_minute
+        self.sample_rate = sample_rate
+
+    def settings(self) -> dict:
+        return {"words_per_minute": self.words_per_minute, "sample_rate": self.sample_rate}
+
+    def duration(self, text: str) -> float:
+        return max(0.5, len(text.split()) * 60 / self.words_per_minute)
+
+    def synthesize(self, text: str, output: Path):
+        frames = round(self.duration(text) * self.sample_rate)
+        with wave.open(str(output), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(b"\0\0" * frames)
+
+
+ENGINES = {"espeak": EspeakEngine, "stub": StubEngine}
+
+
+def engine_from_config(config: dict) -> TTSEngine:
+    """config: {"engine": "espeak" | "stub" | "module:Class", "engine_options": {...}}"""
+    name = config.get("engine", "espeak")
+    if name in ENGINES:
+        engine_cls = ENGINES[name]
+    elif ":" in name:
+        module, class_name = name.split(":")
+        engine_cls = getattr(importlib.import_module(module), class_name)
+    else:
+        raise ValueError(f"Unknown voice_over engine: {name} (expected {', '.join(ENGINES)} or module:Class)")
+    return engine_cls(**config.get("engine_options", {}))
@@ -0,0 +1,208 @@
+"""
+Re-renders only the scenes touched by an edit, for as long as it runs.
+
+    python -m src.watch --config config.json
+
+Watches the local input file and the script_seqN.py / .txt files under
+input/manim_files/<base_name>. A burst of saves is handled once it has been quiet for
+--debounce seconds:
+
+    input file changed   → regenerate; the manifest diff names the added/changed sequences
+    script_seqN.py edited → render that scene
+    script_seqN.txt edited → narrate that scene again (with a voice_over config) and
+                             retitle its concat chapter
+
+Only those scenes are rendered, on one video handler kept for the whole session, so with
+video_output.engine "inprocess" (the default here) manim stays imported in warm workers
+between edits. Voice-over and concat then run over every rendered scene; both skip
+unchanged scenes on their own.
+"""
+import argparse
+import hashlib
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from src.config_loader import ConfigError, ConfigLoader
+from src.instrumentation import Instrumentation, set_instrumentation
+from src.pipeline import PipelineContext, rerender, run_pipeline
+from src.plan import compile_plan
+
+
+@dataclass
+class Changes:
+    """What a debounced burst of file events touched"""
+    input_changed: bool = False
+    scenes: set[Path] = field(default_factory=set)  # edited script_seqN.py files
+    # a script_seqN.txt was edited; voice-over and concat find which scenes on their own
+    narration_changed: bool = False
+
+    def __bool__(self):
+        return self.input_changed or bool(self.scenes) or self.narration_changed
+
+
+class Watcher:
+    """
+    Polls file stats every interval seconds. A file counts as changed when its
+    (mtime, size) moved and its content hash differs from the last one seen, so saving
+    a file without editing it renders nothing.
+    """
+
+    def __init__(self, config: dict, context: PipelineContext | None = None, interval: float = 0.5,
+                 debounce: float = 0.3):
+        self.config = config
+        self.context = context or PipelineContext()
+        self.interval = interval
+        self.debounce = debounce
+        # validated and resolved once for the whole session
+        self.plan = compile_plan(config)
+        self.base_path = self.plan.manim_dir
+        self.input_file = self.plan.input_file
+        # one handler for the whole session keeps its render workers warm
+        self.video_handler = self.context.output_handler(config["video_output"])
+        self._stop = threading.Event()
+        self._stats = {}
+        self._hashes = {}
+
+    def snapshot(self) -> dict[str, tuple[int, int]]:
+        """str(path) -> (mtime_ns, size) of every watched file"""
+        files = list(self.base_path.glob("script_seq*/script_seq*.py"))
+        files += self.base_path.glob("script_seq*/script_seq*.txt")
+        if self.input_file is not None:
+            files.append(self.input_file)
+        stats = {}
+        for path in files:
+            try:
+                stat = path.stat()
+            except OSError:
+                continue  # deleted between the glob and the stat
+            stats[str(path)] = (stat.st_mtime_ns, stat.st_size)
+        return stats
+
+    def rebaseline(self):
+        """Takes the current files as seen, e.g. after writing them ourselves"""
+        self.changes(self.snapshot())
+
+    def changes(self, stats: dict) -> Changes:
+        """Compares stats with the baseline, confirming each moved file by its content hash"""
+        changes = Changes()
+        for name, stat in stats.items():
+            if self._stats.get(name) == stat:
+                continue
+            path = Path(name)
+            try:
+                digest = hashlib.sha256(path.read_bytes()).hexdigest()
+            except OSError:
+                continue
+            if self._hashes.get(name) == digest:
+                continue
+            self._hashes[name] = digest
+            if self.input_file is not None and path == self.input_file:
+                changes.input_changed = True
+            elif path.suffix == ".py":
+                changes.scenes.add(path)
+            else:
+                changes.narration_changed = True
+        for name in self._stats.keys() - stats.keys():
+            self._hashes.pop(name, None)
+        self._stats = stats
+        return changes
+
+    def wait_for_changes(self) -> Changes | None:
+        """Blocks until files changed and then stayed quiet for debounce seconds; None once stopped"""
+        while not self._stop.is_set():
+            stats = self.snapshot()
+            if stats == self._stats:
+                self._stop.wait(self.interval)
+                continue
+            quiet_since = time.monotonic()
+            while time.monotonic() - quiet_since < self.debounce:
+                if self._stop.wait(min(self.interval, self.debounce)):
+                    return None
+                latest = self.snapshot()
+                if latest != stats:
+                    stats, quiet_since = latest, time.monotonic()
+            changes = self.changes(stats)
+            if changes:
+                return changes
+        return None
+
+    def apply(self, changes: Changes) -> dict:
+        """
+        Regenerates, renders and narrates what changed.
+        Returns {"generated", "rendered", "failed", "voice_over", "concat", "seconds"}; "generated"
+        is the manifest diff, or None when the input did not change.
+        """
+        start = time.perf_counter()
+        # our own writes during regeneration are not edits
+        result = rerender(self.config, self.context, self.video_handler, changes.scenes,
+                          regenerate=changes.input_changed, on_generated=self.rebaseline)
+        result["seconds"] = round(time.perf_counter() - start, 3)
+        print(f"👀 Re-rendered {len(result['rendered'])} scene(s), {len(result['failed'])} failed, "
+              f"in {result['seconds']:.2f}s")
+        return result
+
+    def run(self, initial: bool = True, max_rounds: int | None = None) -> list[dict]:
+        """
+        With initial=True first brings everything up to date with a normal pipeline run,
+        then handles changes until stop() or max_rounds. Returns the result of each round.
+        """
+        rounds = []
+        try:
+            if initial:
+                run_pipeline(self.config, self.context)
+            self.rebaseline()
+            print(f"👀 Watching {self.input_file or 'the database input'} and {self.base_path}")
+            while max_rounds is None or len(rounds) < max_rounds:
+                changes = self.wait_for_changes()
+                if changes is None:
+                    break
+                try:
+                    rounds.append(self.apply(changes))
+                except Exception as e:
+                    # a broken edit must not end the session
+                    print(f"❌ Watch round failed: {e}")
+                    rounds.append({"error": repr(e)})
+        finally:
+            self.video_handler.close()
+        return rounds
+
+    def stop(self):
+        self._stop.set()
+
+
+def watch_config(config: dict) -> dict:
+    """Renders on warm in-process workers unless the config picks an engine or asks for live progress"""
+    config = dict(config)
+    if not config["video_output"].get("progress"):
+        config["video_output"] = {"engine": "inprocess", **config["video_output"]}
+    return config
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", type=Path, default=Path("config.json"))
+    parser.add_argument("--interval", type=float, default=0.5, help="seconds between file polls")
+    parser.add_argument("--debounce", type=float, default=0.3,
+                        help="seconds files must stay unchanged before a round starts")
+    parser.add_argument("--no-initial", action="store_true", help="skip the full pipeline run at start-up")
+    args = parser.parse_args(argv)
+
+    try:
+        config = ConfigLoader(args.config).load()
+    except ConfigError as e:
+        print(f"❌ {args.config}: {e}")
+        return 2
+    set_instrumentation(Instrumentation.from_config(config.get("metrics")))
+
+    watcher = Watcher(watch_config(config), interval=args.interval, debounce=args.debounce)
+    try:
+        watcher.run(initial=not args.no_initial)
+    except KeyboardInterrupt:
+        print("👋 Stopped watching")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
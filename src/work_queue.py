@@ -0,0 +1,230 @@
+"""
+SQLite work queue of render jobs shared by a coordinator and worker processes.
+
+A job is one generated scene file. Workers claim a queued job under a lease of
+lease_seconds and keep it alive with heartbeats; a job whose lease runs out (the worker
+died or hung) is put back in the queue, or failed once it has used max_attempts.
+Every claim, heartbeat and result is one short IMMEDIATE transaction, so any number of
+processes can share the database file.
+
+Workers on other machines reach the file over a shared folder, so the queue keeps SQLite's
+rollback journal (journal_mode=DELETE): WAL needs shared memory that only works on one host.
+The folder must still honour POSIX file locks; SQLite on a network file system without
+working locks (some NFS and SMB mounts) can corrupt the queue. Scene files and outputs are
+stored relative to the queue file's folder, so nodes may mount the shared folder anywhere.
+"""
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.run_journal import file_hash
+
+QUEUED, LEASED, DONE, FAILED = "queued", "leased", "done", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    py_file TEXT NOT NULL UNIQUE,
+    source_hash TEXT,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    worker TEXT,
+    lease_expires REAL,
+    output TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+
+@dataclass
+class RenderJob:
+    id: int
+    py_file: Path
+    status: str
+    attempts: int
+    max_attempts: int
+    worker: str | None = None
+    lease_expires: float | None = None
+    output: str | None = None
+    error: str | None = None
+
+
+class WorkQueue:
+    """
+    Render jobs in an SQLite file.
+    clock is time.time; tests pass a fake one to expire leases without waiting.
+    """
+
+    def __init__(self, path, lease_seconds: float = 60.0, max_attempts: int = 3, clock=time.time):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.clock = clock
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must stay on the thread that opened them
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path, journal_mode="DELETE")
+        return conn
+
+    def _stored(self, path) -> str:
+        """path as kept in the database: relative to the queue file's folder"""
+        return os.path.relpath(Path(path).resolve(), self.path.parent.resolve())
+
+    def _local_path(self, stored: str) -> Path:
+        return Path(os.path.normpath(self.path.parent.resolve() / stored))
+
+    def _transaction(self):
+        return Transaction(self._connection())
+
+    def enqueue(self, py_files) -> int:
+        """
+        Adds scene files as jobs and returns how many were (re)queued. A finished job is
+        queued again only if its file changed; failed jobs are always retried.
+        """
+        queued = 0
+        now = self.clock()
+        with self._transaction() as conn:
+            for py_file in py_files:
+                source_hash = file_hash(py_file)
+                py_file = self._stored(py_file)
+                row = conn.execute("SELECT status, source_hash FROM jobs WHERE py_file = ?", (py_file,)).fetchone()
+                if row is None:
+                    conn.execute(
+                        "INSERT INTO jobs (py_file, source_hash, status, max_attempts, updated_at) VALUES (?, ?, ?, ?, ?)",
+                        (py_file, source_hash, QUEUED, self.max_attempts, now),
+                    )
+                elif row["status"] == FAILED or (row["status"] == DONE and row["source_hash"] != source_hash):
+                    conn.execute(
+                        "UPDATE jobs SET source_hash = ?, status = ?, attempts = 0, max_attempts = ?, worker = NULL, "
+                        "lease_expires = NULL, output = NULL, error = NULL, updated_at = ? WHERE py_file = ?",
+                        (source_hash, QUEUED, self.max_attempts, now, py_file),
+                    )
+                else:
+                    continue
+                queued += 1
+        return queued
+
+    def claim(self, worker: str) -> RenderJob | None:
+        """Leases the oldest queued job to worker, after reclaiming expired leases"""
+        now = self.clock()
+        with self._transaction() as conn:
+            self._reclaim(conn, now)
+            row = conn.execute("SELECT id FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (QUEUED,)).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ? "
+                "WHERE id = ?",
+                (LEASED, worker, now + self.lease_seconds, now, row["id"]),
+            )
+            return self._job(conn, row["id"])
+
+    def heartbeat(self, job_id: int, worker: str) -> bool:
+        """Extends the lease; False when the worker no longer holds it"""
+        now = self.clock()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ?, updated_at = ? WHERE id = ? AND worker = ? AND status = ? "
+                "AND lease_expires >= ?",
+                (now + self.lease_seconds, now, job_id, worker, LEASED, now),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker: str, output: str) -> bool:
+        """Marks the job done; False when the lease was lost to another worker"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, output = ?, error = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (DONE, self._stored(output), self.clock(), job_id, worker, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str) -> bool:
+        """Queues the job again, or fails it for good once it used max_attempts"""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, worker = NULL, "
+                "lease_expires = NULL, error = ?, updated_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                (FAILED, QUEUED, error, self.clock(), job_id, worker, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    def reclaim_expired(self) -> int:
+        with self._transaction() as conn:
+            return self._reclaim(conn, self.clock())
+
+    def _reclaim(self, conn, now: float) -> int:
+        cursor = conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, "
+            "error = 'lease expired on ' || worker, worker = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE status = ? AND lease_expires < ?",
+            (FAILED, QUEUED, now, LEASED, now),
+        )
+        if cursor.rowcount:
+            print(f"♻️ Reclaimed {cursor.rowcount} render job(s) with an expired lease")
+        return cursor.rowcount
+
+    def counts(self) -> dict[str, int]:
+        counts = dict.fromkeys((QUEUED, LEASED, DONE, FAILED), 0)
+        for row in self._connection().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            counts[row[0]] = row[1]
+        return counts
+
+    def finished(self) -> bool:
+        """No job is queued or leased"""
+        counts = self.counts()
+        return counts[QUEUED] == 0 and counts[LEASED] == 0
+
+    def jobs(self) -> list[RenderJob]:
+        conn = self._connection()
+        return [self._job(conn, row[0]) for row in conn.execute("SELECT id FROM jobs ORDER BY id")]
+
+    def _job(self, conn, job_id: int) -> RenderJob:
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        output = str(self._local_path(row["output"])) if row["output"] is not None else None
+        return RenderJob(id=row["id"], py_file=self._local_path(row["py_file"]), status=row["status"],
+                         attempts=row["attempts"], max_attempts=row["max_attempts"], worker=row["worker"],
+                         lease_expires=row["lease_expires"], output=output, error=row["error"])
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def connect(path, journal_mode: str = "WAL") -> sqlite3.Connection:
+    """
+    Autocommit connection for a database shared by threads and processes; use with Transaction.
+    WAL suits processes of one host; databases shared across machines need journal_mode="DELETE".
+    """
+    conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA journal_mode={journal_mode}")
+    return conn
+
+
+class Transaction:
+    """BEGIN IMMEDIATE ... COMMIT, rolled back on error; the write lock is taken up front"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
@@ -0,0 +1,128 @@
+import os
+import sys
+import textwrap
+
+import pytest
+
+
+FAKE_MANIM = textwrap.dedent('''\
+    import sys, time
+    from pathlib import Path
+
+    args = sys.argv[1:]
+    py_file = Path(args[-2])
+    source = py_file.read_text(encoding="utf-8")
+    with open(Path(__file__).with_name("calls.log"), "a", encoding="utf-8") as log:
+        log.write(f"{py_file.stem} {' '.join(args)}\\n")
+
+    if "PROGRESS" in source:
+        for percent in (0, 50, 50, 100):
+            sys.stderr.write(f"Animation 0: Create(Circle): {percent:3d}%|##   | {percent // 50}/2 [00:00<00:00]\\r")
+            sys.stderr.flush()
+        sys.stderr.write("\\n")
+    if "SLEEP" in source:
+        time.sleep(float(source.split("SLEEP")[1].split()[0]))
+    if "FAIL" in source:
+        sys.exit(1)
+    if "FLAKY" in source and not py_file.with_suffix(".flaky").exists():
+        py_file.with_suffix(".flaky").touch()
+        sys.exit(1)
+
+    resolutions = {"l": "480p15", "m": "720p30", "h": "1080p60", "p": "1440p60", "k": "2160p60"}
+    quality = next(a[2:] for a in args if a.startswith("-q"))
+    media_dir = Path(args[args.index("--media_dir") + 1]) if "--media_dir" in args else Path("media")
+    video = media_dir / "videos" / py_file.stem / resolutions[quality] / f"{args[-1]}.mp4"
+    video.parent.mkdir(parents=True, exist_ok=True)
+    video.write_text(f"{quality}:{source}", encoding="utf-8")
+''')
+
+
+FAKE_FFMPEG = textwrap.dedent('''\
+    import sys
+    from pathlib import Path
+
+    tool, args = sys.argv[1], sys.argv[2:]
+    with open(Path(__file__).with_name("ffmpeg_calls.log"), "a", encoding="utf-8") as log:
+        log.write(f"{tool} {Path(args[-1]).name}\\n")
+
+    if tool == "ffprobe":
+        content = Path(args[-1]).read_text(encoding="utf-8")
+        print(float(content.split("DURATION")[1].split()[0]) if "DURATION" in content else 1.0)
+        sys.exit(0)
+
+    inputs = [args[i + 1] for i, arg in enumerate(args) if arg == "-i"]
+    if "concat" not in args:  # muxing an audio track into a video
+        video, audio = inputs
+        Path(args[-1]).write_text(Path(video).read_text(encoding="utf-8").split("\\naudio:")[0]
+                                  + f"\\naudio:{Path(audio).name}", encoding="utf-8")
+        sys.exit(0)
+    clips = [line[6:-1].replace("\'\\\\\'\'", "\'") for line in Path(inputs[0]).read_text(encoding="utf-8").splitlines()]
+    parts = [Path(clip).read_text(encoding="utf-8") for clip in clips]
+    if len(inputs) > 1:
+        parts.append(Path(inputs[1]).read_text(encoding="utf-8"))
+    Path(args[-1]).write_text("\\n".join(parts), encoding="utf-8")
+''')
+
+@pytest.fixture
+def fake_manim(tmp_path, monkeypatch):
+    """
+    Puts a fake `manim` executable first on PATH.
+    Scripts containing FAIL exit non-zero, FLAKY fails only the first time, SLEEP <seconds>
+    delays the render and PROGRESS prints tqdm-style progress lines to stderr.
+    Successful renders write "<quality>:<source>" to the MP4 path manim would use.
+    Every call is appended to bin/calls.log.
+    """
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir(exist_ok=True)
+    script = bin_dir / "fake_manim.py"
+    script.write_text(FAKE_MANIM, encoding="utf-8")
+
+    launcher = bin_dir / "manim"
+    launcher.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" "$@"\n', encoding="utf-8")
+    launcher.chmod(0o755)
+
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.chdir(tmp_path)  # keep the default media/ folder out of the repo
+    return bin_dir / "calls.log"
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    """
+    Puts fake `ffmpeg` and `ffprobe` executables first on PATH.
+    ffmpeg writes the listed clips joined by newlines, followed by the chapter metadata if given.
+    Muxing (no concat demuxer) writes the video followed by "audio:<audio file name>".
+    ffprobe reports "DURATION <seconds>" found in a clip, else 1.0.
+    Every call is appended to bin/ffmpeg_calls.log.
+    """
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir(exist_ok=True)
+    script = bin_dir / "fake_ffmpeg.py"
+    script.write_text(FAKE_FFMPEG, encoding="utf-8")
+
+    for tool in ("ffmpeg", "ffprobe"):
+        launcher = bin_dir / tool
+        launcher.write_text(f'#!/bin/sh\nexec "{sys.executable}" "{script}" {tool} "$@"\n', encoding="utf-8")
+        launcher.chmod(0o755)
+
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    return bin_dir / "ffmpeg_calls.log"
+
+
+@pytest.fixture
+def make_scenes(tmp_path):
+    """
+    Creates script_seqN/script_seqN.py files under tmp_path/manim and returns the folder.
+    A source without a class gets a ScriptSeqN(Scene) class appended, so fake_manim markers
+    pass scene validation; scene_class=False writes the sources as given.
+    """
+    def _make(sources: dict[int, str], scene_class: bool = True):
+        base = tmp_path / "manim"
+        for seq, source in sources.items():
+            folder = base / f"script_seq{seq}"
+            folder.mkdir(parents=True, exist_ok=True)
+            if scene_class and "class " not in source:
+                source += f"\n\nclass ScriptSeq{seq}(Scene):\n    pass\n"
+            (folder / f"script_seq{seq}.py").write_text(source, encoding="utf-8")
+        return base
+    return _make
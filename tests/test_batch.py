@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+
+import pytest
+from src.batch import format_summary, main, projects_from_input_dir, run_batch
+from src.config_loader import ConfigError
+from src.pipeline import PipelineContext
+
+
+def base_config():
+    return {
+        "input": {"type": "local", "file_type": "json", "path": "data", "file": "sample.json"},
+        "parsed_copy": {"type": "local", "path": "input/parsed_file", "file": "parsed.json"},
+        "manim_output": {"type": "manim", "base_name": "script_data", "path": "input/manim_files", "regenerate": False},
+        "video_output": {"type": "video", "quality": "low", "cache": {"enabled": False}},
+    }
+
+
+@pytest.mark.integration
+def test_batch_runs_projects_with_separate_outputs(fake_manim, tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    for name in ("intro", "outro"):
+        (data / f"{name}.json").write_text(json.dumps([
+            {"script_seq": 1, "script_for_manim": f"{name} scene", "script_voice_over": "hi"},
+        ]), encoding="utf-8")
+    (data / "broken.json").write_text("{not json", encoding="utf-8")
+
+    context = PipelineContext()
+    results = run_batch(projects_from_input_dir(data, base_config()), context)
+
+    assert [(r["project"], r["status"]) for r in results] == [("broken", "error"), ("intro", "ok"), ("outro", "ok")]
+    for name in ("intro", "outro"):
+        assert Path(f"input/parsed_file/{name}.json").exists()
+        assert Path(f"input/manim_files/{name}/script_seq1/script_seq1.py").read_text().startswith(f'"""{name}')
+        assert Path(f"media/{name}/videos/script_seq1/480p15/ScriptSeq1.mp4").exists()
+
+    # one video handler is shared by every project
+    video_config = base_config()["video_output"]
+    assert context.output_handler(video_config) is context.output_handler(dict(video_config))
+
+    table = format_summary(results)
+    assert "intro" in table and "total" in table
+
+
+@pytest.mark.integration
+def test_invalid_configs_stop_the_batch_before_it_starts(fake_manim, tmp_path, capsys):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "sample.json").write_text(json.dumps([
+        {"script_seq": 1, "script_for_manim": "scene", "script_voice_over": "hi"},
+    ]), encoding="utf-8")
+    good = base_config()
+    good["manim_output"]["regenerate"] = True
+    bad = base_config()
+    bad["video_output"]["quality"] = "hgh"
+    bad["input"]["type"] = "lcoal"
+    configs = []
+    for name, config in (("good", good), ("bad", bad)):
+        configs.append(tmp_path / f"{name}.json")
+        configs[-1].write_text(json.dumps(config), encoding="utf-8")
+
+    assert main([str(path) for path in configs]) == 2
+    out = capsys.readouterr().out
+    assert "bad: video_output.quality: 'hgh'" in out and "bad: input.type: 'lcoal'" in out
+
+    with pytest.raises(ConfigError) as error:
+        run_batch([("good", good), ("bad", bad)])
+    assert len(error.value.problems) == 2
+    assert not fake_manim.exists() and not Path("input/parsed_file").exists()
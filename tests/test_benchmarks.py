@@ -0,0 +1,51 @@
+import csv
+import os
+import sqlite3
+
+import pytest
+from benchmarks.bench_pipeline import STAGES, compare, install_stub_manim, run_case
+from benchmarks.synthetic import parse_size, size_label, write_input
+
+
+@pytest.mark.unit
+def test_synthetic_inputs_are_deterministic(tmp_path):
+    path = write_input("csv", 50, tmp_path / "a")
+    assert path.read_bytes() == write_input("csv", 50, tmp_path / "b").read_bytes()
+    assert len(list(csv.DictReader(path.read_text(encoding="utf-8").splitlines()))) == 50
+
+    db = sqlite3.connect(write_input("db", 50, tmp_path))
+    assert db.execute("SELECT COUNT(*) FROM scripts").fetchone() == (50,)
+    db.close()
+
+    assert parse_size("100k") == 100_000 and parse_size("250") == 250
+    assert size_label(1_000_000) == "1m" and size_label(250) == "250"
+
+
+@pytest.mark.unit
+def test_compare_flags_growth_above_the_threshold():
+    previous = {"results": {"json/1k/parse": {"seconds": 0.1, "peak_bytes": 1000},
+                            "json/1k/input_load": {"seconds": 0.001, "peak_bytes": None}}}
+    current = {"results": {"json/1k/parse": {"seconds": 0.125, "peak_bytes": 1050},
+                           "json/1k/input_load": {"seconds": 0.003, "peak_bytes": 10},
+                           "csv/1k/parse": {"seconds": 1.0, "peak_bytes": 1}}}
+
+    changes = {(c["key"], c["metric"]): c for c in compare(current, previous, threshold=0.10)}
+
+    assert set(changes) == {("json/1k/parse", "seconds"), ("json/1k/parse", "peak_bytes"), ("json/1k/input_load", "seconds")}
+    assert changes["json/1k/parse", "seconds"]["regression"]
+    assert not changes["json/1k/parse", "peak_bytes"]["regression"]
+    assert not changes["json/1k/input_load", "seconds"]["regression"]  # below the timer noise floor
+
+
+@pytest.mark.integration
+@pytest.mark.parametrize("fmt", ["json", "db"])
+def test_run_case_times_every_stage(tmp_path, monkeypatch, fmt):
+    bin_dir = install_stub_manim(tmp_path / "bin")
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    results = run_case(fmt, 20, tmp_path, render_limit=2, workers=1)
+
+    assert list(results) == list(STAGES)
+    assert [results[stage]["items"] for stage in STAGES] == [20, 20, 20, 20, 2]
+    assert all(results[stage]["peak_bytes"] > 0 for stage in STAGES[:-1])
+    assert len(list((tmp_path / "run" / f"{fmt}_20" / "media" / "videos").glob("*/480p15/*.mp4"))) == 2
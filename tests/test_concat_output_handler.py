@@ -0,0 +1,125 @@
+import json
+from pathlib import Path
+
+import pytest
+from src.factories.output_handler_factory import OutputHandlerFactory
+from src.output_handler import ConcatOutputHandler, timecode
+from src.pipeline import PipelineContext, run_pipeline
+
+
+def make_clips(media_dir: Path, durations: dict[int, float]):
+    for seq, duration in durations.items():
+        video = media_dir / "videos" / f"script_seq{seq}" / "480p15" / f"ScriptSeq{seq}.mp4"
+        video.parent.mkdir(parents=True, exist_ok=True)
+        video.write_text(f"clip {seq} DURATION {duration}", encoding="utf-8")
+
+
+def ffmpeg_calls(log: Path) -> list[str]:
+    return log.read_text().splitlines() if log.exists() else []
+
+
+@pytest.mark.unit
+def test_timecode():
+    assert timecode(0) == "00:00:00.000"
+    assert timecode(3725.5) == "01:02:05.500"
+
+
+@pytest.mark.unit
+def test_concat_orders_by_script_seq_and_builds_chapters(fake_ffmpeg, tmp_path):
+    media = tmp_path / "media"
+    make_clips(media, {10: 1.5, 2: 2.0, 1: 0.5})
+    output = tmp_path / "out" / "video.mp4"
+
+    result = ConcatOutputHandler().save(media, {"type": "concat", "output": str(output)})
+
+    content = output.read_text(encoding="utf-8")
+    assert content.index("clip 1 ") < content.index("clip 2 ") < content.index("clip 10 ")
+    assert "[CHAPTER]\nTIMEBASE=1/1000\nSTART=500\nEND=2500\ntitle=Scene 2" in content
+    chapters = json.loads(output.with_suffix(".chapters.json").read_text(encoding="utf-8"))
+    assert [(c["seq"], c["start"], c["end"], c["timecode"]) for c in chapters] == [
+        (1, 0.0, 0.5, "00:00:00.000"), (2, 0.5, 2.5, "00:00:00.500"), (10, 2.5, 4.0, "00:00:02.500"),
+    ]
+    assert result["chapters"] == chapters and not result["skipped"]
+
+
+@pytest.mark.unit
+def test_concat_is_incremental(fake_ffmpeg, tmp_path):
+    media = tmp_path / "media"
+    make_clips(media, {seq: 1.0 for seq in range(1, 6)})
+    config = {"type": "concat", "output": str(tmp_path / "video.mp4")}
+    handler = ConcatOutputHandler(segment_size=2)
+
+    first = handler.save(media, config)
+    assert first["rebuilt_segments"] == ["segment_0000.mp4", "segment_0001.mp4", "segment_0002.mp4"]
+    fake_ffmpeg.unlink()
+
+    # clips written again with the same bytes, e.g. restored from the render cache, are unchanged
+    make_clips(media, {1: 1.0, 4: 1.0})
+    second = handler.save(media, config)
+    assert second["skipped"] and second["rebuilt_segments"] == []
+    assert ffmpeg_calls(fake_ffmpeg) == []
+
+    make_clips(media, {3: 4.0})
+    third = handler.save(media, config)
+    assert third["rebuilt_segments"] == ["segment_0001.mp4"]
+    assert ffmpeg_calls(fake_ffmpeg) == ["ffprobe ScriptSeq3.mp4", "ffmpeg .segment_0001.tmp.mp4",
+                                         "ffmpeg .video.tmp.mp4"]
+    assert third["chapters"][-1]["end"] == 8.0
+
+
+@pytest.mark.unit
+def test_concat_reports_ffmpeg_errors(fake_ffmpeg, tmp_path):
+    media = tmp_path / "media"
+    make_clips(media, {1: 1.0})
+    handler = ConcatOutputHandler(ffprobe=str(tmp_path / "missing-ffprobe"))
+
+    with pytest.raises(OSError):
+        handler.save(media, {"type": "concat", "output": str(tmp_path / "video.mp4")})
+    with pytest.raises(ValueError):
+        ConcatOutputHandler().save([tmp_path / "nothing.mp4"], {"type": "concat"})
+
+
+@pytest.mark.integration
+def test_pipeline_concatenates_rendered_scenes(fake_manim, fake_ffmpeg, tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "input.json").write_text(json.dumps([
+        {"script_seq": seq, "script_for_manim": f"scene {seq}", "script_voice_over": f"Part {seq}\nmore"}
+        for seq in (1, 2)
+    ]), encoding="utf-8")
+    config = {
+        "input": {"type": "local", "file_type": "json", "path": "data", "file": "input.json"},
+        "parsed_copy": {"type": "local", "path": "parsed", "file": "parsed.json"},
+        "manim_output": {"type": "manim", "base_name": "project", "path": "input/manim_files"},
+        "video_output": {"type": "video", "quality": "low", "cache": {"enabled": False}},
+        "concat_output": {"type": "concat", "output": "output/project.mp4"},
+    }
+
+    result = run_pipeline(config, PipelineContext())
+
+    assert isinstance(OutputHandlerFactory.get_handler(config["concat_output"]), ConcatOutputHandler)
+    assert [c["title"] for c in result["concat"]["chapters"]] == ["Part 1", "Part 2"]
+    video = Path("output/project.mp4").read_text(encoding="utf-8")
+    assert video.startswith('l:"""scene 1"""') and video.index("class ScriptSeq1") < video.index('l:"""scene 2"""')
+
+
+@pytest.mark.integration
+def test_rerun_with_the_render_cache_runs_no_ffmpeg(fake_manim, fake_ffmpeg, tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "input.json").write_text(json.dumps([
+        {"script_seq": seq, "script_for_manim": f"scene {seq}", "script_voice_over": f"Part {seq}"} for seq in (1, 2, 3)
+    ]), encoding="utf-8")
+    config = {
+        "input": {"type": "local", "file_type": "json", "path": "data", "file": "input.json"},
+        "parsed_copy": {"type": "local", "path": "parsed", "file": "parsed.json"},
+        "manim_output": {"type": "manim", "base_name": "project", "path": "input/manim_files"},
+        "video_output": {"type": "video", "quality": "low", "cache": {"path": str(tmp_path / ".render_cache")}},
+        "concat_output": {"type": "concat", "output": "output/project.mp4", "segment_size": 2},
+        "journal": {"enabled": False},
+    }
+    run_pipeline(config, PipelineContext())
+    fake_ffmpeg.unlink()
+
+    result = run_pipeline(config, PipelineContext())
+
+    assert result["concat"]["skipped"] and result["concat"]["rebuilt_segments"] == []
+    assert ffmpeg_calls(fake_ffmpeg) == []
@@ -0,0 +1,94 @@
+import sqlite3
+
+import pytest
+from src.db import ConnectionPool
+from src.output_handler import DatabaseOutputHandler
+
+
+def rows(n, text="scene"):
+    return [{"script_seq": i, "script_for_manim": f"{text} {i}"} for i in range(1, n + 1)]
+
+
+class CountingConnection:
+    """sqlite3 connection that counts commits"""
+
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:")
+        self.commits = 0
+
+    def cursor(self, *args, **kwargs):
+        return self.conn.cursor(*args, **kwargs)
+
+    def commit(self):
+        self.commits += 1
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+    def execute(self, query):
+        return self.conn.execute(query)
+
+
+@pytest.fixture
+def db():
+    conn = CountingConnection()
+    return conn, ConnectionPool(connect=lambda: conn, placeholder="?")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("method", ["values", "row"])
+def test_batched_insert_commits_per_batch(db, method):
+    conn, pool = db
+    handler = DatabaseOutputHandler(pool)
+
+    result = handler.save({"sequences": rows(7)}, {"table": "scripts", "batch_size": 3, "method": method})
+
+    assert result == "Saved 7 records to Postgres table scripts"
+    assert conn.execute("SELECT COUNT(*) FROM scripts").fetchone() == (7,)
+    assert conn.commits == 1 + 3  # CREATE TABLE, then one transaction per batch
+
+
+@pytest.mark.unit
+def test_upsert_on_script_seq(db):
+    conn, pool = db
+    handler = DatabaseOutputHandler(pool)
+    config = {"table": "scripts", "upsert": True}
+
+    handler.save(rows(3), config)
+    handler.save(rows(2, text="edited"), config)
+
+    assert conn.execute("SELECT script_for_manim FROM scripts ORDER BY script_seq").fetchall() == [
+        ("edited 1",), ("edited 2",), ("scene 3",)
+    ]
+
+
+@pytest.mark.unit
+def test_write_through_streams_rows(db):
+    conn, pool = db
+    handler = DatabaseOutputHandler(pool)
+
+    passed = list(handler.write_through(iter(rows(5)), {"table": "scripts", "batch_size": 2}))
+
+    assert passed == rows(5)
+    assert conn.execute("SELECT COUNT(*) FROM scripts").fetchone() == (5,)
+
+
+@pytest.mark.unit
+def test_pool_reuses_connections():
+    opened = []
+    pool = ConnectionPool(connect=lambda: opened.append(sqlite3.connect(":memory:")) or opened[-1])
+
+    for _ in range(3):
+        with pool.connection():
+            pass
+
+    assert len(opened) == 1
+
+
+@pytest.mark.unit
+def test_copy_cannot_upsert():
+    with pytest.raises(ValueError):
+        DatabaseOutputHandler(ConnectionPool(connect=lambda: None)).save(rows(1), {
+            "table": "scripts", "method": "copy", "upsert": True
+        })
@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+import pytest
+from src.factories.input_handler_factory import InputHandlerFactory
+from src.factories.output_handler_factory import OutputHandlerFactory
+
+
+@pytest.mark.unit
+def test_local_run_does_not_import_db_drivers():
+    code = (
+        "import sys\n"
+        "from src.factories.input_handler_factory import InputHandlerFactory\n"
+        "from src.factories.output_handler_factory import OutputHandlerFactory\n"
+        "InputHandlerFactory.get_handler('local')\n"
+        "OutputHandlerFactory.get_handler({'type': 'manim'})\n"
+        "print(sorted(m for m in ('psycopg2', 'dotenv', 'src.render_cache') if m in sys.modules))\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
+
+
+@pytest.mark.unit
+def test_handlers_are_cached_per_config():
+    video = {"type": "video", "quality": "high", "cache": {"enabled": False}}
+
+    assert OutputHandlerFactory.get_handler(video) is OutputHandlerFactory.get_handler(dict(video))
+    assert OutputHandlerFactory.get_handler(video) is not OutputHandlerFactory.get_handler({**video, "quality": "low"})
+    assert InputHandlerFactory.get_handler("local") is InputHandlerFactory.get_handler("LOCAL")
+
+
+@pytest.mark.unit
+def test_render_cache_is_shared_by_path(tmp_path):
+    cache = {"path": str(tmp_path / "cache")}
+    low = OutputHandlerFactory.get_handler({"type": "video", "quality": "low", "cache": cache})
+    high = OutputHandlerFactory.get_handler({"type": "video", "quality": "high", "cache": cache})
+
+    assert low.cache is high.cache
+
+
+@pytest.mark.unit
+def test_unknown_types_are_rejected():
+    with pytest.raises(ValueError):
+        OutputHandlerFactory.get_handler({"type": "carrier-pigeon"})
+    with pytest.raises(ValueError):
+        InputHandlerFactory.get_handler("carrier-pigeon")
@@ -0,0 +1,89 @@
+import os
+
+import pytest
+import src.file_writer
+from src.file_writer import ConcurrentFileWriter, FileWriter, create_writer
+from src.generate_file import FileGenerator
+from src.output_handler import ManimOutputHandler
+
+
+def tree(path):
+    return {str(p.relative_to(path)): p.read_bytes() for p in sorted(path.rglob("*")) if p.is_file()}
+
+
+@pytest.mark.unit
+def test_concurrent_writer_is_byte_identical(tmp_path):
+    files = {f"script_seq{i}/script_seq{i}.py": f'"""scene {i} — é\n"""' for i in range(200)}
+
+    with FileWriter() as writer:
+        for name, content in files.items():
+            writer.write(tmp_path / "sequential" / name, content)
+    with ConcurrentFileWriter(max_workers=8) as writer:
+        for name, content in files.items():
+            writer.write(tmp_path / "concurrent" / name, content)
+
+    assert tree(tmp_path / "concurrent") == tree(tmp_path / "sequential")
+    assert not list((tmp_path / "concurrent").rglob("*.tmp"))
+
+
+@pytest.mark.unit
+def test_concurrent_writer_fsyncs_files_and_new_folders(tmp_path, monkeypatch):
+    fsynced, opened = [], {}
+    real_open = os.open
+
+    def open_folder(path, flags, *args):
+        fd = real_open(path, flags, *args)
+        opened[fd] = path
+        return fd
+
+    monkeypatch.setattr(src.file_writer.os, "open", open_folder)
+    monkeypatch.setattr(src.file_writer.os, "fsync", lambda fd: fsynced.append(opened.pop(fd, "file")))
+    with ConcurrentFileWriter(max_workers=2) as writer:
+        for name in ("a/one.py", "b/two.py", "b/three.py"):
+            writer.write(tmp_path / "base" / name, "x")
+
+    assert fsynced.count("file") == 3
+    assert {folder for folder in fsynced if folder != "file"} == \
+        {tmp_path, tmp_path / "base", tmp_path / "base" / "a", tmp_path / "base" / "b"}
+
+    fsynced.clear()
+    with ConcurrentFileWriter(fsync=False) as writer:
+        writer.write(tmp_path / "base" / "c" / "four.py", "x")
+    assert fsynced == []
+
+
+@pytest.mark.unit
+def test_concurrent_writer_reports_errors(tmp_path):
+    (tmp_path / "blocker").write_text("not a folder")
+    writer = ConcurrentFileWriter(max_workers=2)
+    writer.write(tmp_path / "blocker" / "file.py", "x")
+
+    with pytest.raises(OSError):
+        writer.close()
+
+
+@pytest.mark.unit
+def test_manim_output_handler_with_concurrent_writer(tmp_path):
+    sequences = [{"script_seq": i, "script_for_manim": f"s{i}", "script_voice_over": f"v{i}"} for i in range(50)]
+
+    ManimOutputHandler().save(sequences, {"base_name": "a", "base_output_path": str(tmp_path / "a")})
+    ManimOutputHandler().save(sequences, {"base_name": "a", "base_output_path": str(tmp_path / "b"), "writer": "concurrent"})
+
+    assert tree(tmp_path / "b") == tree(tmp_path / "a")
+
+
+@pytest.mark.unit
+def test_file_generator_can_reuse_concurrent_writer(tmp_path, monkeypatch):
+    monkeypatch.setattr(FileGenerator, "BASE_INPUT_PATH", tmp_path)
+    generator = FileGenerator(writer=ConcurrentFileWriter(max_workers=2))
+
+    first = generator.generate([{"script_seq": 1, "script_for_manim": "a"}], "one")
+    second = generator.generate([{"script_seq": 1, "script_for_manim": "b"}], "two")
+
+    assert len(first["py_files"]) == len(second["py_files"]) == 1
+
+
+@pytest.mark.unit
+def test_create_writer_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        create_writer({"writer": "carrier-pigeon"})
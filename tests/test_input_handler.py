@@ -1,7 +1,9 @@
 import pytest
 import json
 from pathlib import Path
+from src.db import ConnectionPool
 from src.input_handler import LocalFileInputHandler, CloudInputHandler, DatabaseInputHandler
+from src.sequence import Sequence
 
 
 # -----------------------------
@@ -81,3 +83,110 @@ def test_input_handler_from_config():
 
     assert isinstance(raw_data, str)
     assert raw_data.strip() != ""
+
+
+@pytest.mark.unit
+def test_localfileinputhandler_stream(tmp_path):
+    """
+    stream() yields the file in chunks that join back to load().
+    """
+    (tmp_path / "sample.json").write_text('[{"script_seq": 1}, {"script_seq": 2}]', encoding="utf-8")
+    config = {"path": str(tmp_path), "file": "sample.json", "chunk_size": 8}
+
+    handler = LocalFileInputHandler()
+    chunks = list(handler.stream(config))
+
+    assert all(len(chunk) <= 8 for chunk in chunks)
+    assert "".join(chunks) == handler.load(config)
+
+
+# -----------------------------
+# DATABASE TESTS (sqlite3 stand-in)
+# -----------------------------
+
+@pytest.fixture
+def scripts_db():
+    import sqlite3
+
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE scripts (script_seq INTEGER, script_for_manim TEXT, updated_at INTEGER)")
+    conn.executemany(
+        "INSERT INTO scripts VALUES (?, ?, ?)",
+        [(i, f"scene {i}", 100 + i) for i in range(1, 8)],
+    )
+    conn.commit()
+    return conn
+
+
+@pytest.mark.unit
+def test_db_input_handler_streams_batches(scripts_db):
+    handler = DatabaseInputHandler(ConnectionPool(connect=lambda: scripts_db, placeholder="?"))
+    batches = list(handler.stream({"table": "scripts", "fetch_size": 3, "order_by": "script_seq"}))
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert batches[0][0] == Sequence(1, "scene 1", extra={"updated_at": 101})
+
+
+@pytest.mark.unit
+def test_db_input_handler_projection_and_since_filter(scripts_db):
+    handler = DatabaseInputHandler(ConnectionPool(connect=lambda: scripts_db, placeholder="?"))
+    rows = handler.load({
+        "table": "scripts",
+        "columns": ["script_seq"],
+        "where": "script_seq <> 6",
+        "since_column": "updated_at",
+        "since": 104,
+    })
+
+    assert list(rows) == [Sequence(5), Sequence(7)]
+
+
+@pytest.mark.unit
+def test_db_input_handler_reuses_connection_and_named_cursor():
+    class FakeCursor:
+        description = [("script_seq",)]
+
+        def __init__(self, name=None):
+            self.name = name
+            self.rows = [(1,), (2,), (3,)]
+
+        def execute(self, query, params):
+            self.query = query
+
+        def fetchmany(self, size):
+            batch, self.rows = self.rows[:size], self.rows[size:]
+            return batch
+
+        def close(self):
+            pass
+
+    class FakeConnection:
+        closed = False
+
+        def __init__(self):
+            self.cursors = []
+
+        def cursor(self, name=None):
+            self.cursors.append(FakeCursor(name))
+            return self.cursors[-1]
+
+        def rollback(self):
+            pass
+
+    connections = []
+    pool = ConnectionPool(connect=lambda: connections.append(FakeConnection()) or connections[-1])
+    handler = DatabaseInputHandler(pool)
+
+    assert list(handler.load({"table": "scripts", "fetch_size": 2})) == [Sequence(i) for i in (1, 2, 3)]
+    handler.load({"table": "scripts"})
+
+    assert len(connections) == 1
+    cursor = connections[0].cursors[0]
+    assert cursor.name.startswith("script_rows_") and cursor.itersize == 2
+
+
+@pytest.mark.unit
+def test_db_input_handler_rejects_unsafe_identifiers():
+    handler = DatabaseInputHandler(ConnectionPool(connect=lambda: None))
+    with pytest.raises(ValueError):
+        handler.build_query({"table": "scripts; DROP TABLE scripts"})
@@ -0,0 +1,116 @@
+import asyncio
+import json
+
+import pytest
+from src.instrumentation import Instrumentation, JsonLinesSink, MemorySink, set_instrumentation, stage, timed
+from src.output_handler import VideoOutputHandler
+from src.render_orchestrator import render_with_progress
+
+
+@pytest.fixture
+def records():
+    sink = MemorySink()
+    previous = set_instrumentation(Instrumentation([sink]))
+    yield sink
+    set_instrumentation(previous)
+
+
+@pytest.mark.unit
+def test_stage_records_metrics(records):
+    with stage("work", project="demo") as record:
+        sum(range(10_000))
+        record["exit_code"] = 0
+
+    (entry,) = records
+    assert entry["stage"] == "work" and entry["project"] == "demo" and entry["status"] == "ok"
+    assert entry["exit_code"] == 0
+    for key in ("wall_s", "cpu_s", "children_cpu_s", "bytes_read", "bytes_written", "peak_rss_bytes", "run_id"):
+        assert key in entry
+
+
+@pytest.mark.unit
+def test_decorator_and_errors(records):
+    @timed("boom")
+    def boom():
+        raise RuntimeError("nope")
+
+    with pytest.raises(RuntimeError):
+        boom()
+
+    assert records[0]["stage"] == "boom"
+    assert records[0]["status"] == "error" and "nope" in records[0]["error"]
+
+
+@pytest.mark.unit
+def test_nested_iterables_report_exclusive_time(records, tmp_path):
+    metrics = Instrumentation([records])
+    source = tmp_path / "data.txt"
+    source.write_text("x" * 100_000)
+
+    def load():
+        with open(source, encoding="utf-8") as f:
+            while chunk := f.read(10_000):
+                yield chunk
+
+    chunks = metrics.iterate("load", load())
+    lengths = metrics.iterate("parse", (len(chunk) for chunk in chunks))
+    assert sum(lengths) == 100_000
+
+    load_record = next(r for r in records if r["stage"] == "load")
+    parse_record = next(r for r in records if r["stage"] == "parse")
+    assert load_record["items"] == parse_record["items"] == 10
+    assert load_record["bytes_read"] >= 100_000
+    assert parse_record["bytes_read"] < 100_000
+
+
+@pytest.mark.unit
+def test_render_records_exit_codes(records, fake_manim, make_scenes):
+    base = make_scenes({1: "", 2: "FAIL"})
+    VideoOutputHandler(max_workers=2).save(base)
+
+    renders = sorted((r for r in records if r["stage"] == "render"), key=lambda r: r["scene"])
+    assert [r["exit_code"] for r in renders] == [0, 1]
+    assert renders[0]["output_bytes"] > 0
+
+
+@pytest.mark.unit
+def test_concurrent_tasks_time_their_own_stages(records):
+    async def task(name: str, delay: float):
+        with stage(name):
+            await asyncio.sleep(delay)
+
+    async def main():
+        await asyncio.gather(task("slow", 0.2), task("fast", 0.05))
+
+    with stage("outer"):
+        asyncio.run(main())
+
+    by_stage = {r["stage"]: r for r in records}
+    assert by_stage["slow"]["wall_s"] >= 0.2 and by_stage["fast"]["wall_s"] < 0.2
+    # the tasks overlap, so neither is nested in the other or in outer
+    assert by_stage["outer"]["wall_s"] >= 0.2
+
+
+@pytest.mark.unit
+def test_progress_renders_record_stage_metrics(records, fake_manim, make_scenes):
+    base = make_scenes({1: "", 2: "FAIL"})
+    render_with_progress(VideoOutputHandler(max_workers=2), base)
+
+    renders = sorted((r for r in records if r["stage"] == "render"), key=lambda r: r["scene"])
+    assert [r["exit_code"] for r in renders] == [0, 1]
+    assert renders[0]["output_bytes"] > 0
+    assert all(r["children_cpu_s"] >= 0 and "cpu_s" in r and r["peak_rss_bytes"] for r in renders)
+
+
+@pytest.mark.unit
+def test_json_lines_sink(tmp_path):
+    path = tmp_path / "metrics" / "run.jsonl"
+    metrics = Instrumentation([JsonLinesSink(path)])
+    with metrics.stage("a"):
+        pass
+    with metrics.stage("b"):
+        pass
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["stage"] for line in lines] == ["a", "b"]
+    assert lines[0]["run_id"] == lines[1]["run_id"]
@@ -0,0 +1,136 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+from src.job_service import DONE, FAILED, QUEUED, RUNNING, JobRejected, JobService, JobStore, make_server
+
+
+def make_job(narration: str = "Hello", scene: str = "scene") -> dict:
+    return {
+        "input": {"type": "local", "file_type": "json", "path": "data", "file": "input.json"},
+        "parsed_copy": {"type": "local", "path": "parsed", "file": "parsed.json"},
+        "manim_output": {"type": "manim", "base_name": "job", "path": "input/manim_files"},
+        "video_output": {"type": "video", "quality": "low", "max_workers": 1},
+        "journal": {"enabled": False},
+        "input_data": [
+            {"script_seq": seq, "script_for_manim": f"{scene} {seq}", "script_voice_over": f"{narration} {seq}"}
+            for seq in (1, 2)
+        ],
+    }
+
+
+def wait_until_done(url: str):
+    deadline = time.monotonic() + 60
+    while {job["status"] for job in request(f"{url}/jobs")[1]} != {DONE}:
+        assert time.monotonic() < deadline, request(f"{url}/jobs")[1]
+        time.sleep(0.1)
+
+
+def request(url: str, body=None) -> tuple[int, object]:
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data, method="POST" if data else "GET")) as r:
+            return r.status, json.loads(r.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.unit
+def test_store_dedupes_and_recovers_interrupted_jobs(tmp_path):
+    store = JobStore(tmp_path / "jobs.sqlite")
+    job, created = store.submit(make_job())
+    assert created and job["status"] == QUEUED
+    assert store.submit(make_job()) == (job, False)
+    assert store.submit(make_job("Other"))[1]
+
+    assert store.claim()["id"] == job["id"]
+    assert store.get(job["id"])["status"] == RUNNING
+    # the service died while the job ran
+    assert JobService(tmp_path).store.get(job["id"])["status"] == QUEUED
+
+    store.claim()
+    store.finish(job["id"], 1, "boom")
+    assert store.get(job["id"])["status"] == FAILED
+    again, created = store.submit(make_job())
+    assert not created and again["status"] == QUEUED and again["error"] is None
+
+    service = JobService(tmp_path)
+    with pytest.raises(JobRejected):
+        service.submit({"input": {}})
+    with pytest.raises(JobRejected):
+        service.submit({key: value for key, value in make_job().items() if key != "input_data"})
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("section, key, value", [
+    ("input", "file", "../../escaped.json"),
+    ("input", "path", "/tmp"),
+    ("parsed_copy", "path", "parsed/../../.."),
+    ("manim_output", "base_name", "../../../elsewhere"),
+    ("video_output", "media_dir", "/var/media"),
+    ("concat_output", "output", "../video.mp4"),
+    ("journal", "path", "/tmp/journal.jsonl"),
+    ("video_output", "cache", {"path": "/somewhere/cache"}),
+])
+def test_paths_outside_the_job_folder_are_rejected(fake_ffmpeg, tmp_path, section, key, value):
+    job = make_job()
+    job.setdefault(section, {"type": "concat"})[key] = value
+    with pytest.raises(JobRejected, match="outside"):
+        JobService(tmp_path).submit(job)
+
+    job[section][key] = {"path": "shared/cache"} if key == "cache" else "inside/../fine"
+    assert JobService(tmp_path).submit(job)[1]
+
+
+@pytest.mark.integration
+def test_service_runs_jobs_and_reports_stages(fake_manim, tmp_path):
+    service = JobService(tmp_path / "service", workers=2, poll_interval=0.1)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    service.start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    try:
+        status, first = request(f"{url}/jobs", make_job())
+        assert status == 201 and not first["deduplicated"]
+        wait_until_done(url)
+
+        status, job = request(f"{url}/jobs/{first['id']}")
+        assert status == 200 and job["returncode"] == 0
+        assert {"input_load", "parse", "manim_generation", "video_render"} <= job["stages"].keys()
+        assert job["stages"]["video_render"]["count"] == 1
+        assert len(job["artifacts"]["videos"]) == 2 and all(Path(v).exists() for v in job["artifacts"]["videos"])
+        assert Path(job["artifacts"]["parsed_copy"]).exists()
+
+        # the identical submission is the same job and renders nothing
+        renders = len(fake_manim.read_text().splitlines())
+        status, duplicate = request(f"{url}/jobs", make_job())
+        assert status == 200 and duplicate == {"id": first["id"], "status": DONE, "deduplicated": True}
+        assert len(fake_manim.read_text().splitlines()) == renders == 2
+
+        # another narration is another job, but its scenes come from the shared render cache
+        status, other = request(f"{url}/jobs", make_job("Other"))
+        assert status == 201 and other["id"] != first["id"]
+        wait_until_done(url)
+        assert len(fake_manim.read_text().splitlines()) == 2
+        assert len(request(f"{url}/jobs/{other['id']}")[1]["artifacts"]["videos"]) == 2
+
+        # jobs running side by side share the cache without losing each other's entries
+        for scene in ("left", "right"):
+            assert request(f"{url}/jobs", make_job(scene=scene))[0] == 201
+        wait_until_done(url)
+        assert len(fake_manim.read_text().splitlines()) == 6
+        for scene in ("left", "right"):
+            assert request(f"{url}/jobs", make_job("Again", scene))[0] == 201
+        wait_until_done(url)
+        assert len(fake_manim.read_text().splitlines()) == 6
+
+        assert request(f"{url}/jobs", {"input": {}})[0] == 400
+        assert request(f"{url}/jobs/999")[0] == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+        service.stop()
@@ -0,0 +1,97 @@
+import ast
+import json
+
+import pytest
+from src.output_handler import LocalOutputHandler, ManimOutputHandler
+from src.parser import JSONParser
+from src.sequence import Sequence
+
+
+SEQUENCES = [
+    {"script_seq": 1, "script_for_manim": "Show a title card", "script_voice_over": "Welcome!"},
+    {"script_seq": 2, "script_for_manim": "Draw a circle", "script_voice_over": "This is a circle."},
+]
+
+
+@pytest.mark.unit
+def test_manim_output_handler_consumes_a_stream(tmp_path):
+    config = {"type": "manim", "base_name": "demo", "base_output_path": str(tmp_path)}
+
+    generated = ManimOutputHandler().save({"sequences": iter(SEQUENCES)}, config)
+
+    assert len(generated["py_files"]) == 2
+    txt = tmp_path / "manim_files" / "demo" / "script_seq2" / "script_seq2.txt"
+    assert txt.read_text(encoding="utf-8") == "This is a circle."
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("description", [
+    'Say """hi""" to the viewer',
+    'Ends with a quote "',
+    r"Escapes like \u00e9, \N{BULLET} and \x stay literal \\",
+    'Mixed \'quotes\' and "double" ones\nover two lines\\',
+])
+def test_generated_scene_keeps_any_description_as_its_docstring(description):
+    sequence = Sequence.from_mapping({"script_seq": 7, "script_for_manim": description, "script_voice_over": ""})
+    py_content, _ = ManimOutputHandler.contents(sequence)
+
+    module = ast.parse(py_content)
+    assert ast.get_docstring(module, clean=False) == description
+    assert [node.name for node in module.body if isinstance(node, ast.ClassDef)] == ["ScriptSeq7"]
+
+
+@pytest.mark.unit
+def test_parsed_copy_write_through_matches_save(tmp_path):
+    raw = json.dumps(SEQUENCES)
+    streamed_config = {"path": str(tmp_path), "file": "streamed.json"}
+    saved_config = {"path": str(tmp_path), "file": "saved.json"}
+
+    sequences = LocalOutputHandler().write_through(JSONParser().iter_parse([raw]), streamed_config)
+    generated = ManimOutputHandler().save(
+        {"sequences": sequences}, {"base_name": "demo", "base_output_path": str(tmp_path)}
+    )
+    LocalOutputHandler().save({"sequences": SEQUENCES}, saved_config)
+
+    assert len(generated["py_files"]) == 2
+    assert (tmp_path / "streamed.json").read_bytes() == (tmp_path / "saved.json").read_bytes()
+
+
+@pytest.mark.unit
+def test_manifest_only_rewrites_changed_sequences(tmp_path):
+    config = {"base_name": "demo", "base_output_path": str(tmp_path)}
+    base = tmp_path / "manim_files" / "demo"
+    handler = ManimOutputHandler()
+
+    first = handler.save({"sequences": SEQUENCES}, config)
+    untouched = base / "script_seq1" / "script_seq1.py"
+    mtime = untouched.stat().st_mtime_ns
+
+    edited = [
+        SEQUENCES[0],
+        {"script_seq": 3, "script_for_manim": "Label the circle", "script_voice_over": "A."},
+    ]
+    second = handler.save({"sequences": edited}, config)
+    assert untouched.stat().st_mtime_ns == mtime
+    edited[0] = {**SEQUENCES[0], "script_voice_over": "Hello again"}
+    third = handler.save({"sequences": edited}, config)
+
+    assert first["diff"] == {"added": [1, 2], "changed": [], "unchanged": [], "removed": []}
+    assert second["diff"] == {"added": [3], "changed": [], "unchanged": [1], "removed": [2]}
+    assert third["diff"] == {"added": [], "changed": [1], "unchanged": [3], "removed": []}
+    assert not (base / "script_seq2").exists()
+    assert (base / "script_seq1" / "script_seq1.txt").read_text(encoding="utf-8") == "Hello again"
+    assert (base / "manifest.json").exists()
+
+
+@pytest.mark.unit
+def test_manifest_restores_deleted_files(tmp_path):
+    config = {"base_name": "demo", "base_output_path": str(tmp_path)}
+    handler = ManimOutputHandler()
+    handler.save({"sequences": SEQUENCES}, config)
+
+    py_file = tmp_path / "manim_files" / "demo" / "script_seq2" / "script_seq2.py"
+    py_file.unlink()
+    result = handler.save({"sequences": SEQUENCES}, config)
+
+    assert result["diff"]["changed"] == [2]
+    assert py_file.exists()
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+from src.output_handler import LocalOutputHandler
+from src.parsed_copy import JsonLinesCopy, open_copy
+from src.parser import JSONParser
+from src.pipeline import PipelineContext, run_pipeline
+
+SEQUENCES = [
+    {"script_seq": seq, "script_for_manim": f"scene {seq} — é", "script_voice_over": f"line {seq}\nnext"}
+    for seq in (3, 1, 2, 10)
+]
+
+
+def copy_config(tmp_path, fmt):
+    return {"type": "local", "path": str(tmp_path / "parsed"), "file": "parsed.json", "format": fmt}
+
+
+@pytest.mark.unit
+def test_jsonl_copy_supports_random_access(tmp_path):
+    handler = LocalOutputHandler()
+    streamed = list(handler.write_through(iter(SEQUENCES), copy_config(tmp_path, "jsonl")))
+    assert streamed == SEQUENCES
+
+    path = tmp_path / "parsed" / "parsed.jsonl"
+    assert sorted(p.name for p in path.parent.iterdir()) == ["parsed.jsonl", "parsed.jsonl.idx"]
+    assert len(path.read_text(encoding="utf-8").splitlines()) == len(SEQUENCES)
+
+    with open_copy(path) as copy:
+        assert len(copy) == 4
+        assert copy[0] == SEQUENCES[0] and copy[-1] == SEQUENCES[-1]
+        assert copy[1:3] == SEQUENCES[1:3]
+        assert copy.by_seq(10) == SEQUENCES[3]
+        assert list(copy) == SEQUENCES
+        with pytest.raises(IndexError):
+            copy[4]
+        with pytest.raises(KeyError):
+            copy.by_seq(7)
+
+
+@pytest.mark.unit
+def test_save_writes_the_configured_format(tmp_path):
+    handler = LocalOutputHandler()
+
+    assert handler.save({"sequences": SEQUENCES}, copy_config(tmp_path, "jsonl")).name == "parsed.jsonl"
+    assert handler.save({"sequences": []}, copy_config(tmp_path / "empty", "jsonl")).exists()
+    with JsonLinesCopy(tmp_path / "empty" / "parsed" / "parsed.jsonl") as empty:
+        assert len(empty) == 0 and list(empty) == []
+    with pytest.raises(ValueError):
+        handler.write_through(iter(SEQUENCES), copy_config(tmp_path, "xml"))
+
+
+@pytest.mark.unit
+def test_json_parser_reads_a_range_of_a_compact_copy(tmp_path):
+    LocalOutputHandler().save({"sequences": SEQUENCES}, copy_config(tmp_path, "jsonl"))
+
+    parser = JSONParser()
+    path = tmp_path / "parsed" / "parsed.jsonl"
+
+    assert parser.is_compact_copy(path) and not parser.is_compact_copy(tmp_path / "parsed.json")
+    assert [seq.to_dict() for seq in parser.iter_parse_file(path, start=1, stop=3)] == SEQUENCES[1:3]
+    assert [seq.to_dict() for seq in parser.iter_parse_file(path)] == SEQUENCES
+
+
+@pytest.mark.unit
+def test_arrow_copy_supports_random_access(tmp_path):
+    pytest.importorskip("pyarrow")
+    config = dict(copy_config(tmp_path, "arrow"), batch_size=3)
+    LocalOutputHandler().save({"sequences": SEQUENCES}, config)
+
+    with open_copy(tmp_path / "parsed" / "parsed.arrow") as copy:
+        assert len(copy) == 4
+        assert copy[3] == SEQUENCES[3] and copy[1:3] == SEQUENCES[1:3]
+        assert copy.by_seq(2) == SEQUENCES[2]
+        assert list(copy) == SEQUENCES
+
+
+@pytest.mark.integration
+def test_pipeline_regenerates_from_a_compact_copy(fake_manim, tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "input.json").write_text(json.dumps(SEQUENCES), encoding="utf-8")
+    config = {
+        "input": {"type": "local", "file_type": "json", "path": "data", "file": "input.json"},
+        "parsed_copy": {"type": "local", "path": "parsed", "file": "parsed.json", "format": "jsonl"},
+        "manim_output": {"type": "manim", "base_name": "first", "path": "input/manim_files"},
+        "video_output": {"type": "video", "quality": "low", "cache": {"enabled": False}},
+        "journal": {"enabled": False},
+    }
+    first = run_pipeline(config, PipelineContext())
+
+    config["input"].update(file_type="jsonl", path="parsed", file="parsed.jsonl")
+    config["parsed_copy"]["file"] = "second.json"
+    config["manim_output"]["base_name"] = "second"
+    second = run_pipeline(config, PipelineContext())
+
+    first_sources = [open(p, encoding="utf-8").read() for p in first["generated"]["py_files"]]
+    second_sources = [open(p, encoding="utf-8").read() for p in second["generated"]["py_files"]]
+    assert second_sources == first_sources
+    assert len(second["rendered"]) == 4
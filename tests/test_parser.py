@@ -1,7 +1,8 @@
 import pytest
 import json
 from pathlib import Path
-from src.parser import JSONParser, CSVParser, TXTParser
+from src.parser import JSONParser, CSVParser, TXTParser, DBParser
+from src.sequence import Sequence, SequenceBatch
 from src.factories.parser_factory import ParserFactory
 
 
@@ -16,7 +17,8 @@ def test_json_parser():
     parsed = parser.parse(raw_data)
 
     assert "sequences" in parsed
-    assert parsed["sequences"][0]["script"] == "Hello"
+    assert parsed["sequences"][0].script_for_manim == "Hello"
+    assert parsed["sequences"][0].script_seq == 1
 
 @pytest.mark.unit
 def test_csv_parser():
@@ -25,7 +27,7 @@ def test_csv_parser():
     parsed = parser.parse(raw_data)
 
     assert "sequences" in parsed
-    assert parsed["sequences"][1]["script"] == "World"
+    assert parsed["sequences"][1] == Sequence(2, "World")
 
 @pytest.mark.unit
 def test_txt_parser():
@@ -34,7 +36,7 @@ def test_txt_parser():
     parsed = parser.parse(raw_data)
 
     assert "sequences" in parsed
-    assert parsed["sequences"][0]["script"] == "Line one"
+    assert parsed["sequences"][0] == Sequence(1, "Line one", "Line one")
 
 
 # -----------------------------
@@ -52,3 +54,102 @@ def test_parser_from_config():
 
     assert "sequences" in parsed
     assert len(parsed["sequences"]) > 0
+
+
+# -----------------------------
+# STREAMING TESTS
+# -----------------------------
+
+def chunked(text, size=7):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("raw_data", [
+    '[{"script_seq": 1, "script": "Hello"}, {"script_seq": 22, "script": "a [b] {c}, \\"d\\""}]',
+    '{"title": {"x": [1, 2]}, "sequences": [{"script_seq": 1, "script": "Hello"},'
+    ' {"script_seq": 22, "script": "a [b] {c}, \\"d\\""}], "after": 1}',
+])
+def test_json_iter_parse_matches_parse(raw_data):
+    parser = JSONParser()
+    streamed = list(parser.iter_parse(chunked(raw_data)))
+
+    assert streamed == list(parser.parse(raw_data)["sequences"])
+    assert streamed[1].script_seq == 22
+
+
+@pytest.mark.unit
+def test_json_iter_parse_is_lazy():
+    def chunks():
+        yield '[{"script_seq": 1}, '
+        raise AssertionError("read past the first item")
+
+    assert next(JSONParser().iter_parse(chunks())) == Sequence(1)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("raw_data", ["", "[1, 2", '{"other": []}', "42"])
+def test_json_iter_parse_rejects_invalid_input(raw_data):
+    with pytest.raises(ValueError):
+        list(JSONParser().iter_parse(chunked(raw_data)))
+
+
+@pytest.mark.unit
+def test_csv_and_txt_iter_parse_match_parse():
+    csv_data = "id,script\n1,Hello\n2,World\n"
+    txt_data = "Line one\n\nLine two\nLine three"
+
+    assert list(CSVParser().iter_parse(chunked(csv_data, 5))) == list(CSVParser().parse(csv_data)["sequences"])
+    assert list(TXTParser().iter_parse(chunked(txt_data, 5))) == list(TXTParser().parse(txt_data)["sequences"])
+
+
+@pytest.mark.unit
+def test_csv_iter_parse_keeps_quoted_newlines():
+    rows = list(CSVParser().iter_parse(chunked('id,script\n1,"multi\nline"\n', 4)))
+    assert rows == [Sequence(1, "multi\nline")]
+
+
+# -----------------------------
+# NORMALIZATION TESTS
+# -----------------------------
+
+@pytest.mark.unit
+def test_every_format_normalizes_to_the_same_sequences():
+    expected = [Sequence(1, "Hello", "Hi"), Sequence(2, "World", "Bye")]
+    json_data = '[{"id": 1, "script": "Hello", "voice_over": "Hi"}, {"script_seq": 2, "script_for_manim": "World", "script_voice_over": "Bye"}]'
+    csv_data = "script_seq,script_for_manim,script_voice_over\n1,Hello,Hi\n2,World,Bye\n"
+    rows = [{"script_seq": 1, "script": "Hello", "voice_over": "Hi"}, {"id": 2, "script_for_manim": "World", "script_voice_over": "Bye"}]
+
+    assert list(JSONParser().parse(json_data)["sequences"]) == expected
+    assert list(CSVParser().iter_parse(chunked(csv_data))) == expected
+    assert list(DBParser().iter_parse([rows])) == expected
+    assert list(DBParser().parse(SequenceBatch(rows))["sequences"]) == expected
+
+
+@pytest.mark.unit
+def test_unmapped_fields_are_kept():
+    parsed = JSONParser().parse('{"title": "t", "sequences": [{"script_seq": 3, "id": "x", "duration": 2}]}')
+    seq = parsed["sequences"][0]
+
+    assert parsed["title"] == "t"
+    assert seq.extra == {"id": "x", "duration": 2}  # an alias never overrides its canonical column
+    assert seq.to_dict() == {"script_seq": 3, "script_for_manim": "", "script_voice_over": "", "id": "x", "duration": 2}
+    assert seq.get("duration") == 2 and seq.get("missing", 0) == 0
+
+    short = list(CSVParser().iter_parse(["id,script,notes\n4\n"]))
+    assert short == [Sequence(4)]
+
+
+@pytest.mark.unit
+def test_sequence_batch_indexing():
+    batch = SequenceBatch(Sequence(i, f"scene {i}", extra={"k": i} if i == 2 else None) for i in range(1, 5))
+
+    assert len(batch) == 4
+    assert batch[-1] == Sequence(4, "scene 4") and batch[1].extra == {"k": 2}
+    assert batch[1:3] == [Sequence(2, "scene 2", extra={"k": 2}), Sequence(3, "scene 3")]
+    assert [seq.script_seq for seq in batch] == [1, 2, 3, 4]
+    assert batch.to_dicts()[0] == {"script_seq": 1, "script_for_manim": "scene 1", "script_voice_over": ""}
+    with pytest.raises(IndexError):
+        batch[4]
+    with pytest.raises(ValueError):
+        SequenceBatch([1])
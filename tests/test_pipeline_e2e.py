@@ -2,14 +2,14 @@ import json
 from pathlib import Path
 
 import pytest
-from src.input_handler import LocalFileInputHandler, CloudInputHandler, DatabaseInputHandler
+from src.factories.input_handler_factory import InputHandlerFactory
 from src.factories.parser_factory import ParserFactory
-from src.output_handler import LocalOutputHandler, CloudOutputHandler, DatabaseOutputHandler
+from src.output_handler import LocalOutputHandler, DatabaseOutputHandler
 
 
 @pytest.mark.e2e
 def test_pipeline_end_to_end(tmp_path):
-    """End-to-end test: input -> parser -> output, driven by config.json"""
+    """End-to-end test: input -> parser -> parsed copy, driven by config.json"""
 
     # Load config.json
     config_path = Path("config.json")
@@ -19,31 +19,21 @@ def test_pipeline_end_to_end(tmp_path):
     # -------------------------
     # STEP 1: Input Handler
     # -------------------------
-    input_type = config["input"]["type"]
-    if input_type == "local":
-        handler = LocalFileInputHandler()
-        file_path = Path(config["input"]["path"])
+    input_config = config["input"]
+    if input_config["type"] == "local":
+        file_path = Path(input_config["path"]) / input_config["file"]
         assert file_path.exists(), f"Input file {file_path} not found!"
-        raw_data = handler.load(file_path)
+    handler = InputHandlerFactory.get_handler(input_config["type"])
+    raw_data = handler.load(input_config)
 
-    elif input_type == "cloud":
-        handler = CloudInputHandler()
-        raw_data = handler.load(config["input"]["path"])
-
-    elif input_type == "db":
-        handler = DatabaseInputHandler()
-        raw_data = handler.load(config["input"]["path"])
-
-    else:
-        pytest.fail(f"Unknown input type: {input_type}")
-
-    assert isinstance(raw_data, str)
-    assert raw_data.strip() != ""
+    if input_config["type"] == "local":
+        assert isinstance(raw_data, str)
+        assert raw_data.strip() != ""
 
     # -------------------------
     # STEP 2: Parser
     # -------------------------
-    parser = ParserFactory.get_parser(config["input"]["file_type"])
+    parser = ParserFactory.get_parser(input_config["file_type"])
     parsed = parser.parse(raw_data)
 
     assert "sequences" in parsed
@@ -52,22 +42,17 @@ def test_pipeline_end_to_end(tmp_path):
     # -------------------------
     # STEP 3: Output Handler
     # -------------------------
-    output_type = config["output"]["type"]
+    output_config = config["parsed_copy"]
+    output_type = output_config["type"]
     if output_type == "local":
         handler = LocalOutputHandler()
-        filepath = tmp_path / Path(config["output"]["path"]).name
-        saved_path = handler.save(parsed, filepath)
+        saved_path = handler.save(parsed, dict(output_config, path=str(tmp_path)))
         assert saved_path.exists()
         assert saved_path.read_text(encoding="utf-8").strip() != ""
 
-    elif output_type == "cloud":
-        handler = CloudOutputHandler()
-        result = handler.save(parsed, config["output"]["path"])
-        assert "Uploaded" in result
-
     elif output_type == "db":
         handler = DatabaseOutputHandler()
-        result = handler.save(parsed, config["output"]["path"])
+        result = handler.save(parsed, output_config)
         assert "Saved" in result
 
     else:
@@ -0,0 +1,148 @@
+import dataclasses
+import json
+from pathlib import Path
+
+import pytest
+from src.config_loader import ConfigError, ConfigLoader, validate_config
+from src.main import main
+from src.output_handler import ManimOutputHandler
+from src.pipeline import PipelineContext, run_pipeline
+from src.plan import compile_plan, estimate_work
+
+REPO = Path(__file__).resolve().parent.parent
+
+
+def make_config(tmp_path) -> dict:
+    return {
+        "input": {"type": "local", "file_type": "json", "path": "data", "file": "input.json"},
+        "parsed_copy": {"type": "local", "path": "parsed", "file": "parsed.json"},
+        "manim_output": {"type": "manim", "base_name": "planned", "path": "input/manim_files"},
+        "video_output": {"type": "video", "quality": "low", "cache": {"path": str(tmp_path / ".render_cache")}},
+        "journal": {"enabled": False},
+    }
+
+
+def write_input(tmp_path, scenes: dict):
+    (tmp_path / "data").mkdir(exist_ok=True)
+    (tmp_path / "data" / "input.json").write_text(json.dumps([
+        {"script_seq": seq, "script_for_manim": scene, "script_voice_over": f"voice {seq}"}
+        for seq, scene in scenes.items()
+    ]), encoding="utf-8")
+
+
+@pytest.mark.unit
+def test_every_problem_is_reported_up_front(tmp_path, monkeypatch):
+    validate_config(json.loads((REPO / "config.json").read_text(encoding="utf-8")))
+
+    config = make_config(tmp_path)
+    config["input"]["type"] = "lcoal"
+    config["video_output"].update(quality="hgh", retries=-1)
+    config["manim_output"]["base_output_path"] = "elsewhere"
+    config["video_output"].update(progress=True, engine="inprocess", passes={"final": "high"})
+    config["pipeline"] = {"mode": "streaming"}
+    config["concat_ouptut"] = {"type": "concat"}
+    with pytest.raises(ConfigError) as error:
+        validate_config(config)
+    problems = error.value.problems
+    assert len(problems) == 7
+    assert any(p.startswith("pipeline.mode: 'streaming' cannot render video_output.passes") for p in problems)
+    assert any(p.startswith("video_output.progress: needs engine 'subprocess'") for p in problems)
+    assert any(p.startswith("input.type: 'lcoal'") for p in problems)
+    assert any(p.startswith("video_output.quality: 'hgh'") for p in problems)
+    assert any(p.startswith("manim_output: path gives") for p in problems)
+    assert "unknown section 'concat_ouptut'" in problems
+
+    # nothing ran: the parsed copy was never written
+    monkeypatch.chdir(tmp_path)
+    with pytest.raises(ConfigError):
+        run_pipeline(config, PipelineContext())
+    assert not (tmp_path / "parsed").exists()
+
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    with pytest.raises(ConfigError):
+        ConfigLoader(path).load()
+
+
+@pytest.mark.unit
+def test_missing_tools_and_modules_are_reported_up_front(tmp_path, monkeypatch):
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    monkeypatch.setenv("PATH", str(empty))
+    monkeypatch.setattr("importlib.util.find_spec", lambda name, *args: None)
+    config = make_config(tmp_path)
+    config["parsed_copy"]["format"] = "arrow"
+    config["voice_over"] = {"type": "voice_over", "engine": "espeak"}
+    config["concat_output"] = {"type": "concat", "ffprobe": "/opt/ffmpeg/bin/ffprobe"}
+
+    with pytest.raises(ConfigError) as error:
+        validate_config(config)
+
+    assert sorted(error.value.problems) == sorted([
+        'parsed_copy.format: "arrow" requires pyarrow: pip install pyarrow',
+        "voice_over.engine: 'espeak' needs espeak-ng or espeak on PATH",
+        "voice_over.ffmpeg: 'ffmpeg' not found on PATH",
+        "concat_output.ffmpeg: 'ffmpeg' not found on PATH",
+        "concat_output.ffprobe: '/opt/ffmpeg/bin/ffprobe' not found on PATH",
+    ])
+
+    # the stub engine needs no espeak, and muxing can be turned off
+    config["parsed_copy"]["format"] = "json"
+    config["voice_over"].update(engine="stub", mux=False)
+    del config["concat_output"]
+    validate_config(config)
+
+
+@pytest.mark.unit
+def test_plans_are_immutable_and_cached_by_config_hash(tmp_path):
+    config = make_config(tmp_path)
+    plan = compile_plan(config)
+    assert compile_plan(json.loads(json.dumps(config))) is plan
+    assert [stage.name for stage in plan.stages] == \
+        ["input_load", "parse", "parsed_copy_save", "manim_generation", "video_render"]
+    assert plan.stage("manim_generation").handler == "src.output_handler:ManimOutputHandler"
+    assert plan.manim_dir == Path("input/manim_files/planned") == ManimOutputHandler.base_path(config["manim_output"])
+    assert plan.input_file == Path("data/input.json") and plan.quality == "l"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        plan.manim_dir = Path("x")
+
+    config["video_output"]["quality"] = "high"
+    assert compile_plan(config) is not plan and compile_plan(config).quality == "h"
+
+
+@pytest.mark.integration
+def test_generation_and_rendering_use_the_same_folder(fake_manim, tmp_path):
+    write_input(tmp_path, {1: "one", 2: "two"})
+    config = make_config(tmp_path)
+    del config["manim_output"]["path"]
+    config["manim_output"]["base_output_path"] = "legacy"
+
+    result = run_pipeline(config, PipelineContext())
+
+    assert result["rendered"] == [f"legacy/manim_files/planned/script_seq{seq}/script_seq{seq}.py" for seq in (1, 2)]
+
+
+@pytest.mark.integration
+def test_dry_run_counts_the_work_without_doing_it(fake_manim, tmp_path, capsys):
+    write_input(tmp_path, {1: "one", 2: "two", 3: "three"})
+    config = make_config(tmp_path)
+    run_pipeline(config, PipelineContext())
+    renders = len(fake_manim.read_text().splitlines())
+    manifest = (tmp_path / "input/manim_files/planned/manifest.json").read_text(encoding="utf-8")
+
+    write_input(tmp_path, {1: "one", 2: "TWO", 4: "four"})
+    work = estimate_work(compile_plan(config), config)
+    assert work["generate"] == {"added": 1, "changed": 1, "unchanged": 1, "removed": 1}
+    assert (work["sequences"], work["scenes"], work["renders"], work["cached"]) == (3, 3, 2, 1)
+
+    (tmp_path / "config.json").write_text(json.dumps(config), encoding="utf-8")
+    assert main(["--dry-run"]) == 0
+    out = capsys.readouterr().out
+    assert "5. video_render" in out and "2 of 3 scenes to render" in out
+    assert len(fake_manim.read_text().splitlines()) == renders
+    assert (tmp_path / "input/manim_files/planned/manifest.json").read_text(encoding="utf-8") == manifest
+
+    config["video_output"]["quality"] = "ultra"
+    (tmp_path / "config.json").write_text(json.dumps(config), encoding="utf-8")
+    assert main(["--dry-run"]) == 2
+    assert "video_output.quality: 'ultra'" in capsys.readouterr().out
@@ -0,0 +1,124 @@
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+from src.output_handler import VideoOutputHandler
+from src.render_cache import RenderCache
+
+
+@pytest.mark.unit
+def test_key_depends_on_script_quality_and_version():
+    key = RenderCache.key("scene", "l", "0.19.0")
+    assert key == RenderCache.key("scene", "l", "0.19.0")
+    assert key != RenderCache.key("scene2", "l", "0.19.0")
+    assert key != RenderCache.key("scene", "h", "0.19.0")
+    assert key != RenderCache.key("scene", "l", "0.19.1")
+
+
+@pytest.mark.unit
+def test_put_get_and_persisted_index(tmp_path):
+    video = tmp_path / "scene.mp4"
+    video.write_bytes(b"video")
+    cache = RenderCache(tmp_path / "cache")
+    key = RenderCache.key("scene", "l")
+
+    assert cache.get(key) is None
+    cache.put(key, video)
+
+    reopened = RenderCache(tmp_path / "cache")
+    assert reopened.get(key).read_bytes() == b"video"
+
+
+@pytest.mark.unit
+def test_index_is_parsed_again_only_when_it_changes(tmp_path, monkeypatch):
+    video = tmp_path / "scene.mp4"
+    video.write_bytes(b"video")
+    cache, other = RenderCache(tmp_path / "cache"), RenderCache(tmp_path / "cache")
+    first, second = RenderCache.key("one", "l"), RenderCache.key("two", "l")
+    cache.put(first, video)
+    loads = []
+    load_index = RenderCache._load_index
+    monkeypatch.setattr(RenderCache, "_load_index", lambda self: loads.append(self) or load_index(self))
+
+    assert all(first in cache for _ in range(100)) and cache.size() == 5
+    assert cache.get(first) is not None
+    assert loads == []
+
+    other.put(second, video)  # another process writes the index
+    assert second in cache and cache.get(second) is not None
+    assert loads.count(cache) == 1
+
+
+@pytest.mark.unit
+def test_lru_eviction_by_size(tmp_path):
+    cache = RenderCache(tmp_path / "cache", max_size_mb=25 / (1024 * 1024))
+    keys = []
+    for i in range(3):
+        video = tmp_path / f"{i}.mp4"
+        video.write_bytes(b"x" * 10)
+        keys.append(RenderCache.key(str(i), "l"))
+        cache.put(keys[-1], video)
+        if i == 1:
+            cache.get(keys[0])  # touch the first entry so the second one is oldest
+
+    assert keys[0] in cache
+    assert keys[1] not in cache
+    assert keys[2] in cache
+    assert cache.size() <= 25
+
+
+@pytest.mark.unit
+def test_video_handler_skips_unchanged_scenes(fake_manim, make_scenes, tmp_path):
+    base = make_scenes({1: "one", 2: "two"})
+    cache = RenderCache(tmp_path / "cache")
+    handler = VideoOutputHandler(media_dir=tmp_path / "media", cache=cache)
+
+    first = handler.render_all(handler.scene_files(base))
+    make_scenes({2: "two, edited"})
+    (tmp_path / "media").rename(tmp_path / "old_media")
+    second = handler.render_all(handler.scene_files(base))
+
+    assert [r.cached for r in first] == [False, False]
+    assert [r.cached for r in second] == [True, False]
+    assert second[0].video.read_text().startswith("l:one\n")
+    assert len(fake_manim.read_text().splitlines()) == 3
+
+
+@pytest.mark.unit
+def test_video_handler_without_cache_always_renders(fake_manim, make_scenes, tmp_path):
+    base = make_scenes({1: "one"})
+    handler = VideoOutputHandler(media_dir=tmp_path / "media")
+
+    handler.save(base)
+    handler.save(base)
+
+    assert len(fake_manim.read_text().splitlines()) == 2
+
+
+@pytest.mark.integration
+def test_processes_sharing_a_cache_keep_every_entry(tmp_path):
+    writer = textwrap.dedent("""\
+        import sys
+        from pathlib import Path
+        from src.render_cache import RenderCache
+
+        worker, cache_dir = sys.argv[1], Path(sys.argv[2])
+        cache = RenderCache(cache_dir)
+        video = cache_dir.parent / f"{worker}.mp4"
+        video.write_bytes(worker.encode())
+        for i in range(50):
+            cache.put(RenderCache.key(f"{worker}-{i}", "l"), video)
+            cache.get(RenderCache.key(f"{worker}-{i // 2}", "l"))
+    """)
+    env = dict(os.environ, PYTHONPATH=str(Path(__file__).resolve().parent.parent))
+    writers = [subprocess.Popen([sys.executable, "-c", writer, f"w{i}", str(tmp_path / "cache")], env=env,
+                                stderr=subprocess.PIPE, text=True) for i in range(4)]
+    errors = [process.communicate(timeout=120)[1] for process in writers]
+    assert [process.returncode for process in writers] == [0, 0, 0, 0], errors
+
+    cache = RenderCache(tmp_path / "cache")
+    assert all(RenderCache.key(f"w{w}-{i}", "l") in cache for w in range(4) for i in range(50))
+    assert not list((tmp_path / "cache").glob("*.tmp"))
@@ -0,0 +1,129 @@
+import sys
+import textwrap
+
+import pytest
+from src.output_handler import VideoOutputHandler
+
+
+FAKE_MANIM_PACKAGE = textwrap.dedent('''\
+    """Minimal stand-in for manim's Python API"""
+    import contextlib
+    import os
+    from pathlib import Path
+
+    config = {}
+    RESOLUTIONS = {"low_quality": "480p15", "high_quality": "1080p60"}
+
+
+    @contextlib.contextmanager
+    def tempconfig(settings):
+        saved = dict(config)
+        config.update(settings)
+        try:
+            yield
+        finally:
+            config.clear()
+            config.update(saved)
+
+
+    class Scene:
+        def construct(self):
+            pass
+
+        def render(self):
+            self.construct()
+            video = (Path(config["media_dir"]) / "videos" / Path(config["input_file"]).stem
+                     / RESOLUTIONS[config["quality"]] / f"{type(self).__name__}.mp4")
+            video.parent.mkdir(parents=True, exist_ok=True)
+            video.write_text(f"pid={os.getpid()}")
+''')
+
+
+def scene(body="pass"):
+    return f"from manim import *\n\nclass Script_seq{{n}}(Scene):\n    def construct(self):\n        {body}\n"
+
+
+@pytest.fixture
+def fake_manim_package(tmp_path, monkeypatch):
+    package = tmp_path / "site" / "manim"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text(FAKE_MANIM_PACKAGE, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path / "site"))
+    monkeypatch.delitem(sys.modules, "manim", raising=False)
+
+
+@pytest.fixture
+def scenes(make_scenes):
+    def _make(bodies):
+        return make_scenes({n: scene(body).replace("{n}", str(n)) for n, body in bodies.items()})
+    return _make
+
+
+@pytest.mark.integration
+def test_inprocess_engine_reuses_warm_workers(fake_manim_package, scenes, tmp_path):
+    base = scenes({1: "pass", 2: "raise ValueError('broken scene')", 3: "pass", 4: "pass"})
+    handler = VideoOutputHandler(max_workers=1, media_dir=tmp_path / "media", engine="inprocess")
+    try:
+        results = handler.render_all(handler.scene_files(base))
+    finally:
+        handler.close()
+
+    assert [r.ok for r in results] == [True, False, True, True]
+    assert "broken scene" in results[1].error
+    pids = {r.video.read_text() for r in results if r.ok}
+    assert len(pids) == 1  # every scene ran in the same warm worker
+
+
+@pytest.mark.integration
+def test_inprocess_engine_falls_back_when_a_worker_dies(fake_manim_package, fake_manim, scenes, tmp_path):
+    base = scenes({1: "import os; os._exit(3)", 2: "pass"})
+    handler = VideoOutputHandler(max_workers=1, media_dir=tmp_path / "media", engine="inprocess")
+    try:
+        results = handler.render_all(handler.scene_files(base))
+    finally:
+        handler.close()
+
+    assert results[1].ok
+    # the crashed scene was retried with the `manim render` subprocess
+    assert "script_seq1" in fake_manim.read_text()
+
+
+@pytest.mark.integration
+def test_one_crash_counts_once_across_workers(fake_manim_package, fake_manim, scenes, tmp_path):
+    base = scenes({1: "import time; time.sleep(0.5); import os; os._exit(3)",
+                   2: "import time; time.sleep(2)", 3: "import time; time.sleep(2)", 4: "import time; time.sleep(2)"})
+    handler = VideoOutputHandler(max_workers=4, media_dir=tmp_path / "media", engine="inprocess")
+    try:
+        results = handler.render_all(handler.scene_files(base))
+        broken_pools, available = handler.engine._broken_pools, handler.engine.available
+    finally:
+        handler.close()
+
+    # the running scenes were lost with the pool and rendered by `manim render` instead
+    assert all(r.ok for r in results)
+    assert broken_pools == 1 and available
+
+
+@pytest.mark.integration
+def test_scenes_lost_to_a_timeout_restart_are_not_crashes(fake_manim_package, fake_manim, scenes, tmp_path):
+    # scene 3 starts after scene 2, so it is still running, within its own timeout, when scene 1 times out
+    base = scenes({1: "import time; time.sleep(30)", 2: "import time; time.sleep(0.5)", 3: "import time; time.sleep(3)"})
+    handler = VideoOutputHandler(max_workers=2, media_dir=tmp_path / "media", engine="inprocess", timeout=2)
+    try:
+        timed_out, *others = handler.render_all(handler.scene_files(base))
+        broken_pools = handler.engine._broken_pools
+    finally:
+        handler.close()
+
+    assert "timed out" in timed_out.error
+    assert all(r.ok for r in others)
+    assert broken_pools == 0
+
+
+@pytest.mark.unit
+def test_inprocess_engine_without_manim_uses_subprocess(fake_manim, make_scenes, monkeypatch, tmp_path):
+    monkeypatch.setattr("importlib.util.find_spec", lambda name: None)
+    handler = VideoOutputHandler(media_dir=tmp_path / "media", engine="inprocess")
+
+    assert handler.save(make_scenes({1: ""})) != []
+    assert fake_manim.exists()
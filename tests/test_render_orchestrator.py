@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+from src.output_handler import VideoOutputHandler
+from src.render_cache import RenderCache
+from src.render_orchestrator import AsyncRenderOrchestrator, parse_progress
+
+
+@pytest.mark.unit
+def test_parse_progress():
+    line = "Animation 0: Create(Circle):  45%|####5     | 27/60 [00:00<00:00, 95.57it/s]"
+    assert parse_progress(line) == ("Animation 0: Create(Circle)", 45)
+    assert parse_progress("File ready at media/videos/x.mp4") is None
+
+
+@pytest.mark.unit
+def test_events_stream_progress_and_outcomes(fake_manim, make_scenes, tmp_path):
+    base = make_scenes({1: "PROGRESS", 2: "FAIL"})
+    handler = VideoOutputHandler(media_dir=tmp_path / "media")
+
+    async def collect():
+        return [event async for event in AsyncRenderOrchestrator(handler, concurrency=2).events(handler.scene_files(base))]
+
+    events = asyncio.run(collect())
+    first = [(e.kind, e.percent) for e in events if e.scene == "ScriptSeq1"]
+    second = [e.kind for e in events if e.scene == "ScriptSeq2"]
+
+    assert first == [("started", None), ("percent", 0), ("percent", 50), ("percent", 100), ("finished", None)]
+    assert second == ["started", "failed"]
+
+
+@pytest.mark.unit
+def test_render_all_respects_concurrency_and_order(fake_manim, make_scenes, tmp_path):
+    base = make_scenes({1: "# SLEEP 0.3", 2: "", 3: "# SLEEP 0.1"})
+    handler = VideoOutputHandler(media_dir=tmp_path / "media", cache=RenderCache(tmp_path / "cache"))
+    orchestrator = AsyncRenderOrchestrator(handler, concurrency=2)
+
+    first = asyncio.run(orchestrator.render_all(handler.scene_files(base)))
+    second = asyncio.run(orchestrator.render_all(handler.scene_files(base)))
+
+    assert [r.scene for r in first] == ["ScriptSeq1", "ScriptSeq2", "ScriptSeq3"]
+    assert all(r.ok and not r.cached for r in first)
+    assert all(r.ok and r.cached for r in second)
+
+
+@pytest.mark.unit
+def test_a_failing_cache_write_keeps_the_render(fake_manim, make_scenes, tmp_path, capsys):
+    class FullCache(RenderCache):
+        def put(self, key, video):
+            raise OSError(28, "No space left on device")
+
+    base = make_scenes({1: ""})
+    handler = VideoOutputHandler(media_dir=tmp_path / "media", cache=FullCache(tmp_path / "cache"))
+
+    (result,) = asyncio.run(AsyncRenderOrchestrator(handler).render_all(handler.scene_files(base)))
+
+    assert result.ok and not result.cached and result.video.exists()
+    assert "⚠️ Could not cache the render of" in capsys.readouterr().out
+
+
+@pytest.mark.unit
+def test_timeout_fails_the_scene(fake_manim, make_scenes, tmp_path):
+    base = make_scenes({1: "# SLEEP 10"})
+    handler = VideoOutputHandler(media_dir=tmp_path / "media", timeout=0.5)
+
+    (result,) = asyncio.run(AsyncRenderOrchestrator(handler).render_all(handler.scene_files(base)))
+
+    assert not result.ok and "timed out" in result.error
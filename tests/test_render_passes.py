@@ -0,0 +1,118 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from src.output_handler import VideoOutputHandler
+from src.pipeline import PipelineContext, run_pipeline
+from src.render_cache import RenderCache
+from src.render_passes import MultiPassRenderer
+
+
+def calls(calls_log):
+    """(scene stem, quality flag) of every fake manim call"""
+    if not calls_log.exists():
+        return []
+    return [(line.split()[0], line.split()[2]) for line in calls_log.read_text().splitlines()]
+
+
+@pytest.fixture
+def renderer(fake_manim, make_scenes, tmp_path):
+    base = make_scenes({1: "one", 2: "two", 3: "three"})
+    approvals = tmp_path / "approvals.json"
+    approvals.write_text(json.dumps([2]), encoding="utf-8")
+
+    def _make():
+        handler = VideoOutputHandler(max_workers=1, media_dir=tmp_path / "media", cache=RenderCache(tmp_path / "cache"))
+        return MultiPassRenderer(handler, preview="low", final="high", approvals=approvals)
+    return base, approvals, _make
+
+
+@pytest.mark.unit
+def test_previews_run_before_approved_finals(fake_manim, renderer):
+    base, _, make = renderer
+
+    report = make().save(base)
+
+    assert calls(fake_manim) == [("script_seq1", "-ql"), ("script_seq2", "-ql"), ("script_seq3", "-ql"),
+                                 ("script_seq2", "-qh")]
+    assert report["final"] == {"ScriptSeq2": "h"}
+    assert len(report["rendered"]) == 3
+    assert [video.parent.name for video in report["videos"].values()] == ["480p15", "1080p60", "480p15"]
+
+
+@pytest.mark.unit
+def test_only_new_approvals_and_changes_are_rendered(fake_manim, make_scenes, renderer):
+    base, approvals, make = renderer
+    make().save(base)
+    fake_manim.unlink()
+
+    assert make().save(base)["previews"] == []
+    assert not fake_manim.exists()
+
+    approvals.write_text(json.dumps([2, 3]), encoding="utf-8")
+    make().save(base)
+    assert calls(fake_manim) == [("script_seq3", "-qh")]
+    fake_manim.unlink()
+
+    # a changed scene that was final gets a new preview and its stale final replaced
+    make_scenes({1: "one, edited", 2: "two, edited"})
+    report = make().save(base)
+    assert calls(fake_manim) == [("script_seq1", "-ql"), ("script_seq2", "-ql"), ("script_seq2", "-qh")]
+    assert report["final"] == {"ScriptSeq2": "h", "ScriptSeq3": "h"}
+
+
+@pytest.mark.unit
+def test_cached_qualities_are_not_rendered_again(fake_manim, renderer, tmp_path):
+    base, _, make = renderer
+    make().save(base)
+    fake_manim.unlink()
+    shutil.rmtree(tmp_path / "media")
+
+    report = make().save(base)
+
+    assert not fake_manim.exists()
+    assert report["final"] == {"ScriptSeq2": "h"}
+    assert (tmp_path / "media/videos/script_seq2/1080p60/ScriptSeq2.mp4").read_text().startswith("h:two\n")
+
+
+@pytest.mark.unit
+def test_upgrade_all_and_invalid_policy(fake_manim, make_scenes, tmp_path):
+    base = make_scenes({1: "one", 2: "two"})
+    handler = VideoOutputHandler(max_workers=2, media_dir=tmp_path / "media")
+
+    report = MultiPassRenderer(handler, final="4k", upgrade="all").save(base)
+
+    assert sorted(report["final"].values()) == ["k", "k"]
+    with pytest.raises(ValueError):
+        MultiPassRenderer(handler, upgrade="sometimes")
+
+
+@pytest.mark.integration
+def test_pipeline_narrates_and_joins_each_scene_at_its_best_quality(fake_manim, fake_ffmpeg, tmp_path):
+    Path("data").mkdir()
+    Path("data/input.json").write_text(json.dumps([
+        {"script_seq": seq, "script_for_manim": f"scene {seq}", "script_voice_over": f"Part {seq}"} for seq in (1, 2)
+    ]), encoding="utf-8")
+    (tmp_path / "approvals.json").write_text("[2]", encoding="utf-8")
+    config = {
+        "input": {"type": "local", "file_type": "json", "path": "data", "file": "input.json"},
+        "parsed_copy": {"type": "local", "path": "parsed", "file": "parsed.json"},
+        "manim_output": {"type": "manim", "base_name": "project", "path": "input/manim_files"},
+        "video_output": {"type": "video", "quality": "medium", "cache": {"enabled": False},
+                         "passes": {"preview": "low", "final": "high", "approvals": "approvals.json"}},
+        "voice_over": {"type": "voice_over", "engine": "stub", "cache": {"path": str(tmp_path / ".tts_cache")}},
+        "concat_output": {"type": "concat", "output": "output/project.mp4"},
+        "journal": {"enabled": False},
+    }
+
+    result = run_pipeline(config, PipelineContext())
+
+    # each scene is narrated in the video that is joined
+    assert sorted(Path(video).parent.name for video in result["voice_over"]["muxed"]) == ["1080p60", "480p15"]
+
+    video = Path("output/project.mp4").read_text(encoding="utf-8")
+    # the preview of scene 1 and the final render of scene 2; nothing was rendered at the base quality
+    assert video.startswith('l:"""scene 1"""') and video.index("class ScriptSeq1") < video.index('h:"""scene 2"""')
+    assert not Path("media/videos/script_seq1/720p30").exists()
+    assert video.count("\naudio:") == 2
@@ -0,0 +1,142 @@
+import json
+from pathlib import Path
+
+import pytest
+from src.output_handler import VideoOutputHandler
+from src.pipeline import PipelineContext, run_pipeline
+from src.run_journal import RunJournal
+
+
+def write_input(sequences: dict[int, str]):
+    Path("data").mkdir(exist_ok=True)
+    Path("data/input.json").write_text(json.dumps([
+        {"script_seq": seq, "script_for_manim": source, "script_voice_over": ""} for seq, source in sequences.items()
+    ]), encoding="utf-8")
+
+
+def journal_config():
+    return {
+        "input": {"type": "local", "file_type": "json", "path": "data", "file": "input.json"},
+        "parsed_copy": {"type": "local", "path": "parsed", "file": "parsed.json"},
+        "manim_output": {"type": "manim", "base_name": "project", "path": "input/manim_files"},
+        "video_output": {"type": "video", "quality": "low", "max_workers": 1, "cache": {"enabled": False}},
+        "journal": {"path": "journal/project.jsonl"},
+    }
+
+
+def rendered_scenes(calls_log: Path) -> list[str]:
+    return [line.split()[0] for line in calls_log.read_text().splitlines()] if calls_log.exists() else []
+
+
+@pytest.mark.unit
+def test_journal_survives_a_truncated_last_line(tmp_path):
+    path = tmp_path / "journal.jsonl"
+    with RunJournal(path) as journal:
+        journal.record("parse", status="done", sequences=3)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"stage": "render", "sta')
+
+    resumed = RunJournal(path, resume=True)
+    resumed.record("generate", status="done")
+    resumed.close()
+
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [e["stage"] for e in events] == ["run", "parse", "run", "run", "generate", "run"]
+    assert resumed.last("parse")["sequences"] == 3
+    assert RunJournal(path).last("parse") is None  # a fresh run starts a new journal
+
+
+@pytest.mark.integration
+def test_resume_skips_finished_work(fake_manim):
+    write_input({1: "one", 2: "two FAIL", 3: "three"})
+    first = run_pipeline(journal_config(), PipelineContext())
+    assert len(first["rendered"]) == 2
+    fake_manim.unlink()
+
+    # unchanged input: generation and the finished scenes are skipped, the failed one retried
+    second = run_pipeline(journal_config(), PipelineContext(), resume=True)
+    assert second["generated"] is None
+    assert rendered_scenes(fake_manim) == ["script_seq2"]
+    fake_manim.unlink()
+
+    # the fixed scene is regenerated and rendered; a missing video is rendered again
+    write_input({1: "one", 2: "two", 3: "three"})
+    Path("media/videos/script_seq3/480p15/ScriptSeq3.mp4").unlink()
+    third = run_pipeline(journal_config(), PipelineContext(), resume=True)
+    assert third["generated"]["diff"]["changed"] == [2]
+    assert rendered_scenes(fake_manim) == ["script_seq2", "script_seq3"]
+    assert len(third["rendered"]) == 3
+    fake_manim.unlink()
+
+    # without --resume everything is rendered again
+    run_pipeline(journal_config(), PipelineContext())
+    assert rendered_scenes(fake_manim) == ["script_seq1", "script_seq2", "script_seq3"]
+
+
+@pytest.mark.integration
+def test_resume_keeps_narrated_scenes(fake_manim, fake_ffmpeg):
+    write_input({1: "one", 2: "two FAIL"})
+    data = json.loads(Path("data/input.json").read_text(encoding="utf-8"))
+    for sequence in data:
+        sequence["script_voice_over"] = f"Narration {sequence['script_seq']}"
+    Path("data/input.json").write_text(json.dumps(data), encoding="utf-8")
+    config = journal_config()
+    config["voice_over"] = {"type": "voice_over", "engine": "stub", "cache": {"enabled": False}}
+
+    first = run_pipeline(config, PipelineContext())
+    assert len(first["voice_over"]["muxed"]) == 1
+    fake_manim.unlink()
+
+    # the muxed video differs from the render the journal recorded, yet it is not rendered again
+    second = run_pipeline(config, PipelineContext(), resume=True)
+    assert rendered_scenes(fake_manim) == ["script_seq2"]
+    assert second["voice_over"]["muxed"] == []
+    assert "audio:" in Path("media/videos/script_seq1/480p15/ScriptSeq1.mp4").read_text(encoding="utf-8")
+
+
+@pytest.mark.integration
+def test_resume_with_live_progress_retries_and_skips_finished_scenes(fake_manim):
+    write_input({1: "one", 2: "two FLAKY", 3: "three FAIL"})
+    config = journal_config()
+    config["video_output"].update(progress=True, retries=1, retry_backoff=0)
+
+    first = run_pipeline(config, PipelineContext())
+    assert len(first["rendered"]) == 2
+    assert sorted(rendered_scenes(fake_manim)) == ["script_seq1"] + ["script_seq2"] * 2 + ["script_seq3"] * 2
+    fake_manim.unlink()
+
+    second = run_pipeline(config, PipelineContext(), resume=True)
+    assert len(second["rendered"]) == 2
+    assert rendered_scenes(fake_manim) == ["script_seq3"] * 2
+
+
+@pytest.mark.integration
+def test_resume_with_passes_skips_finished_renders(fake_manim):
+    write_input({1: "one", 2: "two FAIL"})
+    config = journal_config()
+    config["video_output"]["passes"] = {"preview": "low", "final": "high", "upgrade": "all"}
+
+    run_pipeline(config, PipelineContext())
+    fake_manim.unlink()
+    # the journal alone knows what finished
+    Path("media/render_state.json").unlink()
+
+    run_pipeline(config, PipelineContext(), resume=True)
+    assert sorted(line.split()[2] for line in fake_manim.read_text().splitlines()
+                  if line.startswith("script_seq2")) == ["-qh", "-ql"]
+    assert rendered_scenes(fake_manim) == ["script_seq2"] * 2
+    events = [json.loads(line) for line in Path("journal/project.jsonl").read_text().splitlines()]
+    done = {Path(event["video"]).parent.name for event in events if event["stage"] == "render" and event["status"] == "done"}
+    assert done == {"480p15", "1080p60"}
+
+
+@pytest.mark.unit
+def test_failed_scenes_are_retried_with_backoff(fake_manim, make_scenes, tmp_path):
+    base = make_scenes({1: "FLAKY", 2: "FAIL"})
+    handler = VideoOutputHandler(max_workers=1, retries=2, retry_backoff=0.01)
+
+    flaky, failing = handler.render_all(handler.scene_files(base))
+
+    assert flaky.ok and flaky.attempts == 2
+    assert not failing.ok and failing.attempts == 3
+    assert rendered_scenes(fake_manim) == ["script_seq1"] * 2 + ["script_seq2"] * 3
@@ -0,0 +1,102 @@
+import ast
+from pathlib import Path
+
+import pytest
+import src.scene_validator as scene_validator
+from src.output_handler import ManimOutputHandler, VideoOutputHandler
+from src.scene_validator import check_scene_file, check_scene_files, scene_classes
+from src.sequence import Sequence
+
+SCENES = '''
+import manim
+from manim import *
+
+class Helper:
+    pass
+
+class Intro(MovingCameraScene):
+    pass
+
+class Base(manim.Scene):
+    class Nested(Scene):
+        pass
+
+class ScriptSeq1(Base):
+    def construct(self):
+        pass
+'''
+
+
+@pytest.mark.unit
+def test_scene_classes_follow_scene_bases():
+    assert scene_classes(ast.parse(SCENES)) == ["Intro", "Base", "ScriptSeq1"]
+
+
+@pytest.mark.unit
+def test_check_picks_the_scene_named_after_the_file(tmp_path):
+    py_file = tmp_path / "script_seq1.py"
+    py_file.write_text(SCENES, encoding="utf-8")
+    broken = tmp_path / "script_seq2.py"
+    broken.write_text("class ScriptSeq2(Scene):\n    def construct(self)\n", encoding="utf-8")
+
+    check = check_scene_file(py_file)
+    assert check.ok and check.scene == "ScriptSeq1"
+
+    check = check_scene_file(broken)
+    assert not check.ok and "line 2" in check.error
+    assert check_scene_file(tmp_path / "missing.py").error
+
+
+@pytest.mark.unit
+def test_committed_scenes_resolve_to_their_classes():
+    repo = Path(__file__).resolve().parent.parent
+    py_files = sorted((repo / "input/manim_files/script_data").glob("script_seq*/script_seq*.py"))
+    assert py_files
+    for check in check_scene_files(py_files):
+        assert check.ok and check.scene == Path(check.py_file).stem.title().replace("_", "")
+
+
+@pytest.mark.unit
+def test_large_projects_are_checked_on_a_process_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(scene_validator, "PARALLEL_THRESHOLD", 2)
+    py_files = []
+    for seq in range(1, 5):
+        py_file = tmp_path / f"script_seq{seq}.py"
+        py_file.write_text(f"class ScriptSeq{seq}(Scene):\n    pass\n" if seq != 3 else "def (", encoding="utf-8")
+        py_files.append(py_file)
+
+    checks = check_scene_files(py_files, max_workers=2)
+
+    assert [check.scene for check in checks] == ["ScriptSeq1", "ScriptSeq2", None, "ScriptSeq4"]
+    assert [check.ok for check in checks] == [True, True, False, True]
+
+
+@pytest.mark.unit
+def test_invalid_files_never_reach_manim(fake_manim, make_scenes, tmp_path):
+    base = make_scenes({1: "class ScriptSeq1(Scene):\n    pass\n", 2: "class ScriptSeq2(Scene:\n", 3: '"""no class"""'},
+                       scene_class=False)
+    handler = VideoOutputHandler(media_dir=tmp_path / "media", retries=2, retry_backoff=0)
+
+    valid, invalid, sceneless = handler.render_all(handler.scene_files(base))
+
+    assert valid.ok and valid.scene == "ScriptSeq1"
+    assert (tmp_path / "media/videos/script_seq1/480p15/ScriptSeq1.mp4").exists()
+    assert invalid.error.startswith("invalid scene file: SyntaxError")
+    assert sceneless.error == "invalid scene file: no manim Scene subclass defined" and sceneless.attempts == 1
+    assert [line.split()[-1] for line in fake_manim.read_text().splitlines()] == ["ScriptSeq1"]
+
+    unchecked = VideoOutputHandler(media_dir=tmp_path / "media", validate=False)
+    assert unchecked.scene_name(base / "script_seq1" / "script_seq1.py") == "ScriptSeq1"
+
+
+@pytest.mark.unit
+def test_generated_scenes_define_their_scene_class(tmp_path):
+    seq = Sequence(script_seq=7, script_for_manim="Draw a circle\nthen label it", script_voice_over="A circle.")
+    py_content, txt_content = ManimOutputHandler.contents(seq)
+    py_file = tmp_path / "script_seq7.py"
+    py_file.write_text(py_content, encoding="utf-8")
+
+    check = check_scene_file(py_file)
+
+    assert check.ok and check.scenes == ["ScriptSeq7"]
+    assert txt_content == "A circle."
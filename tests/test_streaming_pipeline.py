@@ -0,0 +1,141 @@
+import json
+import threading
+import time
+
+import pytest
+from src.bounded_queue import BoundedQueue, QueueCancelled, prefetch
+from src.input_handler import InputHandler
+from src.pipeline import PipelineContext, run_pipeline
+
+
+def streaming_config(tmp_path, mode="streaming"):
+    return {
+        "input": {"type": "local", "file_type": "json", "path": str(tmp_path / "data"), "file": "input.json"},
+        "parsed_copy": {"type": "local", "path": str(tmp_path / "parsed"), "file": "parsed.json"},
+        "manim_output": {"type": "manim", "base_name": "project", "base_output_path": str(tmp_path / "input"),
+                         "path": str(tmp_path / "input" / "manim_files")},
+        "video_output": {"type": "video", "quality": "low", "max_workers": 2, "cache": {"enabled": False}},
+        "pipeline": {"mode": mode, "queue_size": 2},
+    }
+
+
+def sequence(seq):
+    return {"script_seq": seq, "script_for_manim": f"scene {seq}", "script_voice_over": f"voice {seq}"}
+
+
+@pytest.mark.unit
+def test_bounded_queue_blocks_producer_when_full():
+    items = BoundedQueue(2)
+    produced = []
+
+    def produce():
+        for i in range(5):
+            items.put(i)
+            produced.append(i)
+        items.close()
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    time.sleep(0.3)
+    assert produced == [0, 1]  # the third put waits for the consumer
+
+    assert list(items) == [0, 1, 2, 3, 4]
+    producer.join(timeout=5)
+    assert not producer.is_alive()
+
+
+@pytest.mark.unit
+def test_bounded_queue_cancel_and_errors():
+    items = BoundedQueue(1)
+    items.put("a")
+    items.cancel()
+    with pytest.raises(QueueCancelled):
+        items.put("b")
+
+    failing = BoundedQueue(1)
+    failing.close(ValueError("boom"))
+    with pytest.raises(ValueError, match="boom"):
+        list(failing)
+
+
+@pytest.mark.unit
+def test_prefetch_stays_bounded_and_stops_early():
+    pulled = []
+
+    def numbers():
+        for i in range(100):
+            pulled.append(i)
+            yield i
+
+    stream = prefetch(numbers(), 3)
+    assert next(stream) == 0
+    time.sleep(0.3)
+    assert len(pulled) <= 5  # one consumed, three queued, one waiting to be queued
+    stream.close()
+    assert len(pulled) < 100
+
+
+class GatedInputHandler(InputHandler):
+    """Streams a JSON list and holds back the last sequence until the first render has started"""
+
+    def __init__(self, calls_log, count):
+        self.calls_log = calls_log
+        self.count = count
+        self.overlapped = False
+
+    def load(self, config):
+        return "".join(self.stream(config))
+
+    def stream(self, config):
+        yield "["
+        for seq in range(1, self.count + 1):
+            if seq == self.count:
+                deadline = time.monotonic() + 10
+                while not self.calls_log.exists() and time.monotonic() < deadline:
+                    time.sleep(0.02)
+                self.overlapped = self.calls_log.exists()
+            yield ("," if seq > 1 else "") + json.dumps(sequence(seq))
+        yield "]"
+
+
+class GatedContext(PipelineContext):
+    def __init__(self, input_handler):
+        self._input_handler = input_handler
+
+    def input_handler(self, input_config):
+        return self._input_handler
+
+
+@pytest.mark.integration
+def test_streaming_mode_renders_while_input_is_read(fake_manim, tmp_path):
+    handler = GatedInputHandler(fake_manim, count=4)
+
+    result = run_pipeline(streaming_config(tmp_path), GatedContext(handler))
+
+    assert handler.overlapped
+    assert [path.rsplit("/", 1)[-1] for path in result["rendered"]] == [f"script_seq{i}.py" for i in range(1, 5)]
+    assert result["generated"]["diff"]["added"] == [1, 2, 3, 4]
+    parsed = json.loads((tmp_path / "parsed" / "parsed.json").read_text(encoding="utf-8"))
+    assert parsed["sequences"] == [sequence(i) for i in range(1, 5)]
+
+
+@pytest.mark.integration
+def test_streaming_mode_matches_staged_mode(fake_manim, tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "input.json").write_text(json.dumps([sequence(i) for i in (1, 2, 3)]), encoding="utf-8")
+
+    staged = run_pipeline(streaming_config(tmp_path, mode="staged"), PipelineContext())
+    streamed = run_pipeline(streaming_config(tmp_path), PipelineContext())
+
+    assert streamed["rendered"] == staged["rendered"]
+    assert streamed["generated"]["py_files"] == staged["generated"]["py_files"]
+    assert streamed["generated"]["diff"]["unchanged"] == [1, 2, 3]
+
+
+@pytest.mark.integration
+def test_streaming_mode_reports_generation_errors(fake_manim, tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "input.json").write_text('[{"script_seq": 1, "script_for_manim": "x"}, {broken', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        run_pipeline(streaming_config(tmp_path), PipelineContext())
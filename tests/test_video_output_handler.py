@@ -0,0 +1,58 @@
+import time
+
+import pytest
+from src.output_handler import VideoOutputHandler, seq_number
+
+
+@pytest.mark.unit
+def test_scene_files_are_in_script_seq_order(make_scenes):
+    base = make_scenes({10: "", 2: "", 1: ""})
+    files = VideoOutputHandler.scene_files(base)
+    assert [seq_number(f) for f in files] == [1, 2, 10]
+
+
+@pytest.mark.unit
+def test_parallel_render_keeps_order_and_survives_failures(fake_manim, make_scenes):
+    base = make_scenes({1: "# SLEEP 0.3", 2: "FAIL", 3: "# SLEEP 0.1", 4: ""})
+    handler = VideoOutputHandler(quality="low", max_workers=4)
+
+    results = handler.render_all(handler.scene_files(base))
+
+    assert [seq_number(r.py_file) for r in results] == [1, 2, 3, 4]
+    assert [r.ok for r in results] == [True, False, True, True]
+    assert len(fake_manim.read_text().splitlines()) == 4
+
+
+@pytest.mark.unit
+def test_render_runs_concurrently(fake_manim, make_scenes):
+    base = make_scenes({seq: "# SLEEP 0.5" for seq in range(1, 5)})
+    handler = VideoOutputHandler(max_workers=4)
+
+    start = time.perf_counter()
+    rendered = handler.save(base)
+
+    assert len(rendered) == 4
+    assert time.perf_counter() - start < 1.5
+
+
+@pytest.mark.unit
+def test_render_timeout(fake_manim, make_scenes):
+    base = make_scenes({1: "# SLEEP 10", 2: ""})
+    handler = VideoOutputHandler(max_workers=2, timeout=0.5)
+
+    results = handler.render_all(handler.scene_files(base))
+
+    assert "timed out" in results[0].error
+    assert results[1].ok
+
+
+@pytest.mark.unit
+def test_cancel_skips_queued_jobs(fake_manim, make_scenes):
+    base = make_scenes({1: "", 2: ""})
+    handler = VideoOutputHandler(max_workers=1)
+    handler.cancel()
+
+    result = handler.render(handler.scene_files(base)[0])
+
+    assert result.error == "cancelled"
+    assert not fake_manim.exists()
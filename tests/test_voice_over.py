@@ -0,0 +1,135 @@
+import json
+import wave
+from pathlib import Path
+
+import pytest
+from src.output_handler import VoiceOverOutputHandler
+from src.pipeline import PipelineContext, run_pipeline
+from src.render_cache import RenderCache
+from src.tts import EspeakEngine, StubEngine, TTSUnavailable, engine_from_config
+
+
+def make_scene(folder: Path, seq: int, narration: str, video_content: str = "frames") -> dict:
+    scene_dir = folder / f"script_seq{seq}"
+    scene_dir.mkdir(parents=True, exist_ok=True)
+    (scene_dir / f"script_seq{seq}.txt").write_text(narration, encoding="utf-8")
+    video = folder / "media" / f"script_seq{seq}" / f"ScriptSeq{seq}.mp4"
+    video.parent.mkdir(parents=True, exist_ok=True)
+    video.write_text(video_content, encoding="utf-8")
+    return {"txt": scene_dir / f"script_seq{seq}.txt", "video": video}
+
+
+@pytest.mark.unit
+def test_engines_and_cache_keys(tmp_path):
+    engine = StubEngine(words_per_minute=120)
+    assert engine.key("hello there") == StubEngine(words_per_minute=120).key("hello there")
+    assert engine.key("hello there") != StubEngine(words_per_minute=150).key("hello there")
+    assert engine.key("hello there") != engine.key("hello again")
+
+    engine.synthesize("one two three four", tmp_path / "a.wav")
+    with wave.open(str(tmp_path / "a.wav")) as wav:
+        assert wav.getnframes() / wav.getframerate() == pytest.approx(2.0)
+
+    assert isinstance(engine_from_config({"engine": "stub"}), StubEngine)
+    assert isinstance(engine_from_config({"engine": "src.tts:StubEngine", "engine_options": {"sample_rate": 16000}}),
+                      StubEngine)
+    with pytest.raises(ValueError):
+        engine_from_config({"engine": "festival"})
+
+    espeak = EspeakEngine(voice="en-us", speed=150)
+    espeak.executable = None
+    assert espeak.settings() == {"voice": "en-us", "speed": 150, "pitch": 50}
+    with pytest.raises(TTSUnavailable):
+        espeak.synthesize("hi", tmp_path / "b.wav")
+
+
+@pytest.mark.unit
+def test_unchanged_narration_is_never_synthesized_twice(fake_ffmpeg, tmp_path):
+    scenes = [make_scene(tmp_path, 1, "Hello world"), make_scene(tmp_path, 2, "Hello world"),
+              make_scene(tmp_path, 3, "  "), make_scene(tmp_path, 4, "Other line")]
+    engine = StubEngine()
+
+    def handler():
+        return VoiceOverOutputHandler(engine, RenderCache(tmp_path / ".tts_cache", suffix=".wav"), max_workers=2)
+
+    first = handler().save(scenes, {})
+    assert (first["synthesized"], first["cached"], len(first["muxed"]), first["silent"]) == (2, 0, 3, [str(scenes[2]["video"])])
+    key = engine.key("Hello world")
+    assert scenes[0]["video"].read_text(encoding="utf-8") == f"frames\naudio:{key}.wav"
+    assert first["audio"][str(scenes[0]["video"])] == first["audio"][str(scenes[1]["video"])]
+
+    second = handler().save(scenes, {})
+    assert (second["synthesized"], second["cached"], second["muxed"]) == (0, 2, [])
+    assert len(second["unchanged"]) == 3
+
+    scenes[3]["txt"].write_text("A new line", encoding="utf-8")
+    scenes[0]["video"].write_text("re-rendered frames", encoding="utf-8")
+    third = handler().save(scenes, {})
+    assert (third["synthesized"], third["cached"]) == (1, 1)
+    assert third["muxed"] == [str(scenes[0]["video"]), str(scenes[3]["video"])]
+    assert scenes[0]["video"].read_text(encoding="utf-8") == f"re-rendered frames\naudio:{key}.wav"
+
+    calls = (tmp_path / "bin" / "ffmpeg_calls.log").read_text().splitlines()
+    assert len(calls) == 5
+
+
+@pytest.mark.unit
+def test_without_a_cache_audio_is_written_next_to_the_narration(tmp_path):
+    scene = make_scene(tmp_path, 1, "Narration")
+    result = VoiceOverOutputHandler(StubEngine(), mux=False).save([scene], {})
+    assert result["audio"] == {str(scene["video"]): str(scene["txt"].with_suffix(".wav"))}
+    assert scene["txt"].with_suffix(".wav").exists() and result["muxed"] == []
+
+
+@pytest.mark.integration
+def test_pipeline_narrates_rendered_scenes(fake_manim, fake_ffmpeg, tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "input.json").write_text(json.dumps([
+        {"script_seq": seq, "script_for_manim": f"scene {seq}", "script_voice_over": f"Narration {seq}"}
+        for seq in (1, 2)
+    ]), encoding="utf-8")
+    config = {
+        "input": {"type": "local", "file_type": "json", "path": "data", "file": "input.json"},
+        "parsed_copy": {"type": "local", "path": "parsed", "file": "parsed.json"},
+        "manim_output": {"type": "manim", "base_name": "narrated", "path": "input/manim_files"},
+        "video_output": {"type": "video", "quality": "low", "cache": {"enabled": False}},
+        "voice_over": {"type": "voice_over", "engine": "stub", "cache": {"path": str(tmp_path / ".tts_cache")}},
+        "journal": {"enabled": False},
+    }
+
+    result = run_pipeline(config, PipelineContext())
+
+    assert result["voice_over"]["synthesized"] == 2 and len(result["voice_over"]["muxed"]) == 2
+    video = tmp_path / "media/videos/script_seq1/480p15/ScriptSeq1.mp4"
+    assert "audio:" in video.read_text(encoding="utf-8")
+
+    again = run_pipeline(config, PipelineContext())
+    assert again["voice_over"]["synthesized"] == 0 and again["voice_over"]["cached"] == 2
+
+
+@pytest.mark.integration
+def test_rerun_with_the_render_cache_keeps_narrated_videos(fake_manim, fake_ffmpeg, tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "input.json").write_text(json.dumps([
+        {"script_seq": seq, "script_for_manim": f"scene {seq}", "script_voice_over": f"Narration {seq}"}
+        for seq in (1, 2)
+    ]), encoding="utf-8")
+    config = {
+        "input": {"type": "local", "file_type": "json", "path": "data", "file": "input.json"},
+        "parsed_copy": {"type": "local", "path": "parsed", "file": "parsed.json"},
+        "manim_output": {"type": "manim", "base_name": "narrated", "path": "input/manim_files"},
+        "video_output": {"type": "video", "quality": "low", "cache": {"path": str(tmp_path / ".render_cache")}},
+        "voice_over": {"type": "voice_over", "engine": "stub", "cache": {"path": str(tmp_path / ".tts_cache")}},
+        "journal": {"enabled": False},
+    }
+    run_pipeline(config, PipelineContext())
+    video = tmp_path / "media/videos/script_seq1/480p15/ScriptSeq1.mp4"
+    narrated = video.read_text(encoding="utf-8")
+    (tmp_path / "bin" / "ffmpeg_calls.log").unlink()
+
+    again = run_pipeline(config, PipelineContext())
+
+    assert again["voice_over"]["muxed"] == [] and len(again["voice_over"]["unchanged"]) == 2
+    assert video.read_text(encoding="utf-8") == narrated
+    assert not (tmp_path / "bin" / "ffmpeg_calls.log").exists()
+    assert len(fake_manim.read_text().splitlines()) == 2
@@ -0,0 +1,131 @@
+import json
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from src.pipeline import PipelineContext, run_pipeline
+from src.watch import Changes, Watcher, watch_config
+
+
+def write_input(tmp_path, narrations: dict):
+    (tmp_path / "data").mkdir(exist_ok=True)
+    (tmp_path / "data" / "input.json").write_text(json.dumps([
+        {"script_seq": seq, "script_for_manim": f"scene {seq}", "script_voice_over": text}
+        for seq, text in narrations.items()
+    ]), encoding="utf-8")
+
+
+def make_config() -> dict:
+    return {
+        "input": {"type": "local", "file_type": "json", "path": "data", "file": "input.json"},
+        "parsed_copy": {"type": "local", "path": "parsed", "file": "parsed.json"},
+        "manim_output": {"type": "manim", "base_name": "watched", "path": "input/manim_files"},
+        "video_output": {"type": "video", "quality": "low", "max_workers": 2, "cache": {"enabled": False}},
+        "journal": {"enabled": False},
+    }
+
+
+def rendered_stems(calls_log) -> list[str]:
+    return [line.split()[0] for line in calls_log.read_text().splitlines()] if calls_log.exists() else []
+
+
+def wait_for_renders(calls_log, count: int, timeout: float = 30):
+    deadline = time.monotonic() + timeout
+    while len(rendered_stems(calls_log)) < count:
+        assert time.monotonic() < deadline, rendered_stems(calls_log)
+        time.sleep(0.05)
+
+
+@pytest.mark.unit
+def test_changes_are_confirmed_by_content(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write_input(tmp_path, {1: "one"})
+    scene = Path("input/manim_files/watched/script_seq1/script_seq1.py")
+    scene.parent.mkdir(parents=True)
+    scene.write_text("a", encoding="utf-8")
+    scene.with_suffix(".txt").write_text("one", encoding="utf-8")
+
+    watcher = Watcher(make_config())
+    watcher.rebaseline()
+    assert not watcher.changes(watcher.snapshot())
+
+    # saved again with the same content: not an edit
+    time.sleep(0.01)
+    scene.write_text("a", encoding="utf-8")
+    assert not watcher.changes(watcher.snapshot())
+
+    scene.write_text("b = 1", encoding="utf-8")
+    scene.with_suffix(".txt").write_text("uno", encoding="utf-8")
+    assert watcher.changes(watcher.snapshot()) == Changes(scenes={scene}, narration_changed=True)
+
+    scene.with_suffix(".txt").write_text("eins", encoding="utf-8")
+    assert watcher.changes(watcher.snapshot()) == Changes(narration_changed=True)
+
+    write_input(tmp_path, {1: "uno"})
+    assert watcher.changes(watcher.snapshot()) == Changes(input_changed=True)
+
+
+@pytest.mark.unit
+def test_watch_config_defaults_to_warm_workers():
+    config = {"video_output": {"type": "video"}}
+    assert watch_config(config)["video_output"]["engine"] == "inprocess"
+    assert "engine" not in config["video_output"]
+    assert watch_config({"video_output": {"type": "video", "engine": "subprocess"}})["video_output"]["engine"] == "subprocess"
+    assert "engine" not in watch_config({"video_output": {"type": "video", "progress": True}})["video_output"]
+
+
+@pytest.mark.integration
+def test_only_edited_scenes_are_rerendered(fake_manim, tmp_path):
+    write_input(tmp_path, {seq: f"Narration {seq}" for seq in range(1, 6)})
+    watcher = Watcher(make_config(), PipelineContext(), interval=0.05, debounce=0.1)
+    rounds = []
+    thread = threading.Thread(target=lambda: rounds.extend(watcher.run(max_rounds=2)))
+    thread.start()
+    base = Path("input/manim_files/watched")
+    try:
+        wait_for_renders(fake_manim, 5)
+        while not watcher._stats:
+            time.sleep(0.05)
+        assert sorted(rendered_stems(fake_manim)) == [f"script_seq{seq}" for seq in range(1, 6)]
+
+        # round 1: one sequence edited in the input, burst of two saves
+        write_input(tmp_path, {seq: f"Narration {seq}" if seq != 2 else "Edited" for seq in range(1, 6)})
+        write_input(tmp_path, {seq: f"Narration {seq}" if seq != 3 else "Edited" for seq in range(1, 6)})
+        wait_for_renders(fake_manim, 6)
+
+        # round 2: a generated scene file edited by hand
+        (base / "script_seq5" / "script_seq5.py").write_text("class ScriptSeq5(Scene):\n    pass  # tweaked\n", encoding="utf-8")
+        wait_for_renders(fake_manim, 7)
+    finally:
+        thread.join(timeout=10)
+        watcher.stop()
+        thread.join()
+
+    assert not thread.is_alive()
+    assert rounds[0]["generated"]["changed"] == [3]
+    assert rounds[0]["rendered"] == [str(base / "script_seq3" / "script_seq3.py")]
+    assert rounds[1]["generated"] is None
+    assert rounds[1]["rendered"] == [str(base / "script_seq5" / "script_seq5.py")]
+    assert rendered_stems(fake_manim)[5:] == ["script_seq3", "script_seq5"]
+
+
+@pytest.mark.integration
+def test_a_narration_edit_narrates_without_rendering(fake_manim, fake_ffmpeg, tmp_path):
+    write_input(tmp_path, {1: "Narration 1", 2: "Narration 2"})
+    config = make_config()
+    config["voice_over"] = {"type": "voice_over", "engine": "stub", "cache": {"enabled": False}}
+    run_pipeline(config, PipelineContext())
+    watcher = Watcher(config, PipelineContext())
+    watcher.rebaseline()
+    assert len(rendered_stems(fake_manim)) == 2
+
+    narration = Path("input/manim_files/watched/script_seq2/script_seq2.txt")
+    narration.write_text("Narration two, rewritten", encoding="utf-8")
+    changes = watcher.changes(watcher.snapshot())
+    assert changes == Changes(narration_changed=True)
+    result = watcher.apply(changes)
+
+    video = Path("media/videos/script_seq2/480p15/ScriptSeq2.mp4")
+    assert result["rendered"] == [] and len(rendered_stems(fake_manim)) == 2
+    assert result["voice_over"]["muxed"] == [str(video)] and len(result["voice_over"]["unchanged"]) == 1
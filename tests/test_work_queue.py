@@ -0,0 +1,113 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from src.distributed import RenderWorker, coordinate
+from src.output_handler import VideoOutputHandler
+from src.work_queue import DONE, FAILED, LEASED, QUEUED, WorkQueue
+
+REPO = Path(__file__).resolve().parent.parent
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def scene(seq: int, body: str = "pass") -> str:
+    return f"class ScriptSeq{seq}(Scene):\n    {body}\n"
+
+
+@pytest.mark.unit
+def test_leases_expire_and_are_reclaimed(make_scenes):
+    base = make_scenes({1: scene(1), 2: scene(2)})
+    clock = FakeClock()
+    queue = WorkQueue(base / "queue.sqlite", lease_seconds=10, max_attempts=2, clock=clock)
+    assert queue.enqueue(VideoOutputHandler.scene_files(base)) == 2
+    # stored relative to the queue's folder, wherever another node mounts it
+    stored = sqlite3.connect(base / "queue.sqlite").execute("SELECT py_file FROM jobs ORDER BY id").fetchall()
+    assert stored == [(str(Path("script_seq1/script_seq1.py")),), (str(Path("script_seq2/script_seq2.py")),)]
+    assert sqlite3.connect(base / "queue.sqlite").execute("PRAGMA journal_mode").fetchone() == ("delete",)
+
+    first = queue.claim("a")
+    assert first.status == LEASED and first.attempts == 1 and first.py_file.name == "script_seq1.py"
+    clock.now += 8
+    assert queue.heartbeat(first.id, "a")
+    clock.now += 11  # worker a went silent
+
+    assert not queue.heartbeat(first.id, "a")
+    reclaimed = queue.claim("b")
+    assert (reclaimed.id, reclaimed.worker, reclaimed.attempts) == (first.id, "b", 2)
+    assert not queue.complete(first.id, "a", "late.mp4")  # a's result is fenced off
+    assert queue.complete(first.id, "b", "out.mp4")
+
+    second = queue.claim("b")
+    assert queue.fail(second.id, "b", "boom")
+    assert queue.claim("b").id == second.id
+    assert queue.fail(second.id, "b", "boom again")
+    assert queue.counts() == {QUEUED: 0, LEASED: 0, DONE: 1, FAILED: 1}
+    assert queue.finished()
+
+    # failed jobs and changed scenes are queued again, finished unchanged ones are not
+    assert queue.enqueue(VideoOutputHandler.scene_files(base)) == 1
+    (base / "script_seq1" / "script_seq1.py").write_text(scene(1, "x = 1"), encoding="utf-8")
+    assert queue.enqueue(VideoOutputHandler.scene_files(base)) == 1
+    assert queue.counts()[QUEUED] == 2
+
+
+@pytest.mark.integration
+def test_a_dead_workers_job_is_rendered_by_another(fake_manim, make_scenes, tmp_path):
+    base = make_scenes({1: scene(1), 2: scene(2)})
+    queue = WorkQueue(tmp_path / "queue.sqlite", lease_seconds=0.5)
+    coordinate(queue, base)
+    abandoned = queue.claim("dead-worker")
+
+    handler = VideoOutputHandler(max_workers=1, media_dir=tmp_path / "media")
+    worker = RenderWorker(queue, handler, tmp_path / "shared", worker_id="w1", poll_interval=0.1)
+    stats = worker.run()
+
+    assert stats == {"done": 2, "failed": 0, "lost": 0}
+    jobs = queue.jobs()
+    assert [job.status for job in jobs] == [DONE, DONE]
+    assert jobs[abandoned.id - 1].attempts == 2
+    assert Path(jobs[0].output) == tmp_path / "shared/videos/script_seq1/480p15/ScriptSeq1.mp4"
+    assert Path(jobs[0].output).exists() and Path(jobs[1].output).exists()
+    assert not (tmp_path / "media" / "workers" / "w1").exists()
+
+
+@pytest.mark.integration
+def test_worker_processes_share_the_queue(fake_manim, make_scenes, tmp_path):
+    base = make_scenes({seq: scene(seq) + ("# SLEEP 0.2\n" if seq % 2 else "") for seq in range(1, 9)})
+    Path("config.json").write_text(json.dumps({
+        "input": {"type": "local", "file_type": "json", "path": "data", "file": "input.json"},
+        "parsed_copy": {"type": "local", "path": "parsed", "file": "parsed.json"},
+        "manim_output": {"type": "manim", "base_name": "project", "path": "input/manim_files"},
+        "video_output": {"type": "video", "quality": "low", "max_workers": 1},
+    }), encoding="utf-8")
+    cli = [sys.executable, "-m", "src.distributed", "--queue", str(tmp_path / "queue.sqlite"), "--lease", "5"]
+    env = dict(os.environ, PYTHONPATH=str(REPO))
+
+    subprocess.run(cli + ["coordinator", "--manim-path", str(base)], env=env, check=True, capture_output=True)
+    workers = [
+        subprocess.Popen(cli + ["worker", "--output", "shared", "--worker-id", f"w{i}"], env=env,
+                         stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        for i in range(3)
+    ]
+    outputs = [worker.communicate(timeout=60)[0] for worker in workers]
+    assert [worker.returncode for worker in workers] == [0, 0, 0], outputs
+
+    jobs = WorkQueue(tmp_path / "queue.sqlite").jobs()
+    assert {job.status for job in jobs} == {DONE}
+    assert sorted(p.parent.parent.name for p in Path("shared/videos").glob("*/480p15/*.mp4")) == \
+        sorted(f"script_seq{seq}" for seq in range(1, 9))
+    assert not Path("media/workers").exists() or not any(Path("media/workers").iterdir())
+    rendered = [line.split()[0] for line in fake_manim.read_text().splitlines()]
+    assert sorted(rendered) == sorted(set(rendered))  # every scene rendered exactly once
+    assert len([output for output in outputs if "rendering" in output]) >= 2  # work was spread over workers